@@ -2,37 +2,195 @@
 
 from __future__ import annotations
 
-import json
-from typing import Optional
-from pydantic import BaseModel
+import asyncio
+import threading
+import weakref
+from typing import Any, Optional
+from pydantic import BaseModel, TypeAdapter
 
+from stripe_agent_toolkit.middleware import MiddlewarePipeline, ToolCall
+
+from .async_client import AsyncAppointyClient
+from .client import AppointyClient
 from .configuration import Context
+from .conflicts import AppointmentConflictError
+from .store import AppointmentStore
 
 from .functions import (
     create_appointment,
     list_appointments,
     update_appointment,
+    list_services,
+    get_staff_info,
+    get_service_info,
+    get_available_dates,
+    get_available_slots,
+    find_next_available_slots,
+    generate_booking_link,
+)
+
+
+# Methods with a native async implementation on AsyncAppointyClient. The
+# others run the sync implementation in a thread.
+_ASYNC_METHODS = frozenset(
+    [
+        "create_appointment",
+        "list_appointments",
+        "update_appointment",
+        "get_available_dates",
+        "get_available_slots",
+    ]
 )
 
+# Serializes results, including pydantic models and lists of them, straight
+# to JSON without converting them to dicts first.
+_result_adapter: TypeAdapter = TypeAdapter(Any)
+
+
+def _dumps(result: Any) -> str:
+    return _result_adapter.dump_json(result).decode("utf-8")
+
 
 class AppointyAPI(BaseModel):
     """Wrapper for Appointy API"""
 
     _context: Context
+    _client: AppointyClient
+    _async_client: Optional[AsyncAppointyClient] = None
+    _loop_clients: Any = None
+    _lock: Any = None
+    _store: Optional[AppointmentStore] = None
+    _pipeline: MiddlewarePipeline
 
-    def __init__(self, api_key: str, context: Optional[Context]):
+    def __init__(
+        self,
+        api_key: str,
+        context: Optional[Context],
+        store: Optional[AppointmentStore] = None,
+        pipeline: Optional[MiddlewarePipeline] = None,
+        async_client: Optional[AsyncAppointyClient] = None,
+    ):
         super().__init__()
 
         self._context = context if context is not None else Context()
+        if not self._context.get("api_key"):
+            self._context = Context(**self._context, api_key=api_key)
 
-        self.api_key = api_key
+        self._client = AppointyClient(self._context)
+        self._store = store
+        self._pipeline = pipeline or MiddlewarePipeline()
+        # Owned by the caller, who closes it on the loop it belongs to.
+        self._async_client = async_client
+        # Otherwise one pooled client per event loop, as an
+        # httpx.AsyncClient is bound to the loop it was first used on.
+        self._loop_clients = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
 
     def run(self, method: str, *args, **kwargs) -> str:
+        return self._pipeline.run(
+            method, args, kwargs, self._context, self._call
+        )
+
+    async def arun(self, method: str, *args, **kwargs) -> str:
+        return await self._pipeline.arun(
+            method, args, kwargs, self._context, self._acall
+        )
+
+    def _call(self, call: ToolCall) -> str:
+        try:
+            return self._dispatch(call)
+        except AppointmentConflictError as e:
+            # Answered, not failed: the agent picks an alternative.
+            return e.to_json()
+
+    def _dispatch(self, call: ToolCall) -> str:
+        method, args, kwargs = call.method, call.args, call.kwargs
+
+        if method == "create_appointment":
+            return _dumps(create_appointment(self._context, *args, **kwargs))
+        elif method == "list_appointments":
+            if self._store is not None:
+                # Answered from the synced local mirror.
+                return _dumps(
+                    self._store.list_appointments(
+                        self._context.get("business_id") or "",
+                        *args,
+                        **kwargs,
+                    )
+                )
+            return _dumps(list_appointments(self._context, *args, **kwargs))
+        elif method == "update_appointment":
+            return _dumps(update_appointment(self._context, *args, **kwargs))
+        elif method == "list_services":
+            return _dumps(list_services(self._client, *args, **kwargs))
+        elif method == "get_staff_info":
+            return _dumps(get_staff_info(self._client, *args, **kwargs))
+        elif method == "get_service_info":
+            return _dumps(get_service_info(self._client, *args, **kwargs))
+        elif method == "get_available_dates":
+            return _dumps(get_available_dates(self._client, *args, **kwargs))
+        elif method == "get_available_slots":
+            return _dumps(get_available_slots(self._client, *args, **kwargs))
+        elif method == "find_next_available_slots":
+            return _dumps(
+                find_next_available_slots(self._client, *args, **kwargs)
+            )
+        elif method == "generate_booking_link":
+            return _dumps(
+                generate_booking_link(self._client, *args, **kwargs)
+            )
+        else:
+            raise ValueError("Invalid method " + method)
+
+    async def _acall(self, call: ToolCall) -> str:
+        method = call.method
+        if method not in _ASYNC_METHODS or (
+            method == "list_appointments" and self._store is not None
+        ):
+            # No async version, or answered from the sync local store.
+            return await asyncio.to_thread(self._call, call)
+
+        try:
+            return await self._acall_with(self._loop_client(), call)
+        except AppointmentConflictError as e:
+            return e.to_json()
+
+    def _loop_client(self) -> AsyncAppointyClient:
+        if self._async_client is not None:
+            return self._async_client
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._loop_clients.get(loop)
+            if client is None:
+                client = AsyncAppointyClient(self._context)
+                self._loop_clients[loop] = client
+        return client
+
+    async def aclose(self):
+        """Close the async client opened on the running event loop.
+
+        Call it before the loop closes. A client passed as ``async_client``
+        is left to its owner.
+        """
+        with self._lock:
+            client = self._loop_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    async def _acall_with(
+        self, client: AsyncAppointyClient, call: ToolCall
+    ) -> str:
+        method, args, kwargs = call.method, call.args, call.kwargs
+
         if method == "create_appointment":
-            return json.dumps(create_appointment(self._context, *args, **kwargs))
+            return _dumps(await client.create_appointment(*args, **kwargs))
         elif method == "list_appointments":
-            return json.dumps(list_appointments(self._context, *args, **kwargs))
+            return _dumps(await client.list_appointments(*args, **kwargs))
         elif method == "update_appointment":
-            return json.dumps(update_appointment(self._context, *args, **kwargs))
+            return _dumps(await client.update_appointment(*args, **kwargs))
+        elif method == "get_available_dates":
+            return _dumps(await client.get_available_dates(*args, **kwargs))
+        elif method == "get_available_slots":
+            return _dumps(await client.get_available_slots(*args, **kwargs))
         else:
             raise ValueError("Invalid method " + method)
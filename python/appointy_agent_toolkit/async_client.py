@@ -0,0 +1,406 @@
+"""Async Appointy client."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from .cache import availability_cache, availability_key
+from .conflicts import appointment_index
+from .configuration import Context
+from .fanout import _combinations, _windows
+from .functions import (
+    Appointment,
+    _available_dates_payload,
+    _available_slots_payload,
+    _check_update,
+    _contiguous_runs,
+    _dates_by_day,
+    _day_start,
+    _days_between,
+    _format_datetime,
+    _index_appointment,
+    _parse_appointment_page,
+    _parse_available_dates,
+    _parse_available_slots,
+    _parse_datetime,
+    _record_booking,
+    _slots_by_day,
+)
+from .graphql import (
+    _endpoint,
+    _is_persisted_query_miss,
+    _record_miss,
+    _sendable,
+    _with_document,
+)
+
+
+class AsyncAppointyClient:
+    """Async variant of the Appointy functions on a pooled httpx.AsyncClient.
+
+    Every call shares one connection pool, so availability fan-out and
+    appointment writes can run concurrently on a single event loop.
+    """
+
+    def __init__(
+        self,
+        context: Context,
+        max_connections: int = 20,
+        timeout: float = 30.0,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        self._context = context
+        self._http = http_client or httpx.AsyncClient(
+            base_url=context.get("api_base_url") or "",
+            headers={"Authorization": f"Bearer {context.get('api_key')}"},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            timeout=timeout,
+        )
+        self._base_url = str(self._http.base_url).rstrip("/")
+
+    async def __aenter__(self) -> AsyncAppointyClient:
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the underlying connection pool."""
+        await self._http.aclose()
+
+    @property
+    def business_id(self) -> str:
+        business_id = self._context.get("business_id")
+        if not business_id:
+            raise ValueError("Business ID not configured")
+        return business_id
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict] = None,
+        json_data: Any = None,
+    ) -> httpx.Response:
+        response = await self._http.request(
+            method, path, params=params, json=json_data
+        )
+        response.raise_for_status()
+        return response
+
+    async def _make_request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict] = None,
+        json_data: Any = None,
+    ) -> Any:
+        response = await self._request(method, path, params, json_data)
+        return response.json()
+
+    async def _post_graphql(self, payload: Dict) -> Dict:
+        endpoint = _endpoint(self)
+        payload = _sendable(endpoint, payload)
+        data = await self._make_request("POST", "/graphql", json_data=payload)
+        if _is_persisted_query_miss(data):
+            _record_miss(endpoint, data)
+            data = await self._make_request(
+                "POST", "/graphql", json_data=_with_document(payload)
+            )
+        return data
+
+    async def create_appointment(
+        self,
+        title: str,
+        start_time: str,
+        end_time: str,
+        customer_name: str,
+        customer_email: str,
+        employee_id: Optional[str] = None,
+    ) -> Appointment:
+        """Create an appointment, see functions.create_appointment."""
+        appointment_data = {
+            "title": title,
+            "start_time": start_time,
+            "end_time": end_time,
+            "customer_name": customer_name,
+            "customer_email": customer_email,
+        }
+        if employee_id:
+            appointment_data["employee_id"] = employee_id
+            appointment_index.check(
+                self._context.get("business_id") or "",
+                employee_id,
+                _parse_datetime(start_time),
+                _parse_datetime(end_time),
+            )
+
+        appointment = Appointment(
+            **await self._make_request(
+                "POST", "/appointments", json_data=appointment_data
+            )
+        )
+        _record_booking(self._context, appointment)
+        return appointment
+
+    async def iter_appointments(
+        self,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        customer_email: Optional[str] = None,
+        status: Optional[str] = None,
+        page_size: int = 100,
+        cursor: Optional[str] = None,
+        updated_since: Optional[str] = None,
+    ) -> AsyncIterator[Appointment]:
+        """Stream appointments page by page, see functions.iter_appointments."""
+        params: dict = {"limit": page_size}
+        if from_date:
+            params["from_date"] = from_date
+        if to_date:
+            params["to_date"] = to_date
+        if customer_email:
+            params["customer_email"] = customer_email
+        if status:
+            params["status"] = status
+        if updated_since:
+            params["updated_since"] = updated_since
+
+        while True:
+            if cursor:
+                params["cursor"] = cursor
+            response = await self._request(
+                "GET", "/appointments", params=params
+            )
+            appointments, cursor = _parse_appointment_page(response.content)
+
+            for appointment in appointments:
+                _index_appointment(self._context, appointment)
+                yield appointment
+
+            if not cursor:
+                return
+
+    async def list_appointments(
+        self,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        customer_email: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Appointment]:
+        """List appointments, see functions.list_appointments."""
+        if not from_date and not to_date:
+            now = datetime.now(timezone.utc)
+            from_date = _format_datetime(now)
+            to_date = _format_datetime(now + timedelta(days=7))
+
+        appointments: List[Appointment] = []
+        async for appointment in self.iter_appointments(
+            from_date=from_date,
+            to_date=to_date,
+            customer_email=customer_email,
+            status=status,
+            page_size=min(limit, 100),
+        ):
+            appointments.append(appointment)
+            if len(appointments) >= limit:
+                break
+        return appointments
+
+    async def update_appointment(
+        self,
+        appointment_id: str,
+        title: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        customer_name: Optional[str] = None,
+        customer_email: Optional[str] = None,
+        employee_id: Optional[str] = None,
+    ) -> Appointment:
+        """Update an appointment, see functions.update_appointment."""
+        appointment_data = {
+            "title": title,
+            "start_time": start_time,
+            "end_time": end_time,
+            "customer_name": customer_name,
+            "customer_email": customer_email,
+            "employee_id": employee_id,
+        }
+        appointment_data = {
+            k: v for k, v in appointment_data.items() if v is not None
+        }
+
+        known = _check_update(
+            self._context, appointment_id, start_time, end_time, employee_id
+        )
+
+        appointment = Appointment(
+            **await self._make_request(
+                "PUT",
+                f"/appointments/{appointment_id}",
+                json_data=appointment_data,
+            )
+        )
+        _record_booking(
+            self._context, appointment, start_time, end_time, known=known
+        )
+        return appointment
+
+    async def _load_days(
+        self,
+        kind: str,
+        payload: Callable,
+        parse: Callable,
+        by_day: Callable,
+        filters: Dict,
+        start: datetime,
+        end: datetime,
+        window_days: int,
+        max_concurrency: int,
+    ) -> List[Tuple[date, Any]]:
+        """Load per-day values in day order, windows running concurrently."""
+        business_id = self.business_id
+        key = availability_key(business_id, filters)
+        days = _days_between(start, end)
+        windows = [
+            days[i:i + window_days] for i in range(0, len(days), window_days)
+        ]
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def load(window: List[date]) -> List[Tuple[date, Any]]:
+            async with semaphore:
+                cached, missing = availability_cache.lookup(kind, key, window)
+                for first, last in _contiguous_runs(missing):
+                    data = await self._post_graphql(
+                        payload(
+                            business_id,
+                            filters,
+                            _day_start(first),
+                            _day_start(last + timedelta(days=1)),
+                        )
+                    )
+                    fetched = by_day(parse(data), first, last)
+                    availability_cache.store(kind, key, fetched)
+                    cached.update(fetched)
+                return [(day, cached[day]) for day in window]
+
+        loaded = await asyncio.gather(*(load(window) for window in windows))
+        return [item for window in loaded for item in window]
+
+    async def get_available_dates(
+        self,
+        filters: Dict,
+        from_date: str,
+        to_date: str,
+        window_days: int = 14,
+        max_concurrency: int = 4,
+    ) -> List[str]:
+        """Get available dates for booking"""
+        days = await self._load_days(
+            "dates",
+            _available_dates_payload,
+            _parse_available_dates,
+            _dates_by_day,
+            filters,
+            _parse_datetime(from_date),
+            _parse_datetime(to_date, end_of_day=True),
+            window_days,
+            max_concurrency,
+        )
+        return [value for _, value in days if value is not None]
+
+    async def get_available_slots(
+        self,
+        filters: Dict,
+        from_date: str,
+        to_date: str,
+        window_days: int = 7,
+        max_concurrency: int = 4,
+    ) -> List[str]:
+        """Get available time slots for booking"""
+        start = _parse_datetime(from_date)
+        end = _parse_datetime(to_date, end_of_day=True)
+        days = await self._load_days(
+            "slots",
+            _available_slots_payload,
+            _parse_available_slots,
+            _slots_by_day,
+            filters,
+            start,
+            end,
+            window_days,
+            max_concurrency,
+        )
+        return [
+            f"{slot_start} - {slot_end}"
+            for _, slots in days
+            for slot_start, slot_end in slots
+            if start <= _parse_datetime(slot_start) < end
+        ]
+
+    async def find_earliest_slots(
+        self,
+        services: List[str],
+        employees: List[str],
+        from_date: str,
+        to_date: str,
+        limit: int = 5,
+        max_concurrency: int = 8,
+        window_days: Optional[int] = 7,
+    ) -> List[Dict[str, Optional[str]]]:
+        """Find the earliest slots, see fanout.find_earliest_slots."""
+        combinations = _combinations(services, employees)
+        start = _parse_datetime(from_date)
+        end = _parse_datetime(to_date, end_of_day=True)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def query(combination, window_start, window_end):
+            service_id, employee_id = combination
+            filters = {
+                "services": [service_id] if service_id else [],
+                "employees": [employee_id] if employee_id else [],
+            }
+            async with semaphore:
+                slots = await self.get_available_slots(
+                    filters,
+                    _format_datetime(window_start),
+                    _format_datetime(window_end),
+                )
+            results = []
+            for slot in slots:
+                start_time, end_time = slot.split(" - ", 1)
+                results.append(
+                    (
+                        _parse_datetime(start_time),
+                        {
+                            "start_time": start_time,
+                            "end_time": end_time,
+                            "service_id": service_id,
+                            "employee_id": employee_id,
+                        },
+                    )
+                )
+            return results
+
+        found: List[Dict[str, Optional[str]]] = []
+        for window_start, window_end in _windows(start, end, window_days):
+            results = await asyncio.gather(
+                *(
+                    query(combination, window_start, window_end)
+                    for combination in combinations
+                )
+            )
+            for _, slot in heapq.merge(*results, key=lambda slot: slot[0]):
+                found.append(slot)
+                if len(found) >= limit:
+                    return found
+        return found
@@ -0,0 +1,352 @@
+"""Bulk appointment import for Appointy.
+
+Reads appointments from a CSV or NDJSON file, validates each row with the
+``CreateAppointment`` schema, rejects rows that conflict with known or
+earlier imported appointments, and creates the rest with bounded
+concurrency. Only failures that leave no appointment behind are retried.
+Progress is checkpointed so an interrupted import can be resumed, retrying
+the rows that failed.
+
+Usage::
+
+    APPOINTY_API_BASE_URL=... APPOINTY_API_KEY=... APPOINTY_BUSINESS_ID=... \\
+        python -m appointy_agent_toolkit.bulk appointments.csv \\
+        --checkpoint appointments.checkpoint.json
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+import requests
+from pydantic import ValidationError
+
+from .concurrency import ordered_map
+from .configuration import Context
+from .conflicts import AppointmentConflictError, ConflictIndex, appointment_index
+from .functions import _parse_datetime, create_appointment
+from .schema import CreateAppointment
+
+# Responses rejecting a request before it was processed. After any other
+# failure the appointment may exist, and creating it again would duplicate
+# it.
+RETRYABLE_STATUS_CODES = (429,)
+
+
+class InvalidRow:
+    """A row that could not be read, in place of its values."""
+
+    def __init__(self, line: int, message: str):
+        self.line = line
+        self.message = message
+
+
+def read_rows(
+    stream: TextIO, file_format: str
+) -> Iterator[Union[Dict, InvalidRow]]:
+    """Read raw appointment rows from a CSV or NDJSON stream.
+
+    A line that is not a JSON object is read as an ``InvalidRow``.
+    """
+    if file_format == "csv":
+        for row in csv.DictReader(stream):
+            yield {k: v for k, v in row.items() if v not in (None, "")}
+    elif file_format == "ndjson":
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield InvalidRow(number, f"line {number}: Invalid JSON: {e}")
+                continue
+            if not isinstance(row, dict):
+                yield InvalidRow(number, f"line {number}: Not a JSON object")
+                continue
+            yield row
+    else:
+        raise ValueError("Invalid format " + file_format)
+
+
+class ImportSummary:
+    """Counts, errors and throughput of an import."""
+
+    def __init__(self):
+        self.created = 0
+        self.skipped = 0
+        self.invalid = 0
+        self.conflicts = 0
+        self.failed = 0
+        self.unknown = 0
+        self.errors: List[Tuple[int, str]] = []
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+
+    @property
+    def processed(self) -> int:
+        return (
+            self.created
+            + self.invalid
+            + self.conflicts
+            + self.failed
+            + self.unknown
+        )
+
+    @property
+    def throughput(self) -> float:
+        return self.created / self.elapsed if self.elapsed else 0.0
+
+    def record(self, row: int, outcome: str, message: Optional[str] = None):
+        setattr(self, outcome, getattr(self, outcome) + 1)
+        if message is not None:
+            self.errors.append((row, message))
+
+    def __str__(self) -> str:
+        lines = [
+            f"Created {self.created} appointments in {self.elapsed:.1f}s"
+            f" ({self.throughput:.1f}/s)",
+            f"Skipped {self.skipped} already imported rows",
+            f"Invalid {self.invalid}, conflicts {self.conflicts},"
+            f" failed {self.failed}, outcome unknown {self.unknown}",
+        ]
+        lines.extend(f"  row {row}: {message}" for row, message in self.errors)
+        return "\n".join(lines)
+
+
+class _Progress:
+    """Which rows are done, failed or of unknown outcome, for checkpoints.
+
+    ``completed`` is the highest row up to which every row finished, and
+    ``done`` the rows after it that finished too. Failed rows are retried
+    on resume. Rows whose outcome is unknown are not, as they may have
+    been created, and are left to check by hand.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._lock = threading.Lock()
+        state: Dict = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+        self.completed: int = state.get("completed", 0)
+        self.done: Set[int] = set(state.get("done", []))
+        self.failed: Set[int] = set(state.get("failed", []))
+        self.unknown: Set[int] = set(state.get("unknown", []))
+
+    def should_skip(self, row: int) -> bool:
+        if row in self.failed:
+            return False
+        return row <= self.completed or row in self.done or row in self.unknown
+
+    def finish(self, row: int, outcome: str):
+        with self._lock:
+            self.failed.discard(row)
+            if outcome == "failed":
+                self.failed.add(row)
+            elif outcome == "unknown":
+                self.unknown.add(row)
+            if row > self.completed:
+                self.done.add(row)
+            while self.completed + 1 in self.done:
+                self.completed += 1
+                self.done.remove(self.completed)
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            state = {
+                "completed": self.completed,
+                "done": sorted(self.done),
+                "failed": sorted(self.failed),
+                "unknown": sorted(self.unknown),
+            }
+        temporary = self.path + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump(state, f)
+        os.replace(temporary, self.path)
+
+
+def _outcome(error: requests.RequestException) -> str:
+    """``failed`` when no appointment was created, else ``unknown``."""
+    if isinstance(error, requests.ConnectTimeout):
+        return "failed"
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        # A 4xx is a rejection; a 5xx may come after the write.
+        return "failed" if error.response.status_code < 500 else "unknown"
+    # Timeouts and dropped connections after the request was sent.
+    return "unknown"
+
+
+def _is_retryable(error: requests.RequestException) -> bool:
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+def _create_with_retries(
+    context: Context,
+    appointment: CreateAppointment,
+    max_retries: int,
+    backoff: float,
+) -> Tuple[str, Optional[str]]:
+    attempt = 0
+    while True:
+        try:
+            create_appointment(context, **appointment.model_dump())
+            return "created", None
+        except AppointmentConflictError as e:
+            return "conflicts", str(e)
+        except requests.RequestException as e:
+            if attempt >= max_retries or not _is_retryable(e):
+                return _outcome(e), str(e)
+        time.sleep(backoff * 2**attempt)
+        attempt += 1
+
+
+def import_appointments(
+    context: Context,
+    rows: Iterable[Dict],
+    concurrency: int = 8,
+    max_retries: int = 3,
+    backoff: float = 0.5,
+    checkpoint: Optional[str] = None,
+    checkpoint_every: int = 100,
+) -> ImportSummary:
+    """
+    Create appointments in bulk.
+
+    Parameters:
+        rows (iterable[dict]): The raw appointment rows.
+        concurrency (int, optional): The maximum number of concurrent
+        create requests.
+        max_retries (int, optional): The number of retries for requests
+        rejected before being processed, such as rate limited ones.
+        backoff (float, optional): The initial retry delay in seconds.
+        checkpoint (str, optional): The path of the checkpoint file. Rows
+        already completed in it are skipped, and failed ones retried.
+        checkpoint_every (int, optional): The number of rows between
+        checkpoint writes.
+
+    Returns:
+        ImportSummary: The import counts and errors.
+    """
+    summary = ImportSummary()
+    progress = _Progress(checkpoint)
+    business_id = context.get("business_id") or ""
+    imported = ConflictIndex()
+
+    def prepare() -> Iterator[Tuple[int, str, object]]:
+        for number, row in enumerate(rows, start=1):
+            if progress.should_skip(number):
+                summary.skipped += 1
+                continue
+            if isinstance(row, InvalidRow):
+                yield number, "invalid", row.message
+                continue
+            try:
+                appointment = CreateAppointment(**row)
+                start = _parse_datetime(appointment.start_time)
+                end = _parse_datetime(appointment.end_time)
+            except (ValidationError, ValueError, TypeError) as e:
+                yield number, "invalid", str(e)
+                continue
+            if appointment.employee_id:
+                try:
+                    appointment_index.check(
+                        business_id, appointment.employee_id, start, end
+                    )
+                    imported.check(
+                        business_id, appointment.employee_id, start, end
+                    )
+                except AppointmentConflictError as e:
+                    yield number, "conflicts", str(e)
+                    continue
+                imported.add(
+                    business_id,
+                    appointment.employee_id,
+                    f"row {number}",
+                    start,
+                    end,
+                )
+            yield number, "pending", appointment
+
+    def submit(item: Tuple[int, str, object]) -> Tuple[int, str, Optional[str]]:
+        number, outcome, payload = item
+        if outcome == "pending":
+            outcome, payload = _create_with_retries(
+                context, payload, max_retries, backoff
+            )
+        # Recorded as soon as the row finishes, so an interrupted import
+        # checkpoints every row that was created.
+        progress.finish(number, outcome)
+        return number, outcome, payload
+
+    results = ordered_map(submit, prepare(), concurrency)
+    try:
+        for count, (number, outcome, message) in enumerate(results, 1):
+            summary.record(number, outcome, message)
+            if count % checkpoint_every == 0:
+                progress.save()
+    finally:
+        # Waits for the rows in flight before saving.
+        results.close()
+        progress.save()
+
+    summary.elapsed = time.monotonic() - summary.started
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Import appointments into Appointy."
+    )
+    parser.add_argument("path", help="CSV or NDJSON file of appointments")
+    parser.add_argument("--format", choices=["csv", "ndjson"])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--checkpoint")
+    args = parser.parse_args(argv)
+
+    file_format = args.format or (
+        "csv" if args.path.endswith(".csv") else "ndjson"
+    )
+    context = Context(
+        api_base_url=os.environ.get("APPOINTY_API_BASE_URL"),
+        api_key=os.environ.get("APPOINTY_API_KEY"),
+        business_id=os.environ.get("APPOINTY_BUSINESS_ID"),
+    )
+
+    with open(args.path, newline="") as stream:
+        summary = import_appointments(
+            context,
+            read_rows(stream, file_format),
+            concurrency=args.concurrency,
+            max_retries=args.max_retries,
+            checkpoint=args.checkpoint,
+        )
+
+    print(summary)
+    return 1 if summary.failed or summary.unknown else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
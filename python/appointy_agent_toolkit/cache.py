@@ -0,0 +1,126 @@
+"""Availability and node caches for the Appointy functions."""
+
+import threading
+import time
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Define availability cache key type: (business_id, services, employees)
+AvailabilityKey = Tuple[str, Tuple[str, ...], Tuple[str, ...]]
+
+
+def availability_key(business_id: str, filters: Dict) -> AvailabilityKey:
+    """Build the cache key for a business and availability filters."""
+    return (
+        business_id,
+        tuple(sorted(filters.get("services") or [])),
+        tuple(sorted(filters.get("employees") or [])),
+    )
+
+
+class AvailabilityCache:
+    """Cache of availability data stored per day with a short TTL.
+
+    Entries are grouped by ``kind`` (for example ``"slots"`` or ``"dates"``)
+    and by an :func:`availability_key`, so range queries can be answered by
+    merging cached days and fetching only the missing ones.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[
+            Tuple[str, Hashable], Dict[date, Tuple[float, Any]]
+        ] = {}
+
+    def lookup(
+        self, kind: str, key: Hashable, days: Iterable[date]
+    ) -> Tuple[Dict[date, Any], List[date]]:
+        """Return the cached values for ``days`` and the days missing."""
+        now = self._clock()
+        hits: Dict[date, Any] = {}
+        missing: List[date] = []
+        with self._lock:
+            entries = self._entries.get((kind, key), {})
+            for day in days:
+                entry = entries.get(day)
+                if entry is not None and entry[0] > now:
+                    hits[day] = entry[1]
+                else:
+                    entries.pop(day, None)
+                    missing.append(day)
+        return hits, missing
+
+    def store(self, kind: str, key: Hashable, values: Dict[date, Any]):
+        """Store per-day values for ``key``."""
+        expires = self._clock() + self.ttl
+        with self._lock:
+            entries = self._entries.setdefault((kind, key), {})
+            for day, value in values.items():
+                entries[day] = (expires, value)
+
+    def invalidate(
+        self, days: Iterable[date], business_id: Optional[str] = None
+    ):
+        """Drop cached values for ``days``, optionally for one business."""
+        days = set(days)
+        with self._lock:
+            for (_, key), entries in self._entries.items():
+                if business_id is not None and key[0] != business_id:
+                    continue
+                for day in days:
+                    entries.pop(day, None)
+
+    def clear(self):
+        """Drop every cached value."""
+        with self._lock:
+            self._entries.clear()
+
+
+availability_cache = AvailabilityCache()
+
+
+class NodeCache:
+    """Resolved GraphQL nodes cached per group and node ID.
+
+    Nodes such as employees rarely change, so they are kept until cleared
+    and a mapping refresh only resolves IDs not seen before.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._nodes: Dict[Tuple[str, str], Dict] = {}
+
+    def lookup(
+        self, group_id: str, ids: Iterable[str]
+    ) -> Tuple[Dict[str, Dict], List[str]]:
+        """Return the cached nodes for ``ids`` and the IDs missing."""
+        hits: Dict[str, Dict] = {}
+        missing: List[str] = []
+        with self._lock:
+            for id in ids:
+                node = self._nodes.get((group_id, id))
+                if node is not None:
+                    hits[id] = node
+                else:
+                    missing.append(id)
+        return hits, missing
+
+    def store(self, group_id: str, nodes: Iterable[Dict]):
+        """Store resolved nodes by their ``id``."""
+        with self._lock:
+            for node in nodes:
+                self._nodes[(group_id, node["id"])] = node
+
+    def clear(self):
+        """Drop every cached node."""
+        with self._lock:
+            self._nodes.clear()
+
+
+employee_node_cache = NodeCache()
@@ -0,0 +1,243 @@
+"""Compact bitset calendar for Appointy availability."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from functools import reduce
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .functions import (
+    _day_start,
+    _format_datetime,
+    _parse_datetime,
+    get_available_slots,
+)
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class AvailabilityCalendar:
+    """Availability stored as one bitset per UTC day.
+
+    Bit ``i`` of a day's bitset is set when the ``i``-th bucket of
+    ``resolution`` minutes of that day is available. Bitsets are plain
+    Python integers, so intersection and union across employees or services
+    run as whole-day bitwise operations instead of per-slot comparisons.
+    """
+
+    __slots__ = ("resolution", "days")
+
+    def __init__(
+        self,
+        days: Optional[Dict[date, int]] = None,
+        resolution: int = 1,
+    ):
+        if MINUTES_PER_DAY % resolution:
+            raise ValueError("Resolution must divide a day into whole buckets")
+        self.resolution = resolution
+        self.days: Dict[date, int] = {
+            day: bits for day, bits in (days or {}).items() if bits
+        }
+
+    @property
+    def buckets_per_day(self) -> int:
+        return MINUTES_PER_DAY // self.resolution
+
+    @property
+    def full_day(self) -> int:
+        return (1 << self.buckets_per_day) - 1
+
+    @classmethod
+    def from_slots(
+        cls, slots: Iterable[str], resolution: int = 1
+    ) -> AvailabilityCalendar:
+        """Build a calendar from ``"start - end"`` slot strings.
+
+        Only buckets entirely covered by a slot are marked available.
+        """
+        calendar = cls(resolution=resolution)
+        for slot in slots:
+            start, end = slot.split(" - ", 1)
+            calendar.add(_parse_datetime(start), _parse_datetime(end))
+        return calendar
+
+    @classmethod
+    def from_dates(
+        cls, dates: Iterable[str], resolution: int = 1
+    ) -> AvailabilityCalendar:
+        """Build a calendar marking each of the given dates fully available."""
+        calendar = cls(resolution=resolution)
+        for value in dates:
+            calendar.days[_parse_datetime(value).date()] = calendar.full_day
+        return calendar
+
+    def add(self, start: datetime, end: datetime):
+        """Mark the buckets fully covered by [start, end) as available."""
+        bucket = self.resolution * 60
+        day = start.date()
+        while start < end:
+            day_start = _day_start(day)
+            day_end = min(end, day_start + timedelta(days=1))
+            first = -(-int((start - day_start).total_seconds()) // bucket)
+            last = int((day_end - day_start).total_seconds()) // bucket
+            if last > first:
+                bits = ((1 << (last - first)) - 1) << first
+                self.days[day] = self.days.get(day, 0) | bits
+            day += timedelta(days=1)
+            start = _day_start(day)
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        """Whether every bucket overlapping [start, end) is available."""
+        if start >= end:
+            return False
+        bucket = self.resolution * 60
+        day = start.date()
+        while start < end:
+            day_start = _day_start(day)
+            day_end = min(end, day_start + timedelta(days=1))
+            first = int((start - day_start).total_seconds()) // bucket
+            last = -(-int((day_end - day_start).total_seconds()) // bucket)
+            bits = ((1 << (last - first)) - 1) << first
+            if self.days.get(day, 0) & bits != bits:
+                return False
+            day += timedelta(days=1)
+            start = _day_start(day)
+        return True
+
+    def _combine(
+        self, other: AvailabilityCalendar, intersect: bool
+    ) -> AvailabilityCalendar:
+        if self.resolution != other.resolution:
+            raise ValueError("Calendars must share the same resolution")
+        if intersect:
+            days = {
+                day: bits & other.days[day]
+                for day, bits in self.days.items()
+                if day in other.days
+            }
+        else:
+            days = dict(self.days)
+            for day, bits in other.days.items():
+                days[day] = days.get(day, 0) | bits
+        return AvailabilityCalendar(days, resolution=self.resolution)
+
+    def __and__(self, other: AvailabilityCalendar) -> AvailabilityCalendar:
+        return self._combine(other, intersect=True)
+
+    def __or__(self, other: AvailabilityCalendar) -> AvailabilityCalendar:
+        return self._combine(other, intersect=False)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, AvailabilityCalendar):
+            return NotImplemented
+        return (
+            self.resolution == other.resolution and self.days == other.days
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.days)
+
+    @staticmethod
+    def intersection(
+        *calendars: AvailabilityCalendar,
+    ) -> AvailabilityCalendar:
+        """Availability shared by every calendar."""
+        return reduce(lambda a, b: a & b, calendars)
+
+    @staticmethod
+    def union(*calendars: AvailabilityCalendar) -> AvailabilityCalendar:
+        """Availability of any of the calendars."""
+        return reduce(lambda a, b: a | b, calendars)
+
+    def minutes_available(self, day: Optional[date] = None) -> int:
+        """Available minutes on ``day``, or across all days."""
+        if day is not None:
+            return self.days.get(day, 0).bit_count() * self.resolution
+        return sum(bits.bit_count() for bits in self.days.values()) * (
+            self.resolution
+        )
+
+    def _runs(self) -> List[Tuple[datetime, datetime]]:
+        """Contiguous available ranges, merged across midnight."""
+        runs: List[Tuple[datetime, datetime]] = []
+        step = timedelta(minutes=self.resolution)
+        for day in sorted(self.days):
+            bits = self.days[day]
+            day_start = _day_start(day)
+            offset = 0
+            while bits:
+                gap = (bits & -bits).bit_length() - 1
+                bits >>= gap
+                offset += gap
+                length = (~bits & (bits + 1)).bit_length() - 1
+                start = day_start + offset * step
+                end = start + length * step
+                if runs and runs[-1][1] == start:
+                    runs[-1] = (runs[-1][0], end)
+                else:
+                    runs.append((start, end))
+                bits >>= length
+                offset += length
+        return runs
+
+    def to_slots(self, slots: Optional[Iterable[str]] = None) -> List[str]:
+        """Convert to the ``"start - end"`` strings of get_available_slots.
+
+        With ``slots``, the ones the calendar covers are returned as they
+        are, keeping their boundaries. Otherwise the available ranges are
+        returned, with adjacent slots merged into one range.
+        """
+        if slots is not None:
+            return [
+                slot
+                for slot in slots
+                if self.covers(
+                    *(_parse_datetime(value) for value in slot.split(" - ", 1))
+                )
+            ]
+        return [
+            f"{_format_datetime(start)} - {_format_datetime(end)}"
+            for start, end in self._runs()
+        ]
+
+    def to_dates(self) -> List[str]:
+        """Convert to the date strings of get_available_dates."""
+        return [day.isoformat() for day in sorted(self.days)]
+
+
+def get_common_available_slots(
+    self,
+    filters: List[Dict],
+    from_date: str,
+    to_date: str,
+    resolution: int = 1,
+) -> List[str]:
+    """
+    Get the slots of the first filters during which all the filters are
+    available, such as a service needing several staff members at once.
+
+    Parameters:
+        filters (list[dict]): The filters of get_available_slots, one per
+        service or employee.
+        from_date (str): The start of the range.
+        to_date (str): The end of the range.
+        resolution (int, optional): The bucket size in minutes. Slots not
+        aligned to it are kept only when their whole buckets are free.
+
+    Returns:
+        list[str]: The ``"start - end"`` slots of the first filters, with
+        their boundaries kept.
+    """
+    if not filters:
+        raise ValueError("At least one filter is required")
+    slots = [
+        get_available_slots(self, selection, from_date, to_date)
+        for selection in filters
+    ]
+    common = AvailabilityCalendar.intersection(
+        *(
+            AvailabilityCalendar.from_slots(each, resolution=resolution)
+            for each in slots
+        )
+    )
+    return common.to_slots(slots[0])
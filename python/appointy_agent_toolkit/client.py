@@ -0,0 +1,51 @@
+"""Appointy client."""
+
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+import requests
+
+from . import functions
+from .configuration import Context
+
+
+class AppointyClient:
+    """Client the business-level Appointy functions run against.
+
+    Those functions take the client as ``self`` for its ``config`` and its
+    ``_make_request`` transport, which reuses one pooled requests.Session.
+    """
+
+    list_services = functions.list_services
+    _fetch_employee_mapping = functions._fetch_employee_mapping
+    _query_employee_nodes = functions._query_employee_nodes
+
+    def __init__(self, context: Context, timeout: float = 30.0):
+        self.config = SimpleNamespace(
+            business_id=context.get("business_id"),
+            booking_link=context.get("booking_link"),
+        )
+        self._base_url = context.get("api_base_url") or ""
+        self._timeout = timeout
+        self._session = requests.Session()
+        self._session.headers["Authorization"] = (
+            f"Bearer {context.get('api_key')}"
+        )
+        self._employee_mapping: Dict[str, str] = {}
+
+    def _make_request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict] = None,
+        json_data: Any = None,
+    ) -> Any:
+        response = self._session.request(
+            method,
+            f"{self._base_url}{path}",
+            params=params,
+            json=json_data,
+            timeout=self._timeout,
+        )
+        response.raise_for_status()
+        return response.json()
@@ -0,0 +1,35 @@
+"""Concurrency helpers shared by the Appointy functions."""
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def ordered_map(
+    fn: Callable[[T], R], items: Iterable[T], max_workers: int = 4
+) -> Iterator[R]:
+    """Map ``fn`` over ``items`` concurrently, yielding results in order.
+
+    At most ``max_workers`` calls are in flight at once, so results are
+    streamed as soon as the earliest outstanding call completes and memory
+    stays bounded regardless of the number of items.
+    """
+    if max_workers <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending: Deque[Future] = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -20,6 +20,8 @@ class Actions(TypedDict, total=False):
 class Context(TypedDict, total=False):
     api_base_url: Optional[str]
     api_key: Optional[str]
+    business_id: Optional[str]
+    booking_link: Optional[str]
 
 # Define Configuration type
 class Configuration(TypedDict, total=False):
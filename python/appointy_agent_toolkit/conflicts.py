@@ -0,0 +1,235 @@
+"""Local conflict checks for Appointy appointments."""
+
+import json
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Define staff key type: (business_id, employee_id)
+StaffKey = Tuple[str, str]
+
+CANCELLED_STATUSES = ("cancelled", "canceled")
+
+
+class AppointmentConflictError(ValueError):
+    """Raised when an appointment overlaps a known one for the same staff."""
+
+    def __init__(
+        self,
+        conflicts: List[str],
+        alternatives: List[Tuple[datetime, datetime]],
+    ):
+        self.conflicts = conflicts
+        self.alternatives = alternatives
+        message = "Appointment conflicts with " + ", ".join(conflicts) + "."
+        if alternatives:
+            message += " Nearest free alternatives: " + ", ".join(
+                f"{_format(start)} - {_format(end)}"
+                for start, end in alternatives
+            )
+        super().__init__(message)
+
+    def to_json(self) -> str:
+        """The conflict as a tool result the agent can act on."""
+        return json.dumps(
+            {
+                "conflict": {
+                    "appointments": self.conflicts,
+                    "message": str(self),
+                },
+                "alternatives": [
+                    {"start_time": _format(start), "end_time": _format(end)}
+                    for start, end in self.alternatives
+                ],
+            }
+        )
+
+
+def _format(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class StaffSchedule:
+    """Appointments of one staff member, sorted by start time.
+
+    Alongside the sorted starts the schedule keeps the running maximum of
+    end times, which is non-decreasing. An overlap check is then two binary
+    searches, O(log n). Inserts and removals are O(n): they shift the arrays
+    and recompute the running maximum after the change. Checks far outnumber
+    bookings, and a staff member has at most a few thousand appointments in
+    the synced window, so flat lists beat a balanced interval tree here.
+    """
+
+    def __init__(self):
+        self._starts: List[datetime] = []
+        self._ends: List[datetime] = []
+        self._ids: List[str] = []
+        self._max_ends: List[datetime] = []
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _refresh_max_ends(self, index: int):
+        del self._max_ends[index:]
+        running = self._max_ends[-1] if self._max_ends else None
+        for end in self._ends[index:]:
+            running = end if running is None or end > running else running
+            self._max_ends.append(running)
+
+    def add(self, appointment_id: str, start: datetime, end: datetime):
+        index = bisect_right(self._starts, start)
+        self._starts.insert(index, start)
+        self._ends.insert(index, end)
+        self._ids.insert(index, appointment_id)
+        self._refresh_max_ends(index)
+
+    def remove(self, appointment_id: str):
+        index = self._ids.index(appointment_id)
+        del self._starts[index]
+        del self._ends[index]
+        del self._ids[index]
+        self._refresh_max_ends(index)
+
+    def overlapping(
+        self,
+        start: datetime,
+        end: datetime,
+        exclude_id: Optional[str] = None,
+    ) -> List[str]:
+        """IDs of appointments overlapping [start, end)."""
+        # Only appointments starting before ``end`` can overlap, and among
+        # them only those from the first whose running max end passes
+        # ``start`` onwards.
+        upper = bisect_left(self._starts, end)
+        lower = bisect_right(self._max_ends, start, 0, upper)
+        return [
+            self._ids[i]
+            for i in range(lower, upper)
+            if self._ends[i] > start and self._ids[i] != exclude_id
+        ]
+
+    def alternatives(
+        self,
+        start: datetime,
+        end: datetime,
+        count: int = 3,
+        not_before: Optional[datetime] = None,
+        exclude_id: Optional[str] = None,
+    ) -> List[Tuple[datetime, datetime]]:
+        """The ``count`` free ranges of the same duration nearest to start."""
+        duration = end - start
+
+        def free(candidate: datetime) -> bool:
+            if not_before is not None and candidate < not_before:
+                return False
+            return not self.overlapping(
+                candidate, candidate + duration, exclude_id
+            )
+
+        later: List[datetime] = []
+        lower = bisect_right(self._max_ends, start)
+        for i in range(lower, len(self._ids)):
+            # Every later appointment ends after it starts, so once we have
+            # enough candidates earlier than this start we can stop.
+            if len(later) >= count and self._starts[i] > later[count - 1]:
+                break
+            if self._ids[i] != exclude_id and self._ends[i] >= start:
+                if free(self._ends[i]) and self._ends[i] not in later:
+                    later.append(self._ends[i])
+                    later.sort()
+
+        earlier: List[datetime] = []
+        for i in range(bisect_left(self._starts, end) - 1, -1, -1):
+            if len(earlier) >= count:
+                break
+            candidate = self._starts[i] - duration
+            if (
+                self._ids[i] != exclude_id
+                and candidate < start
+                and free(candidate)
+                and candidate not in earlier
+            ):
+                earlier.append(candidate)
+
+        nearest = sorted(
+            later[:count] + earlier,
+            key=lambda candidate: abs(candidate - start),
+        )
+        return [
+            (candidate, candidate + duration)
+            for candidate in sorted(nearest[:count])
+        ]
+
+
+class ConflictIndex:
+    """Known appointments indexed per business and staff member."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schedules: Dict[StaffKey, StaffSchedule] = {}
+        self._appointments: Dict[str, Tuple[StaffKey, datetime, datetime]] = {}
+
+    def get(self, appointment_id: str) -> Optional[Tuple[StaffKey, datetime, datetime]]:
+        """The staff key, start and end of a known appointment."""
+        with self._lock:
+            return self._appointments.get(appointment_id)
+
+    def add(
+        self,
+        business_id: str,
+        employee_id: str,
+        appointment_id: str,
+        start: datetime,
+        end: datetime,
+    ):
+        """Add or move a known appointment."""
+        key = (business_id, employee_id)
+        with self._lock:
+            self._remove(appointment_id)
+            self._schedules.setdefault(key, StaffSchedule()).add(
+                appointment_id, start, end
+            )
+            self._appointments[appointment_id] = (key, start, end)
+
+    def _remove(self, appointment_id: str):
+        known = self._appointments.pop(appointment_id, None)
+        if known is not None:
+            self._schedules[known[0]].remove(appointment_id)
+
+    def remove(self, appointment_id: str):
+        """Forget a known appointment."""
+        with self._lock:
+            self._remove(appointment_id)
+
+    def check(
+        self,
+        business_id: str,
+        employee_id: str,
+        start: datetime,
+        end: datetime,
+        exclude_id: Optional[str] = None,
+        alternatives: int = 3,
+    ):
+        """Raise AppointmentConflictError if [start, end) is already booked."""
+        not_before = datetime.now(start.tzinfo)
+        with self._lock:
+            schedule = self._schedules.get((business_id, employee_id))
+            if schedule is None:
+                return
+            conflicts = schedule.overlapping(start, end, exclude_id)
+            if not conflicts:
+                return
+            free = schedule.alternatives(
+                start, end, alternatives, not_before, exclude_id
+            )
+        raise AppointmentConflictError(conflicts, free)
+
+    def clear(self):
+        """Forget every known appointment."""
+        with self._lock:
+            self._schedules.clear()
+            self._appointments.clear()
+
+
+appointment_index = ConflictIndex()
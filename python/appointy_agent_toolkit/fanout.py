@@ -0,0 +1,162 @@
+"""Concurrent availability search across services and employees."""
+
+import heapq
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .functions import (
+    _format_datetime,
+    _parse_datetime,
+    get_available_slots,
+)
+
+# Define combination type: (service_id, employee_id)
+Combination = Tuple[Optional[str], Optional[str]]
+
+
+def _combinations(
+    services: List[str], employees: List[str]
+) -> List[Combination]:
+    return list(
+        itertools.product(services or [None], employees or [None])
+    )
+
+
+def _windows(
+    start: datetime, end: datetime, days: Optional[int]
+) -> List[Tuple[datetime, datetime]]:
+    """Split [start, end) into consecutive windows of ``days`` days."""
+    if not days:
+        return [(start, end)]
+    windows = []
+    while start < end:
+        window_end = min(start + timedelta(days=days), end)
+        windows.append((start, window_end))
+        start = window_end
+    return windows
+
+
+def _query_combination(
+    self,
+    combination: Combination,
+    start: datetime,
+    end: datetime,
+) -> List[Tuple[datetime, Dict[str, Optional[str]]]]:
+    service_id, employee_id = combination
+    filters = {
+        "services": [service_id] if service_id else [],
+        "employees": [employee_id] if employee_id else [],
+    }
+    slots = []
+    for slot in get_available_slots(
+        self, filters, _format_datetime(start), _format_datetime(end)
+    ):
+        start_time, end_time = slot.split(" - ", 1)
+        slots.append(
+            (
+                _parse_datetime(start_time),
+                {
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "service_id": service_id,
+                    "employee_id": employee_id,
+                },
+            )
+        )
+    return slots
+
+
+def iter_available_slots(
+    self,
+    services: List[str],
+    employees: List[str],
+    from_date: str,
+    to_date: str,
+    max_workers: int = 8,
+    window_days: Optional[int] = 7,
+) -> Iterator[Dict[str, Optional[str]]]:
+    """
+    Stream available slots for every service/employee combination.
+
+    Each window of ``window_days`` days is queried for all combinations
+    concurrently, at most ``max_workers`` at a time, and its slots are
+    yielded merged in start time order before the next window is queried.
+    Closing the iterator early skips the remaining windows.
+
+    Parameters:
+        services (list[str]): The IDs of the services, or [] for any.
+        employees (list[str]): The IDs of the employees, or [] for any.
+        from_date (str): Start date for availability search.
+        to_date (str): End date for availability search.
+        max_workers (int, optional): The maximum number of concurrent
+        queries.
+        window_days (int, optional): The number of days queried per step,
+        or None to query the whole range at once.
+
+    Yields:
+        dict: The start_time, end_time, service_id and employee_id of a slot.
+    """
+    if not self.config.business_id:
+        raise ValueError("Business ID not configured")
+
+    combinations = _combinations(services, employees)
+    start = _parse_datetime(from_date)
+    end = _parse_datetime(to_date, end_of_day=True)
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(combinations)))
+    ) as executor:
+        for window_start, window_end in _windows(start, end, window_days):
+            results = executor.map(
+                lambda combination: _query_combination(
+                    self, combination, window_start, window_end
+                ),
+                combinations,
+            )
+            merged = heapq.merge(*results, key=lambda slot: slot[0])
+            for _, slot in merged:
+                yield slot
+
+
+def find_earliest_slots(
+    self,
+    services: List[str],
+    employees: List[str],
+    from_date: str,
+    to_date: str,
+    limit: int = 5,
+    max_workers: int = 8,
+    window_days: Optional[int] = 7,
+) -> List[Dict[str, Optional[str]]]:
+    """
+    Find the earliest available slots with any of the given services and
+    employees.
+
+    Parameters:
+        services (list[str]): The IDs of the services, or [] for any.
+        employees (list[str]): The IDs of the employees, or [] for any.
+        from_date (str): Start date for availability search.
+        to_date (str): End date for availability search.
+        limit (int, optional): The number of slots to return.
+        max_workers (int, optional): The maximum number of concurrent
+        queries.
+        window_days (int, optional): The number of days queried per step.
+
+    Returns:
+        list[dict]: The earliest slots, sorted by start time.
+    """
+    slots = iter_available_slots(
+        self,
+        services,
+        employees,
+        from_date,
+        to_date,
+        max_workers=max_workers,
+        window_days=window_days,
+    )
+    try:
+        return list(itertools.islice(slots, limit))
+    finally:
+        slots.close()
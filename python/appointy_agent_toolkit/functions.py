@@ -1,9 +1,20 @@
 import requests
-from typing import Optional, List, Dict
-from pydantic import BaseModel
+from typing import Any, Callable, Iterator, Optional, List, Dict, Tuple, Union
+from pydantic import BaseModel, TypeAdapter
+from .cache import availability_cache, availability_key, employee_node_cache
+from .concurrency import ordered_map
+from .conflicts import CANCELLED_STATUSES, appointment_index
+from .graphql import GraphQLBatch, persisted_payload, post_graphql
+from .queries import (
+    AVAILABLE_DATES_QUERY,
+    AVAILABLE_SLOTS_QUERY,
+    EMPLOYEE_MAPPING_QUERY,
+    EMPLOYEE_NODES_QUERY,
+)
 from .configuration import Context
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 import base64
+import itertools
 import json
 import logging
 
@@ -17,6 +28,32 @@ class Appointment(BaseModel):
     end_time: str
     customer_name: str
     customer_email: str
+    employee_id: Optional[str] = None
+    status: Optional[str] = None
+    updated_at: Optional[str] = None
+
+
+class AppointmentPage(BaseModel):
+    data: List[Appointment] = []
+    next_cursor: Optional[str] = None
+
+
+# Built once and reused, so each response page is validated straight from
+# its raw bytes in a single call. Servers without pagination answer with a
+# bare list.
+appointment_page_adapter: TypeAdapter = TypeAdapter(
+    Union[List[Appointment], AppointmentPage]
+)
+
+
+def _parse_appointment_page(
+    content: bytes,
+) -> Tuple[List[Appointment], Optional[str]]:
+    """Validate a raw appointments response into rows and the next cursor"""
+    page = appointment_page_adapter.validate_json(content)
+    if isinstance(page, list):
+        return page, None
+    return page.data, page.next_cursor
 
 
 def create_appointment(
@@ -26,19 +63,27 @@ def create_appointment(
     end_time: str,
     customer_name: str,
     customer_email: str,
+    employee_id: Optional[str] = None,
 ) -> Appointment:
     """
     Create an appointment.
 
+    When the staff member is given, the appointment is first checked
+    against the known appointments of that staff member.
+
     Parameters:
         title (str): The title of the appointment.
         start_time (str): The start time of the appointment.
         end_time (str): The end time of the appointment.
         customer_name (str): The name of the customer.
         customer_email (str): The email address of the customer.
+        employee_id (str, optional): The ID of the staff member.
 
     Returns:
         Appointment: The created appointment.
+
+    Raises:
+        AppointmentConflictError: The staff member is already booked.
     """
     appointment_data = {
         "title": title,
@@ -47,29 +92,203 @@ def create_appointment(
         "customer_name": customer_name,
         "customer_email": customer_email,
     }
+    if employee_id:
+        appointment_data["employee_id"] = employee_id
+        appointment_index.check(
+            context.get("business_id") or "",
+            employee_id,
+            _parse_datetime(start_time),
+            _parse_datetime(end_time),
+        )
 
     response = requests.post(
-        f"{context.api_base_url}/appointments",
-        headers={"Authorization": f"Bearer {context.api_key}"},
+        f"{context.get('api_base_url')}/appointments",
+        headers={"Authorization": f"Bearer {context.get('api_key')}"},
         json=appointment_data,
     )
     response.raise_for_status()
-    return Appointment(**response.json())
+    appointment = Appointment(**response.json())
+    _record_booking(context, appointment)
+    return appointment
+
+
+def _check_update(
+    context: Context,
+    appointment_id: str,
+    start_time: Optional[str],
+    end_time: Optional[str],
+    employee_id: Optional[str],
+):
+    """Check the new time of a moved appointment against its staff member
+
+    Returns the appointment as indexed before the update, read before the
+    update moves it: the days it leaves free up too.
+    """
+    known = appointment_index.get(appointment_id)
+    if start_time or end_time or employee_id:
+        (_, staff), start, end = known if known else ((None, None), None, None)
+        staff = employee_id or staff
+        start = _parse_datetime(start_time) if start_time else start
+        end = _parse_datetime(end_time) if end_time else end
+        if staff and start and end:
+            appointment_index.check(
+                context.get("business_id") or "",
+                staff,
+                start,
+                end,
+                exclude_id=appointment_id,
+            )
+    return known
+
+
+def _record_booking(
+    context: Context,
+    appointment: Appointment,
+    *times: Optional[str],
+    known=None,
+):
+    """Index a created or updated appointment and invalidate its days
+
+    The days of ``times``, of the appointment and of its ``known`` previous
+    slot are dropped from the availability cache of the business.
+    """
+    _index_appointment(context, appointment)
+    days = set(_touched_days(*times))
+    days.update(_touched_days(appointment.start_time, appointment.end_time))
+    if known:
+        _, old_start, old_end = known
+        days.update(_days_between(old_start, old_end))
+    availability_cache.invalidate(
+        days, business_id=context.get("business_id") or None
+    )
+
+
+def _index_appointment(context: Context, appointment: Appointment):
+    """Record an appointment in the local conflict index"""
+    if (
+        not appointment.employee_id
+        or appointment.status in CANCELLED_STATUSES
+    ):
+        appointment_index.remove(appointment.id)
+        return
+    try:
+        start = _parse_datetime(appointment.start_time)
+        end = _parse_datetime(appointment.end_time)
+    except ValueError:
+        appointment_index.remove(appointment.id)
+        return
+    appointment_index.add(
+        context.get("business_id") or "",
+        appointment.employee_id,
+        appointment.id,
+        start,
+        end,
+    )
+
+
+def iter_appointments(
+    context: Context,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    customer_email: Optional[str] = None,
+    status: Optional[str] = None,
+    page_size: int = 100,
+    cursor: Optional[str] = None,
+    updated_since: Optional[str] = None,
+) -> Iterator[Appointment]:
+    """
+    Stream appointments page by page.
+
+    Pages are requested with cursor pagination as they are consumed, and
+    each page is validated from the raw response bytes when it is reached.
+
+    Parameters:
+        from_date (str, optional): Only appointments starting at or after
+        this time.
+        to_date (str, optional): Only appointments starting before this time.
+        customer_email (str, optional): The email address of the customer.
+        status (str, optional): The status of the appointments.
+        page_size (int, optional): The number of appointments per page.
+        cursor (str, optional): The cursor to resume listing from.
+        updated_since (str, optional): Only appointments created or changed
+        at or after this time.
+
+    Yields:
+        Appointment: The matching appointments.
+    """
+    params: dict = {"limit": page_size}
+    if from_date:
+        params["from_date"] = from_date
+    if to_date:
+        params["to_date"] = to_date
+    if customer_email:
+        params["customer_email"] = customer_email
+    if status:
+        params["status"] = status
+    if updated_since:
+        params["updated_since"] = updated_since
+
+    while True:
+        if cursor:
+            params["cursor"] = cursor
+        response = requests.get(
+            f"{context.get('api_base_url')}/appointments",
+            headers={"Authorization": f"Bearer {context.get('api_key')}"},
+            params=params,
+        )
+        response.raise_for_status()
+        appointments, cursor = _parse_appointment_page(response.content)
+
+        for appointment in appointments:
+            _index_appointment(context, appointment)
+            yield appointment
+
+        if not cursor:
+            return
 
 
-def list_appointments(context: Context) -> list[Appointment]:
+def list_appointments(
+    context: Context,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    customer_email: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = 100,
+) -> list[Appointment]:
     """
     List appointments.
 
+    Without a date range, appointments from now through the next 7 days are
+    listed.
+
+    Parameters:
+        from_date (str, optional): Only appointments starting at or after
+        this time.
+        to_date (str, optional): Only appointments starting before this time.
+        customer_email (str, optional): The email address of the customer.
+        status (str, optional): The status of the appointments.
+        limit (int, optional): The maximum number of appointments to return.
+
     Returns:
         list[Appointment]: A list of appointments.
     """
-    response = requests.get(
-        f"{context.api_base_url}/appointments",
-        headers={"Authorization": f"Bearer {context.api_key}"},
+    if not from_date and not to_date:
+        now = datetime.now(timezone.utc)
+        from_date = _format_datetime(now)
+        to_date = _format_datetime(now + timedelta(days=7))
+
+    appointments = iter_appointments(
+        context,
+        from_date=from_date,
+        to_date=to_date,
+        customer_email=customer_email,
+        status=status,
+        page_size=min(limit, 100),
     )
-    response.raise_for_status()
-    return [Appointment(**appointment) for appointment in response.json()]
+    try:
+        return list(itertools.islice(appointments, limit))
+    finally:
+        appointments.close()
 
 
 def update_appointment(
@@ -80,10 +299,14 @@ def update_appointment(
     end_time: Optional[str] = None,
     customer_name: Optional[str] = None,
     customer_email: Optional[str] = None,
+    employee_id: Optional[str] = None,
 ) -> Appointment:
     """
     Update an appointment.
 
+    When the appointment is moved, the new time is first checked against
+    the known appointments of its staff member.
+
     Parameters:
         appointment_id (str): The ID of the appointment.
         title (str, optional): The title of the appointment.
@@ -91,9 +314,13 @@ def update_appointment(
         end_time (str, optional): The end time of the appointment.
         customer_name (str, optional): The name of the customer.
         customer_email (str, optional): The email address of the customer.
+        employee_id (str, optional): The ID of the staff member.
 
     Returns:
         Appointment: The updated appointment.
+
+    Raises:
+        AppointmentConflictError: The staff member is already booked.
     """
     appointment_data = {
         "title": title,
@@ -101,16 +328,23 @@ def update_appointment(
         "end_time": end_time,
         "customer_name": customer_name,
         "customer_email": customer_email,
+        "employee_id": employee_id,
     }
     appointment_data = {k: v for k, v in appointment_data.items() if v is not None}
 
+    known = _check_update(
+        context, appointment_id, start_time, end_time, employee_id
+    )
+
     response = requests.put(
-        f"{context.api_base_url}/appointments/{appointment_id}",
-        headers={"Authorization": f"Bearer {context.api_key}"},
+        f"{context.get('api_base_url')}/appointments/{appointment_id}",
+        headers={"Authorization": f"Bearer {context.get('api_key')}"},
         json=appointment_data,
     )
     response.raise_for_status()
-    return Appointment(**response.json())
+    appointment = Appointment(**response.json())
+    _record_booking(context, appointment, start_time, end_time, known=known)
+    return appointment
 
 
 def list_services(self, query: str = "") -> List[Dict]:
@@ -185,18 +419,6 @@ def _fetch_employee_mapping(self) -> Dict[str, str]:
     start_time = datetime.utcnow().isoformat() + "Z"
     end_time = (datetime.utcnow() + timedelta(days=180)).isoformat() + "Z"
 
-    query = """
-    query ImprovedAvailableServicesOrEmployeesQuery(
-      $filter: AvailabilityFilterInput
-      $listEmployees: Boolean!
-    ) {
-      improvedAvailableServicesOrEmployees(filter: $filter, listEmployees: $listEmployees) {
-        availableIds
-        errorMessage
-      }
-    }
-    """
-
     variables = {
         "filter": {
             "timeSlot": {
@@ -212,13 +434,12 @@ def _fetch_employee_mapping(self) -> Dict[str, str]:
         "listEmployees": True
     }
 
-    payload = {
-        "id": "ImprovedAvailableServicesOrEmployeesQuery",
-        "query": query,
-        "variables": variables
-    }
+    payload = persisted_payload(
+        EMPLOYEE_MAPPING_QUERY, variables,
+        operation_id="ImprovedAvailableServicesOrEmployeesQuery",
+    )
 
-    data = self._make_request("POST", "/graphql", json_data=payload)
+    data = post_graphql(self, payload)
     logger.debug(f"Employee mapping response: {data}")
 
     available_ids_encoded = data.get("data", {}).get("improvedAvailableServicesOrEmployees", {}).get("availableIds", "")
@@ -242,36 +463,44 @@ def _fetch_employee_mapping(self) -> Dict[str, str]:
     return mapping
 
 
-def _query_employee_nodes(self, ids: List[str], group_id: str) -> Dict:
-    """Query employee nodes using GraphQL"""
-    query = """
-    query EmployeeNodesQuery($ids: [ID], $groupId: String, $fetchExtraField: Boolean!) {
-        nodes(ids: $ids) {
-            __typename
-            ... on Employee {
-                staffProfiles {
-                    firstName
-                    lastName
-                }
-            }
-            id
-        }
-    }
+def _query_employee_nodes(
+    self,
+    ids: List[str],
+    group_id: str,
+    chunk_size: int = 100,
+    max_workers: int = 4,
+) -> Dict:
+    """Query employee nodes using GraphQL
+
+    IDs already resolved for the group are answered from the node cache.
+    The rest are resolved in chunks of ``chunk_size`` IDs, with up to
+    ``max_workers`` queries in flight, so large groups never send one
+    oversized ``nodes`` query.
     """
+    cached, missing = employee_node_cache.lookup(group_id, ids)
 
-    variables = {
-        "ids": ids,
-        "groupId": group_id,
-        "fetchExtraField": False
-    }
+    def resolve(chunk: List[str]) -> List[Dict]:
+        variables = {
+            "ids": chunk,
+            "groupId": group_id,
+            "fetchExtraField": False
+        }
+        payload = persisted_payload(
+            EMPLOYEE_NODES_QUERY, variables, operation_id="EmployeeNodesQuery"
+        )
+        return [
+            node for node in post_graphql(self, payload)["data"]["nodes"]
+            if node
+        ]
 
-    payload = {
-        "id": "EmployeeNodesQuery",
-        "query": query,
-        "variables": variables
-    }
+    chunks = [
+        missing[i:i + chunk_size] for i in range(0, len(missing), chunk_size)
+    ]
+    for nodes in ordered_map(resolve, chunks, max_workers):
+        employee_node_cache.store(group_id, nodes)
+        cached.update((node["id"], node) for node in nodes)
 
-    return self._make_request("POST", "/graphql", json_data=payload)["data"]
+    return {"nodes": [cached[id] for id in ids if id in cached]}
 
 
 def get_service_info(self, query: str) -> str:
@@ -309,90 +538,208 @@ def get_service_info(self, query: str) -> str:
     return result
 
 
-def get_available_dates(self, filters: Dict, from_date: str, to_date: str) -> List[str]:
-    """Get available dates for booking"""
-    if not self.config.business_id:
-        raise ValueError("Business ID not configured")
+def _parse_datetime(value: str, end_of_day: bool = False) -> datetime:
+    """Parse an ISO date or datetime string into an aware UTC datetime.
 
-    query = """
-    query CalendarPageQuery($timezone: String!, $filter: AvailabilityFilterInput) {
-        appointmentAvailabilityDates(timezone: $timezone, filter: $filter) {
-            available
-            datesStatus
-            errorMessage
-        }
-    }
+    Date-only values resolve to the start of that day, or to the start of
+    the following day when ``end_of_day`` is set, so that date-only ranges
+    are inclusive of their last day.
     """
+    parsed = datetime.fromisoformat(value)
+    if end_of_day and len(value) == 10:
+        parsed += timedelta(days=1)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _format_datetime(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _day_start(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+
+def _days_between(start: datetime, end: datetime) -> List[date]:
+    """List the UTC days touched by the half-open range [start, end)."""
+    days = []
+    day = start.date()
+    while _day_start(day) < end:
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def _contiguous_runs(days: List[date]) -> List[Tuple[date, date]]:
+    """Group sorted days into (first, last) runs of consecutive days."""
+    runs: List[Tuple[date, date]] = []
+    for day in days:
+        if runs and runs[-1][1] + timedelta(days=1) == day:
+            runs[-1] = (runs[-1][0], day)
+        else:
+            runs.append((day, day))
+    return runs
+
+
+def _touched_days(*values: Optional[str]) -> List[date]:
+    """List the UTC days spanned by the given start/end time strings."""
+    times = []
+    for value in values:
+        if value:
+            try:
+                times.append(_parse_datetime(value))
+            except ValueError:
+                continue
+    if not times:
+        return []
+    return _days_between(min(times), max(times) + timedelta(microseconds=1))
 
+
+def _available_dates_payload(
+    business_id: str, filters: Dict, start: datetime, end: datetime
+) -> Dict:
+    """Build the ``datesStatus`` GraphQL payload for a range"""
     variables = {
         "filter": {
             "timeSlot": {
-                "startTime": from_date,
-                "endTime": to_date
+                "startTime": _format_datetime(start),
+                "endTime": _format_datetime(end)
             },
-            "parent": self.config.business_id,
+            "parent": business_id,
             "employees": filters.get('employees', []),
             "services": filters.get('services', []),
         },
         "timezone": "UTC"  # TODO: Make configurable
     }
 
-    payload = {
-        "query": query,
-        "variables": variables
-    }
+    return persisted_payload(AVAILABLE_DATES_QUERY, variables)
 
-    data = self._make_request("POST", "/graphql", json_data=payload)
+
+def _parse_available_dates(data: Dict) -> List[str]:
+    """Decode the available dates of a ``datesStatus`` response"""
     dates_status = data.get("data", {}).get("appointmentAvailabilityDates", {}).get("datesStatus", "")
 
     if not dates_status:
         return []
 
     decoded_dates = base64.b64decode(dates_status).decode('utf-8')
-    return decoded_dates.split(",")
+    return [d for d in decoded_dates.split(",") if d]
 
 
-def get_available_slots(self, filters: Dict, from_date: str, to_date: str) -> List[str]:
-    """Get available time slots for booking"""
+def _dates_by_day(
+    values: List[str], first: date, last: date
+) -> Dict[date, Optional[str]]:
+    """Key available dates by day for the run of days [first, last]"""
+    fetched: Dict[date, Optional[str]] = {
+        day: None for day in _days_between(
+            _day_start(first), _day_start(last + timedelta(days=1))
+        )
+    }
+    for value in values:
+        day = _parse_datetime(value).date()
+        if day in fetched:
+            fetched[day] = value
+    return fetched
+
+
+def _bucket_available_dates(
+    self, filters: Dict, first: date, last: date
+) -> Dict[date, Optional[str]]:
+    """Fetch the available dates of a run of days, keyed by day"""
+    payload = _available_dates_payload(
+        self.config.business_id,
+        filters,
+        _day_start(first),
+        _day_start(last + timedelta(days=1)),
+    )
+    values = _parse_available_dates(post_graphql(self, payload))
+    return _dates_by_day(values, first, last)
+
+
+def _stream_days(
+    self,
+    kind: str,
+    bucket: Callable,
+    filters: Dict,
+    start: datetime,
+    end: datetime,
+    window_days: int,
+    max_workers: int,
+) -> Iterator[Tuple[date, Any]]:
+    """Stream cached or freshly fetched per-day values in day order.
+
+    The days in [start, end) are split into windows of ``window_days`` days
+    that are loaded concurrently. Each window only fetches the days missing
+    from the availability cache.
+    """
+    key = availability_key(self.config.business_id, filters)
+    days = _days_between(start, end)
+    windows = [
+        days[i:i + window_days] for i in range(0, len(days), window_days)
+    ]
+
+    def load(window: List[date]) -> List[Tuple[date, Any]]:
+        cached, missing = availability_cache.lookup(kind, key, window)
+        for first, last in _contiguous_runs(missing):
+            fetched = bucket(self, filters, first, last)
+            availability_cache.store(kind, key, fetched)
+            cached.update(fetched)
+        return [(day, cached[day]) for day in window]
+
+    for loaded in ordered_map(load, windows, min(max_workers, len(windows))):
+        yield from loaded
+
+
+def stream_available_dates(
+    self,
+    filters: Dict,
+    from_date: str,
+    to_date: str,
+    window_days: int = 14,
+    max_workers: int = 4,
+) -> Iterator[str]:
+    """Stream available dates in chronological order, one window at a time"""
     if not self.config.business_id:
         raise ValueError("Business ID not configured")
 
-    query = """
-    query CalendarPageQuery($timezone: String!, $filter: AvailabilityFilterInput) {
-        improvedAppointmentAvailability(filter: $filter) {
-            errorMessage
-            slots {
-                slotType
-                slot {
-                    timeSlot {
-                        endTime
-                        startTime
-                    }
-                }
-            }
-        }
-    }
-    """
+    start = _parse_datetime(from_date)
+    end = _parse_datetime(to_date, end_of_day=True)
+    for _, value in _stream_days(
+        self, "dates", _bucket_available_dates, filters, start, end,
+        window_days, max_workers,
+    ):
+        if value is not None:
+            yield value
+
 
+def get_available_dates(self, filters: Dict, from_date: str, to_date: str) -> List[str]:
+    """Get available dates for booking"""
+    return list(stream_available_dates(self, filters, from_date, to_date))
+
+
+def _available_slots_payload(
+    business_id: str, filters: Dict, start: datetime, end: datetime
+) -> Dict:
+    """Build the available slots GraphQL payload for a range"""
     variables = {
         "filter": {
             "timeSlot": {
-                "startTime": from_date,
-                "endTime": to_date
+                "startTime": _format_datetime(start),
+                "endTime": _format_datetime(end)
             },
-            "parent": self.config.business_id,
+            "parent": business_id,
             "employees": filters.get('employees', []),
             "services": filters.get('services', []),
         },
         "timezone": "UTC"  # TODO: Make configurable
     }
 
-    payload = {
-        "query": query,
-        "variables": variables
-    }
+    return persisted_payload(AVAILABLE_SLOTS_QUERY, variables)
 
-    data = self._make_request("POST", "/graphql", json_data=payload)
+
+def _parse_available_slots(data: Dict) -> List[Tuple[str, str]]:
+    """Extract the available (start, end) slots of a slots response"""
     slots_data = data.get("data", {}).get("improvedAppointmentAvailability", {}).get("slots", [])
 
     available_slots = []
@@ -400,11 +747,207 @@ def get_available_slots(self, filters: Dict, from_date: str, to_date: str) -> Li
         if slot.get("slotType") == "Available":
             time_slot = slot.get("slot", {}).get("timeSlot", {})
             if time_slot:
-                available_slots.append(f"{time_slot['startTime']} - {time_slot['endTime']}")
+                available_slots.append((time_slot['startTime'], time_slot['endTime']))
 
     return available_slots
 
 
+def _slots_by_day(
+    slots: List[Tuple[str, str]], first: date, last: date
+) -> Dict[date, List[Tuple[str, str]]]:
+    """Key slots by start day for the run of days [first, last]"""
+    fetched: Dict[date, List[Tuple[str, str]]] = {
+        day: [] for day in _days_between(
+            _day_start(first), _day_start(last + timedelta(days=1))
+        )
+    }
+    seen = set()
+    for slot in slots:
+        day = _parse_datetime(slot[0]).date()
+        # Slots straddling a window boundary may be returned for both
+        # windows; each is kept only by the window of its start day.
+        if day in fetched and slot not in seen:
+            seen.add(slot)
+            fetched[day].append(slot)
+    return fetched
+
+
+def _bucket_available_slots(
+    self, filters: Dict, first: date, last: date
+) -> Dict[date, List[Tuple[str, str]]]:
+    """Fetch the available slots of a run of days, keyed by start day"""
+    payload = _available_slots_payload(
+        self.config.business_id,
+        filters,
+        _day_start(first),
+        _day_start(last + timedelta(days=1)),
+    )
+    slots = _parse_available_slots(post_graphql(self, payload))
+    return _slots_by_day(slots, first, last)
+
+
+def stream_available_slots(
+    self,
+    filters: Dict,
+    from_date: str,
+    to_date: str,
+    window_days: int = 7,
+    max_workers: int = 4,
+) -> Iterator[str]:
+    """Stream available time slots in chronological order, one window at a time"""
+    if not self.config.business_id:
+        raise ValueError("Business ID not configured")
+
+    start = _parse_datetime(from_date)
+    end = _parse_datetime(to_date, end_of_day=True)
+    for _, slots in _stream_days(
+        self, "slots", _bucket_available_slots, filters, start, end,
+        window_days, max_workers,
+    ):
+        for slot_start, slot_end in slots:
+            if start <= _parse_datetime(slot_start) < end:
+                yield f"{slot_start} - {slot_end}"
+
+
+def get_available_slots(self, filters: Dict, from_date: str, to_date: str) -> List[str]:
+    """Get available time slots for booking"""
+    return list(stream_available_slots(self, filters, from_date, to_date))
+
+
+def get_available_dates_and_slots(
+    self,
+    filters: Dict,
+    from_date: str,
+    to_date: str,
+    slots_date: Optional[str] = None,
+) -> Dict[str, List[str]]:
+    """Get available dates for a range and the slots of one day in one round trip
+
+    Slots are returned for ``slots_date``, or for the day of ``from_date``
+    when it is not given. Queries for days missing from the availability
+    cache are sent together as one batched GraphQL request.
+    """
+    if not self.config.business_id:
+        raise ValueError("Business ID not configured")
+
+    start = _parse_datetime(from_date)
+    end = _parse_datetime(to_date, end_of_day=True)
+    slots_day = _parse_datetime(slots_date).date() if slots_date else start.date()
+    key = availability_key(self.config.business_id, filters)
+    days = _days_between(start, end)
+
+    dates, missing_dates = availability_cache.lookup("dates", key, days)
+    slots, missing_slots = availability_cache.lookup("slots", key, [slots_day])
+
+    batch = GraphQLBatch(self)
+    dates_runs = [
+        (first, last, batch.add(_available_dates_payload(
+            self.config.business_id, filters, _day_start(first),
+            _day_start(last + timedelta(days=1)),
+        )))
+        for first, last in _contiguous_runs(missing_dates)
+    ]
+    slots_runs = [
+        (first, last, batch.add(_available_slots_payload(
+            self.config.business_id, filters, _day_start(first),
+            _day_start(last + timedelta(days=1)),
+        )))
+        for first, last in _contiguous_runs(missing_slots)
+    ]
+    responses = batch.execute()
+
+    for first, last, index in dates_runs:
+        fetched_dates = _dates_by_day(
+            _parse_available_dates(responses[index]), first, last
+        )
+        availability_cache.store("dates", key, fetched_dates)
+        dates.update(fetched_dates)
+    for first, last, index in slots_runs:
+        fetched_slots = _slots_by_day(
+            _parse_available_slots(responses[index]), first, last
+        )
+        availability_cache.store("slots", key, fetched_slots)
+        slots.update(fetched_slots)
+
+    return {
+        "dates": [dates[day] for day in days if dates.get(day) is not None],
+        "slots": [
+            f"{slot_start} - {slot_end}"
+            for slot_start, slot_end in slots[slots_day]
+        ],
+    }
+
+
+def find_next_available_slots(
+    self,
+    filters: Dict,
+    duration_minutes: Optional[int] = None,
+    count: int = 5,
+    from_date: Optional[str] = None,
+    max_days: int = 60,
+) -> List[str]:
+    """Find the next available time slots for booking
+
+    Walks forward from ``from_date``, or from now, in windows that double
+    in size. Each window costs one ``datesStatus`` query, then one batched
+    request for the slots of the days it marks available and that are not
+    cached yet. The search stops as soon as ``count`` slots of at least
+    ``duration_minutes`` are found.
+    """
+    if not self.config.business_id:
+        raise ValueError("Business ID not configured")
+
+    start = _parse_datetime(from_date) if from_date else datetime.now(timezone.utc)
+    limit = start + timedelta(days=max_days)
+    duration = timedelta(minutes=duration_minutes or 0)
+    key = availability_key(self.config.business_id, filters)
+
+    found: List[str] = []
+    window_start, window_days = start, 7
+    while window_start < limit:
+        window_end = min(window_start + timedelta(days=window_days), limit)
+        dates = get_available_dates(
+            self, filters,
+            _format_datetime(window_start), _format_datetime(window_end),
+        )
+        days = sorted({_parse_datetime(value).date() for value in dates})
+
+        slots, missing = availability_cache.lookup("slots", key, days)
+        batch = GraphQLBatch(self)
+        runs = [
+            (first, last, batch.add(_available_slots_payload(
+                self.config.business_id, filters, _day_start(first),
+                _day_start(last + timedelta(days=1)),
+            )))
+            for first, last in _contiguous_runs(missing)
+        ]
+        responses = batch.execute()
+        for first, last, index in runs:
+            fetched = _slots_by_day(
+                _parse_available_slots(responses[index]), first, last
+            )
+            availability_cache.store("slots", key, fetched)
+            slots.update(fetched)
+
+        for day in days:
+            for slot_start, slot_end in sorted(
+                slots[day], key=lambda slot: _parse_datetime(slot[0])
+            ):
+                begins = _parse_datetime(slot_start)
+                if not window_start <= begins < window_end:
+                    continue
+                if _parse_datetime(slot_end) - begins < duration:
+                    continue
+                found.append(f"{slot_start} - {slot_end}")
+                if len(found) >= count:
+                    return found
+
+        window_start = window_end
+        window_days *= 2
+
+    return found
+
+
 def generate_booking_link(self, date: str, time: str, service_id: str, employee_id: str) -> str:
     """Generate a booking link"""
     if not self.config.booking_link:
@@ -0,0 +1,208 @@
+"""GraphQL transport for the Appointy functions."""
+
+import logging
+import threading
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+from requests import HTTPError
+
+from .queries import PersistedQuery, registry
+
+logger = logging.getLogger(__name__)
+
+PERSISTED_QUERY_ERRORS = ("PersistedQueryNotFound", "PersistedQueryNotSupported")
+
+# Features an endpoint may turn out not to support.
+PERSISTED_QUERIES = "persisted_queries"
+BATCHING = "batching"
+
+
+class EndpointSupport:
+    """The features each GraphQL endpoint answered it does not support.
+
+    Remembered for the life of the process, so later requests are sent in
+    a form the endpoint accepts rather than failing first every time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._unsupported: Set[Tuple[Hashable, str]] = set()
+
+    def supports(self, endpoint: Hashable, feature: str) -> bool:
+        with self._lock:
+            return (endpoint, feature) not in self._unsupported
+
+    def unsupported(self, endpoint: Hashable, feature: str):
+        """Record that ``endpoint`` does not support ``feature``."""
+        with self._lock:
+            self._unsupported.add((endpoint, feature))
+
+    def clear(self):
+        """Forget every endpoint."""
+        with self._lock:
+            self._unsupported.clear()
+
+
+endpoint_support = EndpointSupport()
+
+
+def persisted_payload(
+    query: PersistedQuery,
+    variables: Dict,
+    operation_id: Optional[str] = None,
+) -> Dict:
+    """Build a payload referencing ``query`` by its hash only"""
+    payload: Dict = {
+        "variables": variables,
+        "extensions": {
+            "persistedQuery": {"version": 1, "sha256Hash": query.sha256}
+        },
+    }
+    if operation_id is not None:
+        payload["id"] = operation_id
+    return payload
+
+
+def _is_persisted_query_miss(data) -> bool:
+    if not isinstance(data, dict):
+        return False
+    for error in data.get("errors") or []:
+        code = (error.get("extensions") or {}).get("code", "")
+        if error.get("message") in PERSISTED_QUERY_ERRORS or code in (
+            "PERSISTED_QUERY_NOT_FOUND",
+            "PERSISTED_QUERY_NOT_SUPPORTED",
+        ):
+            return True
+    return False
+
+
+def _is_persisted_query_unsupported(data) -> bool:
+    if not isinstance(data, dict):
+        return False
+    for error in data.get("errors") or []:
+        code = (error.get("extensions") or {}).get("code", "")
+        if (
+            error.get("message") == "PersistedQueryNotSupported"
+            or code == "PERSISTED_QUERY_NOT_SUPPORTED"
+        ):
+            return True
+    return False
+
+
+def _endpoint(client) -> Hashable:
+    """The endpoint ``client`` posts GraphQL requests to"""
+    return getattr(client, "_base_url", None)
+
+
+def _sendable(endpoint: Hashable, payload: Dict) -> Dict:
+    """``payload`` as ``endpoint`` accepts it"""
+    if endpoint_support.supports(endpoint, PERSISTED_QUERIES):
+        return payload
+    return _with_document(payload)
+
+
+def _record_miss(endpoint: Hashable, data):
+    """Remember an endpoint that does not support persisted queries"""
+    if _is_persisted_query_unsupported(data):
+        logger.info("Persisted queries unsupported, sending full query text")
+        endpoint_support.unsupported(endpoint, PERSISTED_QUERIES)
+
+
+def _with_document(payload: Dict) -> Dict:
+    """Add the full query text to a payload sent by hash"""
+    persisted = payload.get("extensions", {}).get("persistedQuery")
+    if not persisted or "query" in payload:
+        return payload
+    return {**payload, "query": registry[persisted["sha256Hash"]].document}
+
+
+def post_graphql(self, payload: Dict) -> Dict:
+    """Post a single GraphQL payload
+
+    Payloads sent by hash are resent with the full query text when the
+    server does not know the hash yet, and always sent with it to an
+    endpoint that does not support persisted queries.
+    """
+    endpoint = _endpoint(self)
+    payload = _sendable(endpoint, payload)
+    data = self._make_request("POST", "/graphql", json_data=payload)
+    if _is_persisted_query_miss(data):
+        logger.debug("Persisted query miss, sending full query text")
+        _record_miss(endpoint, data)
+        data = self._make_request(
+            "POST", "/graphql", json_data=_with_document(payload)
+        )
+    return data
+
+
+def post_graphql_batch(self, payloads: List[Dict]) -> List[Dict]:
+    """Post independent GraphQL payloads as one batched-array request.
+
+    Responses are returned in the order of ``payloads``. When the server
+    rejects the array with a client error or does not answer with one
+    response per payload, the payloads are sent one by one instead, and
+    from then on to that endpoint.
+    """
+    endpoint = _endpoint(self)
+    if len(payloads) == 1 or not endpoint_support.supports(
+        endpoint, BATCHING
+    ):
+        return [post_graphql(self, payload) for payload in payloads]
+
+    payloads = [_sendable(endpoint, payload) for payload in payloads]
+    try:
+        data = self._make_request("POST", "/graphql", json_data=payloads)
+    except HTTPError as e:
+        status = getattr(e.response, "status_code", None)
+        if status is None or not 400 <= status < 500:
+            raise
+        data = None
+    if not isinstance(data, list) or len(data) != len(payloads):
+        logger.warning(
+            "GraphQL batching unsupported, sending queries one by one"
+        )
+        endpoint_support.unsupported(endpoint, BATCHING)
+        return [post_graphql(self, payload) for payload in payloads]
+
+    misses = [i for i, item in enumerate(data) if _is_persisted_query_miss(item)]
+    if misses:
+        logger.debug("Persisted query miss, sending full query text")
+        _record_miss(endpoint, data[misses[0]])
+        retried = post_graphql_batch(
+            self, [_with_document(payloads[i]) for i in misses]
+        )
+        for i, item in zip(misses, retried):
+            data[i] = item
+    return data
+
+
+class GraphQLBatch:
+    """Collects independent GraphQL queries to send in one round trip.
+
+    Usage::
+
+        batch = GraphQLBatch(client)
+        dates = batch.add(dates_payload)
+        slots = batch.add(slots_payload)
+        responses = batch.execute()
+        responses[dates], responses[slots]
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self._payloads: List[Dict] = []
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def add(self, payload: Dict) -> int:
+        """Queue ``payload`` and return the index of its response."""
+        self._payloads.append(payload)
+        return len(self._payloads) - 1
+
+    def execute(self) -> List[Dict]:
+        """Send every queued payload and return their responses."""
+        if not self._payloads:
+            return []
+        payloads, self._payloads = self._payloads, []
+        return post_graphql_batch(self._client, payloads)
@@ -0,0 +1,234 @@
+"""Staff × time bucket availability matrix for Appointy dashboards."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .cache import availability_cache, availability_key
+from .functions import (
+    _available_slots_payload,
+    _day_start,
+    _days_between,
+    _parse_available_slots,
+    _parse_datetime,
+)
+from .graphql import GraphQLBatch
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class StaffAvailabilityMatrix:
+    """Availability of several staff members as one dense boolean matrix.
+
+    Row ``i`` belongs to ``employees[i]`` and column ``j`` is the ``j``-th
+    bucket of ``resolution`` minutes from midnight UTC of ``start``. A cell
+    is set when the staff member is available for the whole bucket, so
+    aggregations across staff and days are plain NumPy reductions.
+    """
+
+    __slots__ = ("employees", "start", "resolution", "values")
+
+    def __init__(
+        self,
+        employees: List[str],
+        start: date,
+        values: np.ndarray,
+        resolution: int = 15,
+    ):
+        if MINUTES_PER_DAY % resolution:
+            raise ValueError("Resolution must divide a day into whole buckets")
+        buckets_per_day = MINUTES_PER_DAY // resolution
+        if values.shape[0] != len(employees) or values.shape[1] % buckets_per_day:
+            raise ValueError("Values must have one row per employee and whole days")
+        self.employees = list(employees)
+        self.start = start
+        self.resolution = resolution
+        self.values = values.astype(bool, copy=False)
+
+    @property
+    def buckets_per_day(self) -> int:
+        return MINUTES_PER_DAY // self.resolution
+
+    @property
+    def days(self) -> List[date]:
+        count = self.values.shape[1] // self.buckets_per_day
+        return [self.start + timedelta(days=i) for i in range(count)]
+
+    def by_day(self) -> np.ndarray:
+        """The values as an (employees, days, buckets per day) view."""
+        return self.values.reshape(len(self.employees), -1, self.buckets_per_day)
+
+    def free_minutes(self) -> np.ndarray:
+        """Free minutes per staff member over the whole range."""
+        return self.values.sum(axis=1) * self.resolution
+
+    def free_minutes_per_day(self) -> np.ndarray:
+        """Free minutes as an (employees, days) array."""
+        return self.by_day().sum(axis=2) * self.resolution
+
+    def utilization_per_day(self, working_minutes: int = 8 * 60) -> np.ndarray:
+        """Share of working time not free, averaged over staff, per day.
+
+        ``working_minutes`` is the bookable time of one staff member in a
+        day; free time beyond it counts as no utilization.
+        """
+        free = self.free_minutes_per_day() / working_minutes
+        return 1.0 - np.clip(free, 0.0, 1.0).mean(axis=0)
+
+    def staff_available(self, at: datetime) -> List[str]:
+        """Employees available in the bucket containing ``at``."""
+        column = int(
+            (at - _day_start(self.start)).total_seconds() // (self.resolution * 60)
+        )
+        if not 0 <= column < self.values.shape[1]:
+            return []
+        return [
+            employee
+            for employee, free in zip(self.employees, self.values[:, column])
+            if free
+        ]
+
+    def common_free_minutes_per_day(self) -> np.ndarray:
+        """Minutes per day when every staff member is free at once."""
+        return self.by_day().all(axis=0).sum(axis=1) * self.resolution
+
+
+def _week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def _slot_row(
+    slots: List[Tuple[str, str]], start: date, buckets: int, resolution: int
+) -> np.ndarray:
+    """Mark the buckets fully covered by ``slots`` in one row."""
+    if not slots:
+        return np.zeros(buckets, dtype=bool)
+    origin = _day_start(start)
+    offsets = np.array(
+        [
+            [
+                (_parse_datetime(slot_start) - origin).total_seconds(),
+                (_parse_datetime(slot_end) - origin).total_seconds(),
+            ]
+            for slot_start, slot_end in slots
+        ]
+    )
+    bucket = resolution * 60
+    firsts = np.clip(np.ceil(offsets[:, 0] / bucket), 0, buckets).astype(int)
+    lasts = np.clip(np.floor(offsets[:, 1] / bucket), 0, buckets).astype(int)
+    keep = lasts > firsts
+    # Covered buckets are where the running count of open slots is positive.
+    counts = np.zeros(buckets + 1, dtype=int)
+    np.add.at(counts, firsts[keep], 1)
+    np.add.at(counts, lasts[keep], -1)
+    return np.cumsum(counts[:-1]) > 0
+
+
+def get_staff_availability_matrix(
+    self,
+    employees: List[str],
+    from_date: str,
+    to_date: str,
+    services: Optional[List[str]] = None,
+    resolution: int = 15,
+) -> StaffAvailabilityMatrix:
+    """
+    Build the availability matrix of ``employees`` for a date range.
+
+    Whole weeks, Monday to Sunday, are fetched and cached per business,
+    services and staff. All the weeks and employees that are not cached yet
+    are loaded in one batched GraphQL request.
+
+    Parameters:
+        employees (list[str]): The IDs of the staff members, one row each.
+        from_date (str): The first day of the range.
+        to_date (str): The last day of the range, inclusive.
+        services (list[str], optional): The services to check availability
+        for.
+        resolution (int, optional): The bucket size in minutes.
+
+    Returns:
+        StaffAvailabilityMatrix: The availability matrix of the range.
+    """
+    if not self.config.business_id:
+        raise ValueError("Business ID not configured")
+
+    days = _days_between(
+        _parse_datetime(from_date), _parse_datetime(to_date, end_of_day=True)
+    )
+    if not days:
+        raise ValueError("to_date must not be before from_date")
+    first, last = days[0], days[-1]
+
+    # The business stays first so bookings can invalidate its rows.
+    def key(employee: str):
+        return availability_key(
+            self.config.business_id,
+            {"services": services, "employees": [employee]},
+        ) + (resolution,)
+
+    weeks = sorted({_week_start(day) for day in days})
+    buckets = 7 * (MINUTES_PER_DAY // resolution)
+
+    # Rows are cached per employee and assembled in the caller's order.
+    # Each week is stored under all of its days, so invalidating any day
+    # the bookings touch drops the whole week.
+    rows: Dict[tuple, np.ndarray] = {}
+    batch = GraphQLBatch(self)
+    pending = []
+    for week in weeks:
+        week_days = [week + timedelta(days=i) for i in range(7)]
+        for employee in dict.fromkeys(employees):
+            cached, missing = availability_cache.lookup(
+                "matrix", key(employee), week_days
+            )
+            if not missing:
+                rows[week, employee] = cached[week]
+                continue
+            index = batch.add(
+                _available_slots_payload(
+                    self.config.business_id,
+                    {"services": services or [], "employees": [employee]},
+                    _day_start(week),
+                    _day_start(week + timedelta(days=7)),
+                )
+            )
+            pending.append((week, employee, index))
+
+    responses = batch.execute()
+    for week, employee, index in pending:
+        row = _slot_row(
+            _parse_available_slots(responses[index]),
+            week,
+            buckets,
+            resolution,
+        )
+        availability_cache.store(
+            "matrix",
+            key(employee),
+            {week + timedelta(days=i): row for i in range(7)},
+        )
+        rows[week, employee] = row
+
+    matrices = {
+        week: np.vstack([rows[week, employee] for employee in employees])
+        for week in weeks
+        if employees
+    }
+
+    if employees:
+        values = np.hstack([matrices[week] for week in weeks])
+    else:
+        values = np.zeros((0, len(weeks) * buckets), dtype=bool)
+    per_day = MINUTES_PER_DAY // resolution
+    offset = (first - weeks[0]).days * per_day
+    length = ((last - first).days + 1) * per_day
+    return StaffAvailabilityMatrix(
+        employees,
+        first,
+        values[:, offset:offset + length],
+        resolution,
+    )
@@ -1,30 +1,47 @@
 CREATE_APPOINTMENT_PROMPT = """
 This tool will create an appointment in Appointy.
 
-It takes five arguments:
+It takes six arguments:
 - title (str): The title of the appointment.
 - start_time (str): The start time of the appointment.
 - end_time (str): The end time of the appointment.
 - customer_name (str): The name of the customer.
 - customer_email (str): The email of the customer.
+- employee_id (str, optional): The ID of the staff member.
+
+If the staff member is already booked at that time, the tool answers
+immediately with a JSON object: "conflict" holds the IDs of the
+overlapping appointments and a message, and "alternatives" the nearest
+free ranges of the same length, each with a start_time and end_time.
 """
 
 LIST_APPOINTMENTS_PROMPT = """
 This tool will fetch a list of appointments from Appointy.
 
-It takes no input.
+It takes five optional arguments:
+- from_date (str, optional): Only appointments starting at or after this time. Defaults to now.
+- to_date (str, optional): Only appointments starting before this time. Defaults to 7 days from now.
+- customer_email (str, optional): The email of the customer.
+- status (str, optional): The status of the appointments.
+- limit (int, optional): The maximum number of appointments to return. Defaults to 100.
 """
 
 UPDATE_APPOINTMENT_PROMPT = """
 This tool will update an appointment in Appointy.
 
-It takes six arguments:
+It takes seven arguments:
 - appointment_id (str): The ID of the appointment.
 - title (str, optional): The title of the appointment.
 - start_time (str, optional): The start time of the appointment.
 - end_time (str, optional): The end time of the appointment.
 - customer_name (str, optional): The name of the customer.
 - customer_email (str, optional): The email of the customer.
+- employee_id (str, optional): The ID of the staff member.
+
+If the staff member is already booked at the new time, the tool answers
+immediately with a JSON object: "conflict" holds the IDs of the
+overlapping appointments and a message, and "alternatives" the nearest
+free ranges of the same length, each with a start_time and end_time.
 """
 
 LIST_SERVICES_PROMPT = """
@@ -67,6 +84,18 @@ It takes three arguments:
 - to_date (str): End date for availability search.
 """
 
+FIND_NEXT_AVAILABLE_SLOTS_PROMPT = """
+This tool will find the next available time slots for booking, starting from now.
+
+Use it to answer "when is the next opening?" instead of scanning dates and slots day by day.
+
+It takes four arguments:
+- filters (dict): Filters for available slots, such as services and employees.
+- duration_minutes (int, optional): The minimum length of a slot in minutes.
+- count (int, optional): The number of slots to return. Defaults to 5.
+- from_date (str, optional): Start date for the search. Defaults to now.
+"""
+
 GENERATE_BOOKING_LINK_PROMPT = """
 This tool will generate a booking link.
 
@@ -0,0 +1,89 @@
+"""Persisted GraphQL query registry for the Appointy client.
+
+Query documents are normalized and hashed once at import time so requests
+can send the SHA-256 hash of a document instead of its full text, using the
+automatic persisted queries protocol.
+"""
+
+import hashlib
+from typing import Dict
+
+
+class PersistedQuery:
+    """A GraphQL document with its normalized text and SHA-256 hash."""
+
+    __slots__ = ("document", "sha256")
+
+    def __init__(self, document: str):
+        self.document = normalize_query(document)
+        self.sha256 = hashlib.sha256(self.document.encode("utf-8")).hexdigest()
+
+
+def normalize_query(document: str) -> str:
+    """Collapse insignificant whitespace in a GraphQL document."""
+    return " ".join(document.split())
+
+
+registry: Dict[str, PersistedQuery] = {}
+
+
+def persist(document: str) -> PersistedQuery:
+    """Register ``document`` and return its persisted query."""
+    query = PersistedQuery(document)
+    registry[query.sha256] = query
+    return query
+
+
+EMPLOYEE_MAPPING_QUERY = persist("""
+query ImprovedAvailableServicesOrEmployeesQuery(
+  $filter: AvailabilityFilterInput
+  $listEmployees: Boolean!
+) {
+  improvedAvailableServicesOrEmployees(filter: $filter, listEmployees: $listEmployees) {
+    availableIds
+    errorMessage
+  }
+}
+""")
+
+EMPLOYEE_NODES_QUERY = persist("""
+query EmployeeNodesQuery($ids: [ID], $groupId: String, $fetchExtraField: Boolean!) {
+    nodes(ids: $ids) {
+        __typename
+        ... on Employee {
+            staffProfiles {
+                firstName
+                lastName
+            }
+        }
+        id
+    }
+}
+""")
+
+AVAILABLE_DATES_QUERY = persist("""
+query CalendarPageQuery($timezone: String!, $filter: AvailabilityFilterInput) {
+    appointmentAvailabilityDates(timezone: $timezone, filter: $filter) {
+        available
+        datesStatus
+        errorMessage
+    }
+}
+""")
+
+AVAILABLE_SLOTS_QUERY = persist("""
+query CalendarPageQuery($timezone: String!, $filter: AvailabilityFilterInput) {
+    improvedAppointmentAvailability(filter: $filter) {
+        errorMessage
+        slots {
+            slotType
+            slot {
+                timeSlot {
+                    endTime
+                    startTime
+                }
+            }
+        }
+    }
+}
+""")
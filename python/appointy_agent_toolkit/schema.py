@@ -8,10 +8,21 @@ class CreateAppointment(BaseModel):
     end_time: str = Field(..., description="End time of the appointment")
     customer_name: str = Field(..., description="Name of the customer")
     customer_email: str = Field(..., description="Email of the customer")
+    employee_id: Optional[str] = Field(None, description="ID of the staff member")
 
 
 class ListAppointments(BaseModel):
-    pass
+    from_date: Optional[str] = Field(
+        None,
+        description="Only appointments starting at or after this time. Defaults to now",
+    )
+    to_date: Optional[str] = Field(
+        None,
+        description="Only appointments starting before this time. Defaults to 7 days from now",
+    )
+    customer_email: Optional[str] = Field(None, description="Email of the customer")
+    status: Optional[str] = Field(None, description="Status of the appointments")
+    limit: int = Field(100, description="Maximum number of appointments to return")
 
 
 class UpdateAppointment(BaseModel):
@@ -21,6 +32,7 @@ class UpdateAppointment(BaseModel):
     end_time: Optional[str] = Field(None, description="End time of the appointment")
     customer_name: Optional[str] = Field(None, description="Name of the customer")
     customer_email: Optional[str] = Field(None, description="Email of the customer")
+    employee_id: Optional[str] = Field(None, description="ID of the staff member")
 
 
 class ListServices(BaseModel):
@@ -48,6 +60,13 @@ class GetAvailableSlots(BaseModel):
     to_date: str = Field(..., description="End date for availability search")
 
 
+class FindNextAvailableSlots(BaseModel):
+    filters: dict = Field(..., description="Filters for available slots")
+    duration_minutes: Optional[int] = Field(None, description="Minimum length of a slot in minutes")
+    count: int = Field(5, description="Number of slots to return")
+    from_date: Optional[str] = Field(None, description="Start date for the search, defaults to now")
+
+
 class GenerateBookingLink(BaseModel):
     date: str = Field(..., description="Date for the booking")
     time: str = Field(..., description="Time for the booking")
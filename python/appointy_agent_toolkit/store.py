@@ -0,0 +1,243 @@
+"""Local SQLite mirror of Appointy appointments with incremental sync.
+
+Usage::
+
+    store = AppointmentStore("appointments.db")
+    sync_appointments(context, store)  # full pull the first time
+    sync_appointments(context, store)  # then only records changed since
+    store.list_appointments(business_id, from_date="2024-01-01")
+"""
+
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+
+from .configuration import Context
+from .functions import (
+    Appointment,
+    _format_datetime,
+    _parse_datetime,
+    iter_appointments,
+)
+
+# Appointments changed while a sync is running may carry an ``updated_at``
+# slightly older than the last one seen, so each sync re-reads this margin.
+# Upserts are idempotent, so the overlap is harmless.
+WATERMARK_OVERLAP = timedelta(seconds=60)
+
+_COLUMNS = (
+    "id",
+    "title",
+    "start_time",
+    "end_time",
+    "customer_name",
+    "customer_email",
+    "employee_id",
+    "status",
+    "updated_at",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS appointments (
+    business_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    customer_name TEXT NOT NULL,
+    customer_email TEXT NOT NULL,
+    employee_id TEXT,
+    status TEXT,
+    updated_at TEXT,
+    starts_at TEXT NOT NULL,
+    PRIMARY KEY (business_id, id)
+);
+CREATE INDEX IF NOT EXISTS appointments_starts_at
+    ON appointments (business_id, starts_at);
+CREATE INDEX IF NOT EXISTS appointments_customer_email
+    ON appointments (business_id, customer_email);
+CREATE TABLE IF NOT EXISTS sync_state (
+    business_id TEXT PRIMARY KEY,
+    watermark TEXT NOT NULL
+);
+"""
+
+
+class AppointmentStore:
+    """Appointments mirrored per business in a SQLite database.
+
+    ``starts_at`` holds each start time normalized to UTC, so range queries
+    compare strings on an index instead of parsing every row.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def close(self):
+        self._connection.close()
+
+    def upsert(
+        self,
+        business_id: str,
+        appointments: Iterable[Appointment],
+        batch_size: int = 500,
+    ) -> int:
+        """Insert or update appointments, ``batch_size`` per transaction."""
+        statement = (
+            f"INSERT INTO appointments (business_id, {', '.join(_COLUMNS)},"
+            f" starts_at) VALUES ({', '.join('?' * (len(_COLUMNS) + 2))})"
+            " ON CONFLICT (business_id, id) DO UPDATE SET "
+            + ", ".join(
+                f"{column} = excluded.{column}"
+                for column in _COLUMNS[1:] + ("starts_at",)
+            )
+        )
+        count = 0
+        batch: List[tuple] = []
+        for appointment in appointments:
+            batch.append(
+                (business_id,)
+                + tuple(getattr(appointment, column) for column in _COLUMNS)
+                + (_normalize(appointment.start_time),)
+            )
+            if len(batch) >= batch_size:
+                count += self._write(statement, batch)
+                batch = []
+        if batch:
+            count += self._write(statement, batch)
+        return count
+
+    def _write(self, statement: str, rows: List[tuple]) -> int:
+        with self._lock, self._connection:
+            self._connection.executemany(statement, rows)
+        return len(rows)
+
+    def watermark(self, business_id: str) -> Optional[str]:
+        """The ``updated_since`` value for the next sync of a business."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT watermark FROM sync_state WHERE business_id = ?",
+                (business_id,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, business_id: str, watermark: str):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO sync_state (business_id, watermark) VALUES (?, ?)"
+                " ON CONFLICT (business_id) DO UPDATE SET"
+                " watermark = excluded.watermark",
+                (business_id, watermark),
+            )
+
+    def list_appointments(
+        self,
+        business_id: str,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        customer_email: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Appointment]:
+        """
+        List mirrored appointments, with the filters of list_appointments.
+
+        Without a date range, appointments from now through the next 7 days
+        are listed.
+        """
+        if not from_date and not to_date:
+            now = datetime.now(timezone.utc)
+            from_date = _format_datetime(now)
+            to_date = _format_datetime(now + timedelta(days=7))
+
+        clauses = ["business_id = ?"]
+        params: list = [business_id]
+        if from_date:
+            clauses.append("starts_at >= ?")
+            params.append(_normalize(from_date))
+        if to_date:
+            clauses.append("starts_at < ?")
+            params.append(
+                _format_datetime(_parse_datetime(to_date, end_of_day=True))
+            )
+        if customer_email:
+            clauses.append("customer_email = ?")
+            params.append(customer_email)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        params.append(limit)
+
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM appointments"
+                f" WHERE {' AND '.join(clauses)}"
+                " ORDER BY starts_at, id LIMIT ?",
+                params,
+            ).fetchall()
+        return [Appointment(**dict(zip(_COLUMNS, row))) for row in rows]
+
+    def count(self, business_id: str) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM appointments WHERE business_id = ?",
+                (business_id,),
+            ).fetchone()[0]
+
+
+def _normalize(value: str) -> str:
+    return _format_datetime(_parse_datetime(value))
+
+
+def sync_appointments(
+    context: Context,
+    store: AppointmentStore,
+    page_size: int = 500,
+    batch_size: int = 500,
+) -> int:
+    """
+    Pull the appointments changed since the last sync into ``store``.
+
+    The first sync of a business pulls every appointment. Later ones pass
+    the stored watermark as ``updated_since`` and page through the changes
+    with cursors. The watermark only moves forward once every page has been
+    applied, so an interrupted sync is simply repeated.
+
+    Parameters:
+        store (AppointmentStore): The local mirror to update.
+        page_size (int, optional): The number of appointments per page.
+        batch_size (int, optional): The number of upserts per transaction.
+
+    Returns:
+        int: The number of appointments written.
+    """
+    business_id = context.get("business_id")
+    if not business_id:
+        raise ValueError("Business ID not configured")
+
+    started = datetime.now(timezone.utc)
+    newest: List[datetime] = []
+
+    def changes() -> Iterable[Appointment]:
+        for appointment in iter_appointments(
+            context,
+            updated_since=store.watermark(business_id),
+            page_size=page_size,
+        ):
+            if appointment.updated_at:
+                updated = _parse_datetime(appointment.updated_at)
+                if not newest or updated > newest[0]:
+                    newest[:] = [updated]
+            yield appointment
+
+    count = store.upsert(business_id, changes(), batch_size)
+    # Prefer the server's own clock when it reports update times.
+    high = newest[0] if newest else started
+    store.set_watermark(
+        business_id, _format_datetime(high - WATERMARK_OVERLAP)
+    )
+    return count
@@ -0,0 +1,60 @@
+"""Fixtures shared by the Appointy tests and benchmarks."""
+
+import base64
+import json
+from unittest import mock
+
+
+def slots_response(*slots):
+    return {
+        "data": {
+            "improvedAppointmentAvailability": {
+                "slots": [
+                    {
+                        "slotType": "Available",
+                        "slot": {
+                            "timeSlot": {"startTime": start, "endTime": end}
+                        },
+                    }
+                    for start, end in slots
+                ]
+            }
+        }
+    }
+
+
+def dates_response(*dates):
+    encoded = base64.b64encode(",".join(dates).encode("utf-8"))
+    return {
+        "data": {
+            "appointmentAvailabilityDates": {
+                "datesStatus": encoded.decode("utf-8")
+            }
+        }
+    }
+
+
+def make_client():
+    client = mock.Mock()
+    client.config.business_id = "group/company/location"
+    return client
+
+
+def appointment(id):
+    return {
+        "id": id,
+        "title": "Haircut",
+        "start_time": "2024-01-01T09:00:00Z",
+        "end_time": "2024-01-01T09:30:00Z",
+        "customer_name": "Jane",
+        "customer_email": "jane@example.com",
+        "status": "confirmed",
+    }
+
+
+def page(*rows, next_cursor=None):
+    response = mock.Mock()
+    response.content = json.dumps(
+        {"data": list(rows), "next_cursor": next_cursor}
+    ).encode("utf-8")
+    return response
@@ -0,0 +1,512 @@
+"""Local stand-in for the Appointy API, for tests and benchmarks.
+
+Serves the REST and GraphQL endpoints the toolkit calls from seeded fixture
+data, with configurable latency, jitter and error injection::
+
+    with FakeAppointy(latency=0.02, jitter=0.01) as server:
+        client = AppointyClient(server.context)
+        get_available_slots(client, {}, "2024-01-01", "2024-01-07")
+"""
+
+import base64
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from appointy_agent_toolkit.queries import (
+    AVAILABLE_DATES_QUERY,
+    AVAILABLE_SLOTS_QUERY,
+    EMPLOYEE_MAPPING_QUERY,
+    EMPLOYEE_NODES_QUERY,
+    PersistedQuery,
+    normalize_query,
+)
+
+BUSINESS_ID = "group/company/location"
+
+EMPLOYEES = [
+    {"id": "emp_1", "firstName": "Ada", "lastName": "Lovelace"},
+    {"id": "emp_2", "firstName": "Grace", "lastName": "Hopper"},
+    {"id": "emp_3", "firstName": "Alan", "lastName": "Turing"},
+    {"id": "emp_4", "firstName": "Edsger", "lastName": "Dijkstra"},
+]
+
+SERVICES = [
+    {
+        "id": "svc_haircut",
+        "title": "Haircut",
+        "description": "A classic haircut",
+        "durations": ["1800s"],
+        "employees": ["emp_1", "emp_2", "emp_3"],
+    },
+    {
+        "id": "svc_colour",
+        "title": "Colour",
+        "description": "Full colour treatment",
+        "durations": ["3600s"],
+        "employees": ["emp_2", "emp_4"],
+    },
+    {
+        "id": "svc_shave",
+        "title": "Shave",
+        "description": "Hot towel shave",
+        "durations": ["1800s"],
+        "employees": ["emp_1", "emp_4"],
+    },
+]
+
+OPENING_HOUR = 9
+CLOSING_HOUR = 17
+SLOT_MINUTES = 30
+
+
+def _parse(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _format(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _fixture_appointments(
+    seed: int, start: date, days: int, per_day: int
+) -> List[Dict]:
+    """Bookings spread over weekdays, about ``per_day`` a day."""
+    rng = random.Random(seed)
+    appointments = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        if day.weekday() >= 5:
+            continue
+        for _ in range(per_day):
+            employee = rng.choice(EMPLOYEES)["id"]
+            slot = rng.randrange(
+                (CLOSING_HOUR - OPENING_HOUR) * 60 // SLOT_MINUTES
+            )
+            begins = datetime(
+                day.year, day.month, day.day, OPENING_HOUR, tzinfo=timezone.utc
+            ) + timedelta(minutes=slot * SLOT_MINUTES)
+            number = len(appointments) + 1
+            appointments.append(
+                {
+                    "id": f"apt_{number}",
+                    "title": "Haircut",
+                    "start_time": _format(begins),
+                    "end_time": _format(
+                        begins + timedelta(minutes=SLOT_MINUTES)
+                    ),
+                    "customer_name": f"Customer {number}",
+                    "customer_email": f"customer{number}@example.com",
+                    "employee_id": employee,
+                    "status": "confirmed",
+                    "updated_at": _format(begins - timedelta(days=7)),
+                }
+            )
+    return appointments
+
+
+class _Server(ThreadingHTTPServer):
+    # The default backlog of 5 overflows under concurrent clients, and the
+    # SYN retransmits would then dominate the latencies measured.
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class FakeAppointy:
+    """Threaded HTTP server imitating the Appointy API.
+
+    Parameters:
+        latency (float): Seconds added to every response.
+        jitter (float): Up to this many random extra seconds per response.
+        error_rate (float): Share of requests answered with ``error_status``.
+        error_status (int): The status code of injected errors.
+        batching (bool): Whether ``/graphql`` accepts batched arrays.
+        seed (int): Seed of the fixture data and of the injected randomness.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        batching: bool = True,
+        seed: int = 0,
+        start: date = date(2024, 1, 1),
+        days: int = 90,
+        appointments_per_day: int = 12,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.batching = batching
+        self.requests: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._failures: List[int] = []
+        self._known_queries: Dict[str, str] = {}
+        self._appointments: Dict[str, Dict] = {
+            appointment["id"]: appointment
+            for appointment in _fixture_appointments(
+                seed, start, days, appointments_per_day
+            )
+        }
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "FakeAppointy":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        if self._server is None:
+            raise ValueError("Server not started")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def context(self) -> Dict:
+        return {
+            "api_base_url": self.base_url,
+            "api_key": "key",
+            "business_id": BUSINESS_ID,
+            "booking_link": f"{self.base_url}/book",
+        }
+
+    def start(self):
+        handler = type("Handler", (_Handler,), {"fake": self})
+        self._server = _Server(("127.0.0.1", 0), handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def fail_next(self, count: int = 1, status: int = 503):
+        """Answer the next ``count`` requests with ``status``."""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def forget_persisted_queries(self):
+        """Drop the registered query hashes, as after a server restart."""
+        with self._lock:
+            self._known_queries.clear()
+
+    def _delay_and_fault(self) -> Optional[int]:
+        with self._lock:
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            if self._failures:
+                status: Optional[int] = self._failures.pop(0)
+            elif self._rng.random() < self.error_rate:
+                status = self.error_status
+            else:
+                status = None
+        if delay:
+            time.sleep(delay)
+        return status
+
+    # Appointments
+
+    def list_appointments(self, params: Dict[str, str]) -> Dict:
+        with self._lock:
+            rows = sorted(
+                self._appointments.values(),
+                key=lambda row: (_parse(row["start_time"]), row["id"]),
+            )
+        if "from_date" in params:
+            since = _parse(params["from_date"])
+            rows = [row for row in rows if _parse(row["start_time"]) >= since]
+        if "to_date" in params:
+            until = _parse(params["to_date"])
+            if len(params["to_date"]) == 10:
+                until += timedelta(days=1)
+            rows = [row for row in rows if _parse(row["start_time"]) < until]
+        if "customer_email" in params:
+            rows = [
+                row
+                for row in rows
+                if row["customer_email"] == params["customer_email"]
+            ]
+        if "status" in params:
+            rows = [row for row in rows if row["status"] == params["status"]]
+        if "updated_since" in params:
+            since = _parse(params["updated_since"])
+            rows = [row for row in rows if _parse(row["updated_at"]) >= since]
+
+        offset = int(params.get("cursor") or 0)
+        limit = int(params.get("limit") or 100)
+        page = rows[offset:offset + limit]
+        more = offset + limit < len(rows)
+        return {
+            "data": page,
+            "next_cursor": str(offset + limit) if more else None,
+        }
+
+    def save_appointment(
+        self, data: Dict, appointment_id: Optional[str] = None
+    ) -> Optional[Dict]:
+        with self._lock:
+            if appointment_id is None:
+                appointment_id = f"apt_{len(self._appointments) + 1}"
+                row: Dict = {"id": appointment_id, "status": "confirmed"}
+            elif appointment_id in self._appointments:
+                row = dict(self._appointments[appointment_id])
+            else:
+                return None
+            row.update(data)
+            row["updated_at"] = _format(datetime.now(timezone.utc))
+            self._appointments[appointment_id] = row
+            return row
+
+    # Availability
+
+    def _free_slots(
+        self, start: datetime, end: datetime, services: List, employees: List
+    ) -> List[Tuple[datetime, datetime]]:
+        staff = [employee["id"] for employee in EMPLOYEES]
+        if services:
+            staff = [
+                employee
+                for employee in staff
+                if any(
+                    employee in service["employees"]
+                    for service in SERVICES
+                    if service["id"] in services
+                )
+            ]
+        if employees:
+            staff = [employee for employee in staff if employee in employees]
+
+        with self._lock:
+            booked = [
+                (row.get("employee_id"), _parse(row["start_time"]),
+                 _parse(row["end_time"]))
+                for row in self._appointments.values()
+                if row.get("status") not in ("cancelled", "canceled")
+            ]
+
+        free = set()
+        day = start.date()
+        while datetime(day.year, day.month, day.day, tzinfo=timezone.utc) < end:
+            if day.weekday() < 5:
+                begins = datetime(
+                    day.year, day.month, day.day, OPENING_HOUR,
+                    tzinfo=timezone.utc,
+                )
+                closes = begins.replace(hour=CLOSING_HOUR)
+                while begins < closes:
+                    ends = begins + timedelta(minutes=SLOT_MINUTES)
+                    if start <= begins < end and any(
+                        not any(
+                            employee == booked_by and b_start < ends
+                            and begins < b_end
+                            for booked_by, b_start, b_end in booked
+                        )
+                        for employee in staff
+                    ):
+                        free.add((begins, ends))
+                    begins = ends
+            day += timedelta(days=1)
+        return sorted(free)
+
+    def graphql(self, payload: Dict) -> Dict:
+        query = payload.get("query")
+        sha256 = (
+            payload.get("extensions", {})
+            .get("persistedQuery", {})
+            .get("sha256Hash")
+        )
+        with self._lock:
+            if query:
+                document = normalize_query(query)
+                sha256 = PersistedQuery(document).sha256
+                self._known_queries[sha256] = document
+            elif sha256 not in self._known_queries:
+                return {
+                    "errors": [
+                        {
+                            "message": "PersistedQueryNotFound",
+                            "extensions": {
+                                "code": "PERSISTED_QUERY_NOT_FOUND"
+                            },
+                        }
+                    ]
+                }
+
+        variables = payload.get("variables") or {}
+        flt = variables.get("filter") or {}
+        if sha256 == EMPLOYEE_MAPPING_QUERY.sha256:
+            ids = {employee["id"]: True for employee in EMPLOYEES}
+            return {
+                "data": {
+                    "improvedAvailableServicesOrEmployees": {
+                        "availableIds": _b64(json.dumps(ids)),
+                        "errorMessage": "",
+                    }
+                }
+            }
+        if sha256 == EMPLOYEE_NODES_QUERY.sha256:
+            ids = variables.get("ids") or []
+            return {
+                "data": {
+                    "nodes": [
+                        {
+                            "__typename": "Employee",
+                            "id": employee["id"],
+                            "staffProfiles": [
+                                {
+                                    "firstName": employee["firstName"],
+                                    "lastName": employee["lastName"],
+                                }
+                            ],
+                        }
+                        for employee in EMPLOYEES
+                        if employee["id"] in ids
+                    ]
+                }
+            }
+
+        window = flt.get("timeSlot") or {}
+        slots = self._free_slots(
+            _parse(window["startTime"]),
+            _parse(window["endTime"]),
+            flt.get("services") or [],
+            flt.get("employees") or [],
+        )
+        if sha256 == AVAILABLE_DATES_QUERY.sha256:
+            days = sorted({begins.date().isoformat() for begins, _ in slots})
+            return {
+                "data": {
+                    "appointmentAvailabilityDates": {
+                        "available": bool(days),
+                        "datesStatus": _b64(",".join(days)),
+                        "errorMessage": "",
+                    }
+                }
+            }
+        if sha256 == AVAILABLE_SLOTS_QUERY.sha256:
+            return {
+                "data": {
+                    "improvedAppointmentAvailability": {
+                        "errorMessage": "",
+                        "slots": [
+                            {
+                                "slotType": "Available",
+                                "slot": {
+                                    "timeSlot": {
+                                        "startTime": _format(begins),
+                                        "endTime": _format(ends),
+                                    }
+                                },
+                            }
+                            for begins, ends in slots
+                        ],
+                    }
+                }
+            }
+        return {"errors": [{"message": "Unknown query"}]}
+
+
+def _b64(value: str) -> str:
+    return base64.b64encode(value.encode("utf-8")).decode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    fake: FakeAppointy
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: object):
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _body(self) -> object:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"null")
+
+    def _handle(self, method: str):
+        url = urlparse(self.path)
+        fake = self.fake
+        with fake._lock:
+            fake.requests[f"{method} {url.path}"] += 1
+
+        status = fake._delay_and_fault()
+        if status is not None:
+            self._send(status, {"error": "Injected failure"})
+            return
+        if self.headers.get("Authorization") != "Bearer key":
+            self._send(401, {"error": "Unauthorized"})
+            return
+
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if method == "GET" and url.path == "/appointments":
+            self._send(200, fake.list_appointments(params))
+        elif method == "POST" and url.path == "/appointments":
+            self._send(200, fake.save_appointment(self._body()))
+        elif method == "PUT" and url.path.startswith("/appointments/"):
+            row = fake.save_appointment(
+                self._body(), url.path.rsplit("/", 1)[1]
+            )
+            if row is None:
+                self._send(404, {"error": "Not found"})
+            else:
+                self._send(200, row)
+        elif method == "GET" and url.path == "/api/v1/services:all":
+            self._send(200, {"services": SERVICES})
+        elif method == "POST" and url.path == (
+            "/api/v1/appointment/availability/improved-services-employees"
+        ):
+            services = (self._body() or {}).get("filter", {}).get("services")
+            available = {
+                employee: True
+                for service in SERVICES
+                if service["id"] in (services or [])
+                for employee in service["employees"]
+            }
+            self._send(200, {"availableIds": available})
+        elif method == "POST" and url.path == "/graphql":
+            body = self._body()
+            if isinstance(body, list):
+                if not fake.batching:
+                    self._send(
+                        200, {"errors": [{"message": "Batching not supported"}]}
+                    )
+                else:
+                    self._send(200, [fake.graphql(item) for item in body])
+            else:
+                self._send(200, fake.graphql(body))
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
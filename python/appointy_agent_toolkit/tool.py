@@ -28,3 +28,11 @@ class AppointyTool(BaseTool):
     ) -> str:
         """Use the Appointy API to run an operation."""
         return self.appointy_api.run(self.method, *args, **kwargs)
+
+    async def _arun(
+        self,
+        *args: Any,
+        **kwargs: Any,
+    ) -> str:
+        """Use the Appointy API to run an operation asynchronously."""
+        return await self.appointy_api.arun(self.method, *args, **kwargs)
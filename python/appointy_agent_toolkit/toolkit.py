@@ -3,9 +3,13 @@
 from typing import List, Optional
 from pydantic import PrivateAttr
 
+from stripe_agent_toolkit.middleware import MiddlewarePipeline
+
 from .api import AppointyAPI
+from .async_client import AsyncAppointyClient
 from .tools import tools
 from .configuration import Configuration, is_tool_allowed
+from .store import AppointmentStore
 from .tool import AppointyTool
 
 
@@ -13,13 +17,26 @@ class AppointyAgentToolkit:
     _tools: List = PrivateAttr(default=[])
 
     def __init__(
-        self, api_key: str, configuration: Optional[Configuration] = None
+        self,
+        api_key: str,
+        configuration: Optional[Configuration] = None,
+        store: Optional[AppointmentStore] = None,
+        pipeline: Optional[MiddlewarePipeline] = None,
+        async_client: Optional[AsyncAppointyClient] = None,
     ):
         super().__init__()
 
         context = configuration.get("context") if configuration else None
 
-        appointy_api = AppointyAPI(api_key=api_key, context=context)
+        appointy_api = AppointyAPI(
+            api_key=api_key,
+            context=context,
+            store=store,
+            pipeline=pipeline,
+            async_client=async_client,
+        )
+
+        self._appointy_api = appointy_api
 
         filtered_tools = [
             tool for tool in tools if is_tool_allowed(tool, configuration)
@@ -39,3 +56,7 @@ class AppointyAgentToolkit:
     def get_tools(self) -> List:
         """Get the tools in the toolkit."""
         return self._tools
+
+    async def aclose(self):
+        """Close the async client the tools opened on the running loop."""
+        await self._appointy_api.aclose()
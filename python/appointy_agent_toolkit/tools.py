@@ -9,6 +9,7 @@ from .prompts import (
     GET_SERVICE_INFO_PROMPT,
     GET_AVAILABLE_DATES_PROMPT,
     GET_AVAILABLE_SLOTS_PROMPT,
+    FIND_NEXT_AVAILABLE_SLOTS_PROMPT,
     GENERATE_BOOKING_LINK_PROMPT,
 )
 
@@ -21,6 +22,7 @@ from .schema import (
     GetServiceInfo,
     GetAvailableDates,
     GetAvailableSlots,
+    FindNextAvailableSlots,
     GenerateBookingLink,
 )
 
@@ -113,6 +115,17 @@ tools: List[Dict] = [
             }
         },
     },
+    {
+        "method": "find_next_available_slots",
+        "name": "Find Next Available Slots",
+        "description": FIND_NEXT_AVAILABLE_SLOTS_PROMPT,
+        "args_schema": FindNextAvailableSlots,
+        "actions": {
+            "availability": {
+                "read": True,
+            }
+        },
+    },
     {
         "method": "generate_booking_link",
         "name": "Generate Booking Link",
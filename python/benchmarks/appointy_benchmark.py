@@ -0,0 +1,158 @@
+"""Benchmarks of the Appointy tools against the local fake server.
+
+Measures per-tool latency with a cold and a warm availability cache,
+throughput of concurrent tool calls, and how many requests caching saves.
+Run from the ``python`` directory::
+
+    python -m benchmarks.appointy_benchmark --latency 0.05 --jitter 0.02
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+from appointy_agent_toolkit.api import AppointyAPI
+from appointy_agent_toolkit.cache import availability_cache
+from appointy_agent_toolkit.conflicts import appointment_index
+
+from appointy_agent_toolkit.testing.fake_server import FakeAppointy
+
+TOOL_CALLS: List[Tuple[str, Dict]] = [
+    ("list_services", {}),
+    ("get_service_info", {"query": "haircut"}),
+    ("get_staff_info", {"service_id": "svc_haircut", "duration": "1800s"}),
+    (
+        "get_available_dates",
+        {"filters": {}, "from_date": "2024-01-01", "to_date": "2024-01-31"},
+    ),
+    (
+        "get_available_slots",
+        {"filters": {}, "from_date": "2024-01-01", "to_date": "2024-01-07"},
+    ),
+    (
+        "find_next_available_slots",
+        {
+            "filters": {"employees": ["emp_1"]},
+            "duration_minutes": 30,
+            "from_date": "2024-01-01",
+        },
+    ),
+    (
+        "list_appointments",
+        {"from_date": "2024-01-01", "to_date": "2024-01-31", "limit": 500},
+    ),
+]
+
+
+def _percentile(samples: List[float], share: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def _timed(fn: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def _reset():
+    availability_cache.clear()
+    appointment_index.clear()
+
+
+def bench_latency(server: FakeAppointy, iterations: int):
+    print(f"{'tool':<28}{'cold p50':>10}{'cold p95':>10}"
+          f"{'warm p50':>10}{'requests':>10}")
+    for method, kwargs in TOOL_CALLS:
+        cold: List[float] = []
+        warm: List[float] = []
+        requests = 0
+        for _ in range(iterations):
+            _reset()
+            api = AppointyAPI(api_key="key", context=server.context)
+            before = sum(server.requests.values())
+            cold.append(_timed(lambda: api.run(method, **kwargs)))
+            requests += sum(server.requests.values()) - before
+            warm.append(_timed(lambda: api.run(method, **kwargs)))
+        print(
+            f"{method:<28}"
+            f"{statistics.median(cold) * 1000:>8.1f}ms"
+            f"{_percentile(cold, 0.95) * 1000:>8.1f}ms"
+            f"{statistics.median(warm) * 1000:>8.1f}ms"
+            f"{requests / iterations:>10.1f}"
+        )
+
+
+def bench_throughput(server: FakeAppointy, calls: int, levels: List[int]):
+    print(f"\n{'concurrency':<28}{'calls/s':>10}{'p95':>10}")
+    api = AppointyAPI(api_key="key", context=server.context)
+
+    def call(i: int) -> float:
+        day = 1 + i % 28
+        return _timed(
+            lambda: api.run(
+                "get_available_slots",
+                filters={"employees": [f"emp_{1 + i % 4}"]},
+                from_date=f"2024-02-{day:02d}",
+                to_date=f"2024-02-{day:02d}",
+            )
+        )
+
+    for level in levels:
+        _reset()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=level) as executor:
+            samples = list(executor.map(call, range(calls)))
+        elapsed = time.perf_counter() - started
+        print(
+            f"{level:<28}{calls / elapsed:>10.1f}"
+            f"{_percentile(samples, 0.95) * 1000:>8.1f}ms"
+        )
+
+
+def bench_caching(server: FakeAppointy, rounds: int):
+    print(f"\n{'availability cache':<28}{'time':>10}{'requests':>10}")
+    api = AppointyAPI(api_key="key", context=server.context)
+    kwargs = {"filters": {}, "from_date": "2024-01-01", "to_date": "2024-01-14"}
+
+    for label, clear in (("cleared each round", True), ("kept", False)):
+        _reset()
+        before = sum(server.requests.values())
+        started = time.perf_counter()
+        for _ in range(rounds):
+            if clear:
+                availability_cache.clear()
+            api.run("get_available_slots", **kwargs)
+        elapsed = time.perf_counter() - started
+        print(
+            f"{label:<28}{elapsed * 1000:>8.1f}ms"
+            f"{sum(server.requests.values()) - before:>10}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Appointy tools against a fake server."
+    )
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--calls", type=int, default=64)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 4, 16]
+    )
+    args = parser.parse_args()
+
+    with FakeAppointy(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate
+    ) as server:
+        bench_latency(server, args.iterations)
+        bench_throughput(server, args.calls, args.concurrency)
+        bench_caching(server, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Import and first-construction time of the toolkits, with a budget.
+
+Each measurement runs in a fresh interpreter. Import time is read from
+``python -X importtime``; construction time is the time to build the first
+toolkit after its module is imported, which includes loading the tool list
+and the framework. Toolkits whose framework is not installed are skipped.
+Exits with status 1 when a median is over its budget or a target fails
+for another reason. Run from the
+``python`` directory::
+
+    python -m benchmarks.import_benchmark --runs 5 --top 10
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+# Allows every tool, so construction builds the whole tool list.
+CONFIGURATION = """{"actions": {
+    "customers": {"create": True, "read": True},
+    "products": {"create": True, "read": True},
+    "prices": {"create": True, "read": True},
+    "payment_links": {"create": True},
+    "invoices": {"create": True, "update": True},
+    "invoice_items": {"create": True},
+    "balance": {"read": True},
+    "refunds": {"create": True},
+}}"""
+
+TOOLKIT = (
+    "StripeAgentToolkit(\n"
+    "    secret_key='sk_test_123',\n"
+    f"    configuration={CONFIGURATION},\n"
+    ").get_tools()"
+)
+
+# Name: (module, statement constructing the first toolkit).
+TARGETS: Dict[str, Tuple[str, str]] = {
+    "api": (
+        "stripe_agent_toolkit.api",
+        "from stripe_agent_toolkit.tools import tools\n"
+        "StripeAPI(secret_key='sk_test_123', context=None)",
+    ),
+    "langchain": ("stripe_agent_toolkit.langchain.toolkit", TOOLKIT),
+    "crewai": ("stripe_agent_toolkit.crewai.toolkit", TOOLKIT),
+}
+
+CONSTRUCT = """
+import time
+from {module} import *
+started = time.perf_counter()
+{statement}
+print(time.perf_counter() - started)
+"""
+
+
+def _check(result: subprocess.CompletedProcess):
+    """Raise ModuleNotFoundError when a framework is not installed, and
+    RuntimeError for any other failure of the subprocess."""
+    if result.returncode == 0:
+        return
+    error = result.stderr.strip().splitlines()[-1]
+    if error.startswith("ModuleNotFoundError"):
+        raise ModuleNotFoundError(error)
+    raise RuntimeError(error)
+
+
+def _importtime(module: str) -> Tuple[float, List[Tuple[float, str]]]:
+    """The cumulative import time of ``module`` and the self time of each
+    module it imported, in milliseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    _check(result)
+
+    total = 0.0
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        modules.append((int(own) / 1000, name.strip()))
+        if name.strip() == module:
+            total = int(cumulative) / 1000
+    return total, modules
+
+
+def _construction(module: str, statement: str) -> float:
+    """The time to construct the first toolkit, in milliseconds."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            CONSTRUCT.format(module=module, statement=statement),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    _check(result)
+    return float(result.stdout.strip().splitlines()[-1]) * 1000
+
+
+def bench_target(
+    name: str, runs: int, top: int
+) -> Optional[Tuple[float, float]]:
+    module, statement = TARGETS[name]
+    imports: List[float] = []
+    constructions: List[float] = []
+    modules: Dict[str, List[float]] = {}
+    try:
+        for _ in range(runs):
+            total, own = _importtime(module)
+            imports.append(total)
+            for elapsed, imported in own:
+                modules.setdefault(imported, []).append(elapsed)
+            constructions.append(_construction(module, statement))
+    except ModuleNotFoundError as e:
+        print(f"{name:<12}skipped: {e}")
+        return None
+
+    import_time = statistics.median(imports)
+    construction_time = statistics.median(constructions)
+    print(f"{name:<12}{import_time:>10.1f}ms{construction_time:>10.1f}ms")
+    slowest = sorted(
+        modules.items(), key=lambda item: -statistics.median(item[1])
+    )[:top]
+    for imported, samples in slowest:
+        print(f"{'':<12}{statistics.median(samples):>10.1f}ms  {imported}")
+    return import_time, construction_time
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure import and first-construction time."
+    )
+    parser.add_argument(
+        "--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS)
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=500.0)
+    parser.add_argument("--construct-budget-ms", type=float, default=1500.0)
+    args = parser.parse_args()
+
+    print(f"{'target':<12}{'import':>12}{'construct':>12}")
+    over_budget = []
+    failed = []
+    for name in args.targets:
+        try:
+            result = bench_target(name, args.runs, args.top)
+        except RuntimeError as e:
+            print(f"{name:<12}failed: {e}")
+            failed.append(name)
+            continue
+        if result is None:
+            continue
+        import_time, construction_time = result
+        if import_time > args.import_budget_ms:
+            over_budget.append(f"{name} import {import_time:.1f}ms")
+        if construction_time > args.construct_budget_ms:
+            over_budget.append(
+                f"{name} construction {construction_time:.1f}ms"
+            )
+
+    if over_budget:
+        print("\nOver budget: " + ", ".join(over_budget))
+    if failed:
+        print("\nFailed: " + ", ".join(failed))
+    if over_budget or failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Input tokens of the Stripe tool definitions, per prompt mode.
+
+Compares the function definitions sent to the model with the full and the
+compact descriptions, and with the full and the minified schemas. The
+definitions the frameworks send are measured too, in both modes, when
+LangChain or CrewAI is installed: LangChain's ``convert_to_openai_tool`` of
+each tool, and the description CrewAI renders for the prompt. Tokens are
+counted with tiktoken when it is installed, and estimated from the byte
+size otherwise. Run from the ``python`` directory::
+
+    python -m benchmarks.prompt_benchmark --per-tool
+"""
+
+import argparse
+import json
+from typing import Callable, Dict, List, Optional
+
+from stripe_agent_toolkit.budget import BYTES_PER_TOKEN
+from stripe_agent_toolkit.compact import get_compact_tools
+from stripe_agent_toolkit.tools import tools
+
+
+def _counter(encoding: str) -> Callable[[str], int]:
+    try:
+        import tiktoken
+    except ImportError:
+        print("tiktoken is not installed, estimating tokens from bytes.\n")
+        return lambda text: -(-len(text.encode("utf-8")) // BYTES_PER_TOKEN)
+    return lambda text: len(tiktoken.get_encoding(encoding).encode(text))
+
+
+def _definition(tool: Dict, schema_from: Dict) -> str:
+    """A tool as sent in an OpenAI-style ``tools`` request parameter."""
+    schema = schema_from.get("args_schema")
+    return json.dumps(
+        {
+            "type": "function",
+            "function": {
+                "name": tool["method"],
+                "description": tool["description"].strip(),
+                "parameters": schema.model_json_schema() if schema else {},
+            },
+        }
+    )
+
+
+VARIANTS = {
+    "full": lambda full, compact: _definition(full, full),
+    "compact descriptions": lambda full, compact: _definition(compact, full),
+    "minified schemas": lambda full, compact: _definition(full, compact),
+    "compact": lambda full, compact: _definition(compact, compact),
+}
+
+
+def bench_variants(count: Callable[[str], int], per_tool: bool):
+    pairs = list(zip(tools, get_compact_tools()))
+    tokens: Dict[str, List[int]] = {
+        name: [count(variant(full, compact)) for full, compact in pairs]
+        for name, variant in VARIANTS.items()
+    }
+    baseline = sum(tokens["full"])
+
+    print(f"{'variant':<24}{'tokens':>10}{'saved':>10}")
+    for name, counts in tokens.items():
+        total = sum(counts)
+        print(f"{name:<24}{total:>10}{1 - total / baseline:>10.0%}")
+
+    if per_tool:
+        print(f"\n{'tool':<24}{'full':>10}{'compact':>10}{'saved':>10}")
+        for tool, full, compact in zip(
+            tools, tokens["full"], tokens["compact"]
+        ):
+            print(
+                f"{tool['method']:<24}{full:>10}{compact:>10}"
+                f"{1 - compact / full:>10.0%}"
+            )
+
+
+# Every action of every tool, so the toolkits expose all of them.
+CONFIGURATION: Dict = {"actions": {}}
+for _tool in tools:
+    for _resource, _permissions in _tool["actions"].items():
+        CONFIGURATION["actions"].setdefault(_resource, {}).update(
+            _permissions
+        )
+
+
+def _langchain_definitions(compact: bool) -> Optional[List[str]]:
+    try:
+        from langchain_core.utils.function_calling import (
+            convert_to_openai_tool,
+        )
+
+        from stripe_agent_toolkit.langchain.toolkit import StripeAgentToolkit
+    except ImportError:
+        return None
+    toolkit = StripeAgentToolkit(
+        "sk_test_123", CONFIGURATION, compact=compact
+    )
+    return [
+        json.dumps(convert_to_openai_tool(tool))
+        for tool in toolkit.get_tools()
+    ]
+
+
+def _crewai_definitions(compact: bool) -> Optional[List[str]]:
+    from stripe_agent_toolkit.crewai.toolkit import StripeAgentToolkit
+
+    try:
+        # The toolkit imports CrewAI when it is built.
+        toolkit = StripeAgentToolkit(
+            "sk_test_123", CONFIGURATION, compact=compact
+        )
+    except ImportError:
+        return None
+    # CrewAI renders the arguments into the description it prompts with.
+    return [tool.description for tool in toolkit.get_tools()]
+
+
+FRAMEWORKS = {
+    "langchain": _langchain_definitions,
+    "crewai": _crewai_definitions,
+}
+
+
+def bench_frameworks(count: Callable[[str], int]):
+    print(f"\n{'framework':<24}{'full':>10}{'compact':>10}{'saved':>10}")
+    for name, definitions in FRAMEWORKS.items():
+        full = definitions(False)
+        if full is None:
+            print(f"{name:<24}{'not installed':>30}")
+            continue
+        full_tokens = sum(count(text) for text in full)
+        compact_tokens = sum(count(text) for text in definitions(True))
+        print(
+            f"{name:<24}{full_tokens:>10}{compact_tokens:>10}"
+            f"{1 - compact_tokens / full_tokens:>10.0%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Count the input tokens of the Stripe tool definitions."
+    )
+    parser.add_argument("--encoding", default="o200k_base")
+    parser.add_argument("--per-tool", action="store_true")
+    args = parser.parse_args()
+
+    count = _counter(args.encoding)
+    bench_variants(count, args.per_tool)
+    bench_frameworks(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,73 +3,119 @@
 from __future__ import annotations
 
 import json
-import stripe
-from typing import Optional
+import sys
+from functools import lru_cache
+from typing import Iterable, Optional
 from pydantic import BaseModel
 
+from .batch import run_batch
 from .configuration import Context
+from .middleware import MiddlewarePipeline, ToolCall
 
-from .functions import (
-    create_customer,
-    list_customers,
-    create_product,
-    list_products,
-    create_price,
-    list_prices,
-    create_payment_link,
-    create_invoice,
-    create_invoice_item,
-    finalize_invoice,
-    retrieve_balance,
-    create_refund,
+
+# The functions calling Stripe, imported with the Stripe SDK (the slowest
+# import of the package) on first use.
+_FUNCTIONS = (
+    "create_customer",
+    "list_customers",
+    "create_product",
+    "list_products",
+    "create_price",
+    "list_prices",
+    "create_payment_link",
+    "create_invoice",
+    "create_invoice_item",
+    "finalize_invoice",
+    "retrieve_balance",
+    "create_refund",
 )
 
 
+@lru_cache(maxsize=None)
+def _stripe():
+    """Import and set up the Stripe SDK."""
+    import stripe
+
+    stripe.set_app_info(
+        "stripe-agent-toolkit-python",
+        version="0.2.0",
+        url="https://github.com/stripe/agent-toolkit",
+    )
+    return stripe
+
+
+def __getattr__(name: str):
+    if name in _FUNCTIONS:
+        from . import functions
+
+        value = getattr(functions, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 class StripeAPI(BaseModel):
     """ "Wrapper for Stripe API"""
 
     _context: Context
+    _secret_key: str
+    _pipeline: MiddlewarePipeline
+    _allowed_methods: Optional[frozenset] = None
 
-    def __init__(self, secret_key: str, context: Optional[Context]):
+    def __init__(
+        self,
+        secret_key: str,
+        context: Optional[Context],
+        pipeline: Optional[MiddlewarePipeline] = None,
+        allowed_methods: Optional[Iterable[str]] = None,
+    ):
         super().__init__()
 
         self._context = context if context is not None else Context()
+        self._pipeline = pipeline or MiddlewarePipeline()
+        # The methods a batch may run; all of them when not restricted.
+        if allowed_methods is not None:
+            self._allowed_methods = frozenset(allowed_methods)
 
-        stripe.api_key = secret_key
-        stripe.set_app_info(
-            "stripe-agent-toolkit-python",
-            version="0.2.0",
-            url="https://github.com/stripe/agent-toolkit",
-        )
+        # Sent with each request rather than set on the SDK module, so
+        # toolkits with different keys can share a process.
+        self._secret_key = secret_key
 
     def run(self, method: str, *args, **kwargs) -> str:
-        if method == "create_customer":
-            return json.dumps(create_customer(self._context, *args, **kwargs))
-        elif method == "list_customers":
-            return json.dumps(list_customers(self._context, *args, **kwargs))
-        elif method == "create_product":
-            return json.dumps(create_product(self._context, *args, **kwargs))
-        elif method == "list_products":
-            return json.dumps(list_products(self._context, *args, **kwargs))
-        elif method == "create_price":
-            return json.dumps(create_price(self._context, *args, **kwargs))
-        elif method == "list_prices":
-            return json.dumps(list_prices(self._context, *args, **kwargs))
-        elif method == "create_payment_link":
-            return json.dumps(
-                create_payment_link(self._context, *args, **kwargs)
-            )
-        elif method == "create_invoice":
-            return json.dumps(create_invoice(self._context, *args, **kwargs))
-        elif method == "create_invoice_item":
-            return json.dumps(
-                create_invoice_item(self._context, *args, **kwargs)
+        return self._pipeline.run(
+            method, args, kwargs, self._context, self._call
+        )
+
+    async def arun(self, method: str, *args, **kwargs) -> str:
+        return await self._pipeline.arun(
+            method, args, kwargs, self._context, self._acall
+        )
+
+    async def _acall(self, call: ToolCall) -> str:
+        import asyncio
+
+        # The Stripe SDK is blocking, so async calls run it in a thread.
+        return await asyncio.to_thread(self._call, call)
+
+    def _call(self, call: ToolCall) -> str:
+        method, args, kwargs = call.method, call.args, call.kwargs
+
+        if method == "batch":
+            return run_batch(
+                self.run,
+                *args,
+                allowed_methods=self._allowed_methods,
+                **kwargs,
             )
-        elif method == "finalize_invoice":
-            return json.dumps(finalize_invoice(self._context, *args, **kwargs))
-        elif method == "retrieve_balance":
-            return json.dumps(retrieve_balance(self._context, *args, **kwargs))
-        elif method == "create_refund":
-            return json.dumps(create_refund(self._context, *args, **kwargs))
-        else:
+
+        if method not in _FUNCTIONS:
             raise ValueError("Invalid method " + method)
+
+        _stripe()
+        # Looked up on the module, which imports the functions on first use.
+        function = getattr(sys.modules[__name__], method)
+        return json.dumps(
+            function(
+                self._context, *args, api_key=self._secret_key, **kwargs
+            )
+        )
@@ -0,0 +1,186 @@
+"""Run many Stripe operations in one tool call."""
+
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel, ValidationError
+
+from .breaker import CircuitOpenResponse
+
+MAX_OPERATIONS = 50
+
+# An argument of the form "$<id>.<field>" takes the value of ``field`` in
+# the result of the operation ``id``.
+REFERENCE = re.compile(r"^\$([A-Za-z0-9_-]+)\.([A-Za-z0-9_.]+)$")
+
+
+@lru_cache(maxsize=None)
+def _schemas() -> Dict[str, Any]:
+    # Imported on first use: the tool list imports every schema.
+    from .tools import tools
+
+    return {tool["method"]: tool.get("args_schema") for tool in tools}
+
+
+def _references(value: Any) -> List[str]:
+    if isinstance(value, str):
+        match = REFERENCE.match(value)
+        return [match.group(1)] if match else []
+    if isinstance(value, dict):
+        return [ref for item in value.values() for ref in _references(item)]
+    if isinstance(value, list):
+        return [ref for item in value for ref in _references(item)]
+    return []
+
+
+def _resolve(value: Any, results: Dict[str, Any]) -> Any:
+    if isinstance(value, str):
+        match = REFERENCE.match(value)
+        if not match:
+            return value
+        resolved = results[match.group(1)]
+        for field in match.group(2).split("."):
+            resolved = resolved[field]
+        return resolved
+    if isinstance(value, dict):
+        return {key: _resolve(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve(item, results) for item in value]
+    return value
+
+
+def _levels(operations: List[Dict]) -> List[List[Dict]]:
+    """Group operations into levels that only depend on earlier levels."""
+    ids = [operation["id"] for operation in operations]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Operation IDs must be unique")
+
+    remaining = {operation["id"]: operation for operation in operations}
+    done: set = set()
+    levels = []
+    while remaining:
+        level = [
+            operation
+            for operation in remaining.values()
+            if all(dep in done for dep in operation["depends_on"])
+        ]
+        if not level:
+            raise ValueError(
+                "Operations have unknown or circular dependencies: "
+                + ", ".join(remaining)
+            )
+        for operation in level:
+            del remaining[operation["id"]]
+        done.update(operation["id"] for operation in level)
+        levels.append(level)
+    return levels
+
+
+def run_batch(
+    run: Callable[..., str],
+    operations: List[Dict],
+    allowed_methods: Optional[Iterable[str]] = None,
+    max_concurrency: int = 4,
+    sequential: bool = False,
+) -> str:
+    """
+    Run a batch of operations.
+
+    Parameters:
+        run (callable): Runs one operation, as ``StripeAPI.run``.
+        operations (list[dict | BatchOperation]): The operations, each with
+        a ``method``, its ``args``, and optionally an ``id`` and the IDs it
+        ``depends_on``.
+        allowed_methods (iterable[str], optional): The methods the toolkit
+        is configured to allow.
+        max_concurrency (int, optional): The maximum number of operations
+        running at once.
+        sequential (bool, optional): Run the operations one by one in
+        order.
+
+    Returns:
+        str: The results in operation order, as compact JSON.
+    """
+    if len(operations) > MAX_OPERATIONS:
+        raise ValueError(
+            f"A batch can contain at most {MAX_OPERATIONS} operations"
+        )
+    allowed = set(allowed_methods) if allowed_methods is not None else None
+
+    normalized: List[Dict] = []
+    for index, operation in enumerate(operations):
+        if isinstance(operation, BaseModel):
+            operation = operation.model_dump()
+        args = operation.get("args") or {}
+        depends_on = list(operation.get("depends_on") or [])
+        depends_on += [
+            ref for ref in _references(args) if ref not in depends_on
+        ]
+        if sequential and normalized:
+            depends_on.append(normalized[-1]["id"])
+        normalized.append(
+            {
+                "id": str(operation.get("id") or index),
+                "method": operation["method"],
+                "args": args,
+                "depends_on": depends_on,
+            }
+        )
+
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+
+    def execute(operation: Dict) -> Tuple[str, Any]:
+        method = operation["method"]
+        failed = [dep for dep in operation["depends_on"] if dep in errors]
+        if failed:
+            return "error", "Skipped, dependency failed: " + ", ".join(failed)
+        schemas = _schemas()
+        if method == "batch" or method not in schemas:
+            return "error", "Invalid method " + method
+        if allowed is not None and method not in allowed:
+            return "error", "Method not allowed: " + method
+        try:
+            args = _resolve(operation["args"], results)
+        except (KeyError, IndexError, TypeError) as e:
+            return "error", f"Invalid reference: {e}"
+        try:
+            schema = schemas[method]
+            if schema is not None:
+                args = schema(**args).model_dump(exclude_unset=True)
+            result = run(method, **args)
+            if isinstance(result, CircuitOpenResponse):
+                return "error", json.loads(result)["error"]["message"]
+            return "result", json.loads(result)
+        except ValidationError as e:
+            return "error", "Invalid arguments: " + "; ".join(
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                for error in e.errors()
+            )
+        except Exception as e:
+            return "error", str(e)
+
+    levels = _levels(normalized)
+    workers = max(1, min(max_concurrency, MAX_OPERATIONS))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for level in levels:
+            for operation, (kind, value) in zip(
+                level, executor.map(execute, level)
+            ):
+                if kind == "error":
+                    errors[operation["id"]] = value
+                else:
+                    results[operation["id"]] = value
+
+    response = []
+    for operation in normalized:
+        entry: Dict[str, Any] = {"id": operation["id"]}
+        if operation["id"] in errors:
+            entry["error"] = errors[operation["id"]]
+        else:
+            entry["result"] = results[operation["id"]]
+        response.append(entry)
+    return json.dumps(response, separators=(",", ":"))
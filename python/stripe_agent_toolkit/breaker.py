@@ -0,0 +1,243 @@
+"""Circuit breaking for degraded upstreams.
+
+Usage::
+
+    breaker = CircuitBreaker("stripe", failure_threshold=5)
+    pipeline = MiddlewarePipeline([MetricsMiddleware(), breaker])
+    toolkit = StripeAgentToolkit(secret_key, configuration, pipeline=pipeline)
+    breaker.snapshot()  # the state of every circuit
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .middleware import AsyncHandler, Handler, Middleware, ToolCall
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# The context keys identifying the account of a call, in order.
+ACCOUNT_KEYS = ("account", "business_id")
+
+
+def is_upstream_failure(error: Exception) -> bool:
+    """Whether ``error`` means the upstream is degraded.
+
+    Server errors, rate limiting, timeouts and connection errors count;
+    errors in the request, such as a 400 or a bad argument, don't.
+    """
+    status = getattr(error, "http_status", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return status >= 500 or status == 429
+    return not isinstance(error, (ValueError, TypeError, LookupError))
+
+
+class CircuitOpenResponse(str):
+    """The structured error returned instead of calling an open circuit.
+
+    A ``str``, so it reaches the agent as a tool result; memoization never
+    caches it.
+    """
+
+
+class Circuit:
+    """The state of one upstream, endpoint and account."""
+
+    __slots__ = (
+        "state",
+        "failures",
+        "opened_at",
+        "probes",
+        "rejected",
+        "last_error",
+        "trips",
+    )
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probes = 0
+        # How many times the circuit opened, to tell calls admitted before
+        # it last opened.
+        self.trips = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+
+
+class CircuitBreaker(Middleware):
+    """Fails calls to a degraded upstream fast instead of waiting them out.
+
+    Each method and account of ``upstream`` has its own circuit. After
+    ``failure_threshold`` consecutive upstream failures a circuit opens and
+    calls return a ``CircuitOpenResponse`` at once. ``recovery_timeout``
+    seconds later it is half open: up to ``half_open_max_calls`` probe
+    calls go through, and the first to succeed closes the circuit while a
+    failure opens it again.
+    """
+
+    def __init__(
+        self,
+        upstream: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        is_failure: Callable[[Exception], bool] = is_upstream_failure,
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.upstream = upstream
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.is_failure = is_failure
+        self._lock = threading.Lock()
+        self._circuits: Dict[Tuple[str, Optional[str]], Circuit] = {}
+
+    def _key(self, call: ToolCall) -> Tuple[str, Optional[str]]:
+        context = call.context or {}
+        account = next(
+            (context.get(key) for key in ACCOUNT_KEYS if context.get(key)),
+            None,
+        )
+        return call.method, account
+
+    def _acquire(
+        self, key: Tuple[str, Optional[str]]
+    ) -> Tuple[Optional[CircuitOpenResponse], bool, int]:
+        """Let a call through, or return the response rejecting it.
+
+        Also returns whether the call is a probe of a half open circuit, and
+        the trips of the circuit when it was admitted.
+        """
+        now = time.monotonic()
+        with self._lock:
+            circuit = self._circuits.setdefault(key, Circuit())
+            if circuit.state == OPEN:
+                if now - circuit.opened_at < self.recovery_timeout:
+                    circuit.rejected += 1
+                    return self._response(key, circuit, now), False, 0
+                circuit.state = HALF_OPEN
+                circuit.probes = 0
+            if circuit.state == HALF_OPEN:
+                if circuit.probes >= self.half_open_max_calls:
+                    circuit.rejected += 1
+                    return self._response(key, circuit, now), False, 0
+                circuit.probes += 1
+                return None, True, circuit.trips
+            return None, False, circuit.trips
+
+    def _release(
+        self,
+        key: Tuple[str, Optional[str]],
+        probe: bool,
+        trips: int,
+        error: Optional[Exception],
+    ):
+        failed = error is not None and self.is_failure(error)
+        with self._lock:
+            circuit = self._circuits[key]
+            if trips != circuit.trips:
+                # Admitted before the circuit last opened: the outcome says
+                # nothing about the upstream since.
+                return
+            if probe:
+                circuit.probes -= 1
+            if not failed:
+                circuit.state = CLOSED
+                circuit.failures = 0
+                circuit.opened_at = None
+                return
+            circuit.failures += 1
+            circuit.last_error = f"{type(error).__name__}: {error}"
+            if probe or circuit.failures >= self.failure_threshold:
+                circuit.state = OPEN
+                circuit.opened_at = time.monotonic()
+                circuit.trips += 1
+
+    def _response(
+        self, key: Tuple[str, Optional[str]], circuit: Circuit, now: float
+    ) -> CircuitOpenResponse:
+        method, account = key
+        retry_after = max(
+            0.0, circuit.opened_at + self.recovery_timeout - now
+        )
+        return CircuitOpenResponse(
+            json.dumps(
+                {
+                    "error": {
+                        "type": "circuit_open",
+                        "upstream": self.upstream,
+                        "method": method,
+                        "account": account,
+                        "retry_after": round(retry_after, 1),
+                        "last_error": circuit.last_error,
+                        "message": (
+                            f"{self.upstream} is failing for {method}, so"
+                            " it was not called. Retry after"
+                            f" {retry_after:.0f}s or continue without it."
+                        ),
+                    }
+                }
+            )
+        )
+
+    def handle(self, call: ToolCall, call_next: Handler) -> Any:
+        key = self._key(call)
+        rejected, probe, trips = self._acquire(key)
+        if rejected is not None:
+            return rejected
+        try:
+            result = call_next(call)
+        except Exception as e:
+            self._release(key, probe, trips, e)
+            raise
+        self._release(key, probe, trips, None)
+        return result
+
+    async def ahandle(self, call: ToolCall, call_next: AsyncHandler) -> Any:
+        key = self._key(call)
+        rejected, probe, trips = self._acquire(key)
+        if rejected is not None:
+            return rejected
+        try:
+            result = await call_next(call)
+        except Exception as e:
+            self._release(key, probe, trips, e)
+            raise
+        self._release(key, probe, trips, None)
+        return result
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """The state of every circuit, keyed ``upstream:method:account``."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                f"{self.upstream}:{method}:{account or ''}": {
+                    "state": circuit.state,
+                    "failures": circuit.failures,
+                    "rejected": circuit.rejected,
+                    "retry_after": (
+                        max(
+                            0.0,
+                            circuit.opened_at + self.recovery_timeout - now,
+                        )
+                        if circuit.state == OPEN
+                        else 0.0
+                    ),
+                    "last_error": circuit.last_error,
+                }
+                for (method, account), circuit in self._circuits.items()
+            }
+
+    def reset(self):
+        """Close every circuit."""
+        with self._lock:
+            self._circuits.clear()
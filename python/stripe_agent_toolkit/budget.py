@@ -0,0 +1,99 @@
+"""Output budget for list tool results."""
+
+import json
+from typing import Any, Iterable, List, Optional
+
+from .middleware import AsyncHandler, Handler, Middleware, ToolCall
+
+LIST_METHODS = frozenset(["list_customers", "list_products", "list_prices"])
+
+# A rough estimate for JSON, where a token averages about four bytes.
+BYTES_PER_TOKEN = 4
+
+TRUNCATED_NOTE = (
+    "Output truncated to fit the output budget. Call the tool again with"
+    " starting_after to get the next items."
+)
+
+
+class OutputBudget(Middleware):
+    """Truncates list results that exceed a budget in bytes or tokens.
+
+    An oversized list is cut to the longest prefix that fits, and returned
+    with the number of items returned and omitted and the ``starting_after``
+    cursor a follow-up call can continue from. At least one item is always
+    returned so paging makes progress.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        methods: Iterable[str] = LIST_METHODS,
+    ):
+        budgets = [
+            budget
+            for budget in (
+                max_bytes,
+                max_tokens * BYTES_PER_TOKEN if max_tokens else None,
+            )
+            if budget
+        ]
+        if not budgets:
+            raise ValueError("Either max_bytes or max_tokens is required")
+        self.max_bytes = min(budgets)
+        self.methods = frozenset(methods)
+
+    def handle(self, call: ToolCall, call_next: Handler) -> Any:
+        result = call_next(call)
+        if call.method in self.methods:
+            return self.fit(result)
+        return result
+
+    async def ahandle(self, call: ToolCall, call_next: AsyncHandler) -> Any:
+        result = await call_next(call)
+        if call.method in self.methods:
+            return self.fit(result)
+        return result
+
+    def fit(self, result: str) -> str:
+        """Return ``result``, truncated if it is over the budget."""
+        if len(result.encode("utf-8")) <= self.max_bytes:
+            return result
+        items = json.loads(result)
+        if not isinstance(items, list) or not items:
+            return result
+
+        envelope = len(
+            json.dumps(
+                {
+                    "data": [],
+                    "returned": len(items),
+                    "omitted": len(items),
+                    "starting_after": "x" * 64,
+                    "note": TRUNCATED_NOTE,
+                }
+            ).encode("utf-8")
+        )
+        kept: List[Any] = []
+        size = envelope
+        for item in items:
+            encoded = json.dumps(item)
+            # Each item after the first also costs a separator.
+            size += len(encoded.encode("utf-8")) + (2 if kept else 0)
+            if kept and size > self.max_bytes:
+                break
+            kept.append(item)
+
+        last = kept[-1]
+        return json.dumps(
+            {
+                "data": kept,
+                "returned": len(kept),
+                "omitted": len(items) - len(kept),
+                "starting_after": (
+                    last.get("id") if isinstance(last, dict) else None
+                ),
+                "note": TRUNCATED_NOTE,
+            }
+        )
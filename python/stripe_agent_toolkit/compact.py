@@ -0,0 +1,111 @@
+"""Compact tool descriptions and minified schemas.
+
+In compact mode a tool is described by its short entry in
+``COMPACT_PROMPTS`` and an argument schema stripped of titles and
+descriptions, which cuts the input tokens of every agent turn.
+"""
+
+from functools import lru_cache
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel, Field, create_model
+
+from .prompts import COMPACT_PROMPTS
+from .schema import ToolSchema
+
+
+def _minify(schema: Any) -> Any:
+    """Drop titles, null defaults and the null branch of optional types."""
+    if isinstance(schema, list):
+        return [_minify(item) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    minified = {}
+    for key, value in schema.items():
+        if key == "title" and isinstance(value, str):
+            continue
+        if key == "default" and value is None:
+            continue
+        minified[key] = _minify(value)
+    branches = minified.get("anyOf")
+    if branches and {"type": "null"} in branches:
+        branches = [
+            branch for branch in branches if branch != {"type": "null"}
+        ]
+        del minified["anyOf"]
+        if len(branches) == 1:
+            minified.update(branches[0])
+        else:
+            minified["anyOf"] = branches
+    return minified
+
+
+class MinifiedSchema(ToolSchema):
+    """Base of minified schemas, whose JSON schema is minified too."""
+
+    @classmethod
+    def model_json_schema(cls, *args, **kwargs) -> Dict[str, Any]:
+        return _minify(super().model_json_schema(*args, **kwargs))
+
+
+def _minify_annotation(annotation: Any) -> Any:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return minify_schema(annotation)
+    origin = get_origin(annotation)
+    if origin is None:
+        return annotation
+    args = tuple(_minify_annotation(arg) for arg in get_args(annotation))
+    if origin is Union:
+        return Union[args]
+    return origin[args] if len(args) > 1 else origin[args[0]]
+
+
+@lru_cache(maxsize=None)
+def minify_schema(schema: Type[BaseModel]) -> Type[BaseModel]:
+    """A copy of ``schema`` without docstring, titles or descriptions.
+
+    The copy validates arguments exactly as ``schema`` does.
+    """
+    fields = {}
+    for name, field in schema.model_fields.items():
+        if field.default_factory is not None:
+            default = Field(default_factory=field.default_factory)
+        else:
+            default = Field(field.default)
+        fields[name] = (_minify_annotation(field.annotation), default)
+    return create_model(
+        schema.__name__,
+        __base__=MinifiedSchema,
+        __doc__=None,
+        __module__=__name__,
+        **fields,
+    )
+
+
+def compact_tool(tool: Dict) -> Dict:
+    """A copy of ``tool`` with its compact description and schema."""
+    schema: Optional[Type[BaseModel]] = tool.get("args_schema")
+    return {
+        **tool,
+        "description": COMPACT_PROMPTS.get(
+            tool["method"], tool["description"]
+        ),
+        "args_schema": minify_schema(schema) if schema is not None else None,
+    }
+
+
+@lru_cache(maxsize=None)
+def get_compact_tools() -> List[Dict]:
+    """Every tool in its compact form, built on first use."""
+    from .tools import tools
+
+    return [compact_tool(tool) for tool in tools]
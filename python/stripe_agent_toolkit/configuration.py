@@ -1,4 +1,4 @@
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 from typing_extensions import TypedDict
 
 # Define Object type
@@ -61,3 +61,15 @@ def is_tool_allowed(tool, configuration):
             ):
                 return False
     return True
+
+
+def get_allowed_tools(tools, configuration) -> List:
+    """The tools ``configuration`` allows.
+
+    A tool without actions of its own, such as ``batch``, only runs the
+    other tools, so it is left out when none of them is allowed.
+    """
+    allowed = [tool for tool in tools if is_tool_allowed(tool, configuration)]
+    if not any(tool.get("actions") for tool in allowed):
+        return []
+    return allowed
@@ -10,16 +10,22 @@ from pydantic import BaseModel
 from crewai_tools import BaseTool
 
 from ..api import StripeAPI
+from ..memo import ConversationMemo, current_scope
 
 
 class StripeTool(BaseTool):
-    """Tool for interacting with the Stripe API."""
+    """Tool for interacting with the Stripe API.
+
+    CrewAI passes no run context to tools, so results are memoized under
+    the scope set with ``ConversationMemo.conversation``.
+    """
 
     stripe_api: StripeAPI
     method: str
     name: str = ""
     description: str = ""
     args_schema: Optional[Type[BaseModel]] = None
+    memo: Optional[ConversationMemo] = None
 
     def _run(
         self,
@@ -27,4 +33,28 @@ class StripeTool(BaseTool):
         **kwargs: Any,
     ) -> str:
         """Use the Stripe API to run an operation."""
-        return self.stripe_api.run(self.method, *args, **kwargs)
+        if self.memo is None:
+            return self.stripe_api.run(self.method, *args, **kwargs)
+        return self.memo.run(
+            current_scope.get(),
+            self.method,
+            args,
+            kwargs,
+            lambda: self.stripe_api.run(self.method, *args, **kwargs),
+        )
+
+    async def _arun(
+        self,
+        *args: Any,
+        **kwargs: Any,
+    ) -> str:
+        """Use the Stripe API to run an operation asynchronously."""
+        if self.memo is None:
+            return await self.stripe_api.arun(self.method, *args, **kwargs)
+        return await self.memo.arun(
+            current_scope.get(),
+            self.method,
+            args,
+            kwargs,
+            lambda: self.stripe_api.arun(self.method, *args, **kwargs),
+        )
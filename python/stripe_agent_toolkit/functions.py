@@ -3,13 +3,19 @@ from typing import Optional
 from .configuration import Context
 
 
-def create_customer(context: Context, name: str, email: Optional[str] = None):
+def create_customer(
+    context: Context,
+    name: str,
+    email: Optional[str] = None,
+    api_key: Optional[str] = None,
+):
     """
     Create a customer.
 
     Parameters:
         name (str): The name of the customer.
         email (str, optional): The email address of the customer.
+        api_key (str, optional): The secret key to call Stripe with.
 
     Returns:
         stripe.Customer: The created customer.
@@ -21,6 +27,8 @@ def create_customer(context: Context, name: str, email: Optional[str] = None):
         account = context.get("account")
         if account is not None:
             customer_data["stripe_account"] = account
+    if api_key is not None:
+        customer_data["api_key"] = api_key
 
     customer = stripe.Customer.create(**customer_data)
     return {"id": customer.id}
@@ -30,6 +38,8 @@ def list_customers(
     context: Context,
     email: Optional[str] = None,
     limit: Optional[int] = None,
+    starting_after: Optional[str] = None,
+    api_key: Optional[str] = None,
 ):
     """
     List Customers.
@@ -37,6 +47,8 @@ def list_customers(
     Parameters:
         email (str, optional): The email address of the customer.
         limit (int, optional): The number of customers to return.
+        starting_after (str, optional): The ID of the customer to list after.
+        api_key (str, optional): The secret key to call Stripe with.
 
     Returns:
         stripe.ListObject: A list of customers.
@@ -46,17 +58,24 @@ def list_customers(
         customer_data["email"] = email
     if limit:
         customer_data["limit"] = limit
+    if starting_after:
+        customer_data["starting_after"] = starting_after
     if context.get("account") is not None:
         account = context.get("account")
         if account is not None:
             customer_data["stripe_account"] = account
+    if api_key is not None:
+        customer_data["api_key"] = api_key
 
     customers = stripe.Customer.list(**customer_data)
     return [{"id": customer.id} for customer in customers.data]
 
 
 def create_product(
-    context: Context, name: str, description: Optional[str] = None
+    context: Context,
+    name: str,
+    description: Optional[str] = None,
+    api_key: Optional[str] = None,
 ):
     """
     Create a product.
@@ -64,6 +83,7 @@ def create_product(
     Parameters:
         name (str): The name of the product.
         description (str, optional): The description of the product.
+        api_key (str, optional): The secret key to call Stripe with.
 
     Returns:
         stripe.Product: The created product.
@@ -75,15 +95,24 @@ def create_product(
         account = context.get("account")
         if account is not None:
             product_data["stripe_account"] = account
+    if api_key is not None:
+        product_data["api_key"] = api_key
 
     return stripe.Product.create(**product_data)
 
 
-def list_products(context: Context, limit: Optional[int] = None):
+def list_products(
+    context: Context,
+    limit: Optional[int] = None,
+    starting_after: Optional[str] = None,
+    api_key: Optional[str] = None,
+):
     """
     List Products.
     Parameters:
         limit (int, optional): The number of products to return.
+        starting_after (str, optional): The ID of the product to list after.
+        api_key (str, optional): The secret key to call Stripe with.
 
     Returns:
         stripe.ListObject: A list of products.
@@ -91,16 +120,24 @@ def list_products(context: Context, limit: Optional[int] = None):
     product_data: dict = {}
     if limit:
         product_data["limit"] = limit
+    if starting_after:
+        product_data["starting_after"] = starting_after
     if context.get("account") is not None:
         account = context.get("account")
         if account is not None:
             product_data["stripe_account"] = account
+    if api_key is not None:
+        product_data["api_key"] = api_key
 
     return stripe.Product.list(**product_data).data
 
 
 def create_price(
-    context: Context, product: str, currency: str, unit_amount: int
+    context: Context,
+    product: str,
+    currency: str,
+    unit_amount: int,
+    api_key: Optional[str] = None,
 ):
     """
     Create a price.
@@ -109,6 +146,7 @@ def create_price(
         product (str): The ID of the product.
         currency (str): The currency of the price.
         unit_amount (int): The unit amount of the price.
+        api_key (str, optional): The secret key to call Stripe with.
 
     Returns:
         stripe.Price: The created price.
@@ -122,6 +160,8 @@ def create_price(
         account = context.get("account")
         if account is not None:
             price_data["stripe_account"] = account
+    if api_key is not None:
+        price_data["api_key"] = api_key
 
     return stripe.Price.create(**price_data)
 
@@ -130,6 +170,8 @@ def list_prices(
     context: Context,
     product: Optional[str] = None,
     limit: Optional[int] = None,
+    starting_after: Optional[str] = None,
+    api_key: Optional[str] = None,
 ):
     """
     List Prices.
@@ -137,6 +179,8 @@ def list_prices(
     Parameters:
         product (str, optional): The ID of the product to list prices for.
         limit (int, optional): The number of prices to return.
+        starting_after (str, optional): The ID of the price to list after.
+        api_key (str, optional): The secret key to call Stripe with.
 
     Returns:
         stripe.ListObject: A list of prices.
@@ -146,21 +190,31 @@ def list_prices(
         prices_data["product"] = product
     if limit:
         prices_data["limit"] = limit
+    if starting_after:
+        prices_data["starting_after"] = starting_after
     if context.get("account") is not None:
         account = context.get("account")
         if account is not None:
             prices_data["stripe_account"] = account
+    if api_key is not None:
+        prices_data["api_key"] = api_key
 
     return stripe.Price.list(**prices_data).data
 
 
-def create_payment_link(context: Context, price: str, quantity: int):
+def create_payment_link(
+    context: Context,
+    price: str,
+    quantity: int,
+    api_key: Optional[str] = None,
+):
     """
     Create a payment link.
 
     Parameters:
         price (str): The ID of the price.
         quantity (int): The quantity of the product.
+        api_key (str, optional): The secret key to call Stripe with.
 
     Returns:
         stripe.PaymentLink: The created payment link.
@@ -172,13 +226,20 @@ def create_payment_link(context: Context, price: str, quantity: int):
         account = context.get("account")
         if account is not None:
             payment_link_data["stripe_account"] = account
+    if api_key is not None:
+        payment_link_data["api_key"] = api_key
 
     payment_link = stripe.PaymentLink.create(**payment_link_data)
 
     return {"id": payment_link.id, "url": payment_link.url}
 
 
-def create_invoice(context: Context, customer: str, days_until_due: int = 30):
+def create_invoice(
+    context: Context,
+    customer: str,
+    days_until_due: int = 30,
+    api_key: Optional[str] = None,
+):
     """
     Create an invoice.
 
@@ -186,6 +247,7 @@ def create_invoice(context: Context, customer: str, days_until_due: int = 30):
         customer (str): The ID of the customer.
         days_until_due (int, optional): The number of days until the
         invoice is due.
+        api_key (str, optional): The secret key to call Stripe with.
 
     Returns:
         stripe.Invoice: The created invoice.
@@ -199,6 +261,8 @@ def create_invoice(context: Context, customer: str, days_until_due: int = 30):
         account = context.get("account")
         if account is not None:
             invoice_data["stripe_account"] = account
+    if api_key is not None:
+        invoice_data["api_key"] = api_key
 
     invoice = stripe.Invoice.create(**invoice_data)
 
@@ -211,7 +275,11 @@ def create_invoice(context: Context, customer: str, days_until_due: int = 30):
 
 
 def create_invoice_item(
-    context: Context, customer: str, price: str, invoice: str
+    context: Context,
+    customer: str,
+    price: str,
+    invoice: str,
+    api_key: Optional[str] = None,
 ):
     """
     Create an invoice item.
@@ -220,6 +288,7 @@ def create_invoice_item(
         customer (str): The ID of the customer.
         price (str): The ID of the price.
         invoice (str): The ID of the invoice.
+        api_key (str, optional): The secret key to call Stripe with.
 
     Returns:
         stripe.InvoiceItem: The created invoice item.
@@ -233,18 +302,23 @@ def create_invoice_item(
         account = context.get("account")
         if account is not None:
             invoice_item_data["stripe_account"] = account
+    if api_key is not None:
+        invoice_item_data["api_key"] = api_key
 
     invoice_item = stripe.InvoiceItem.create(**invoice_item_data)
 
     return {"id": invoice_item.id, "invoice": invoice_item.invoice}
 
 
-def finalize_invoice(context: Context, invoice: str):
+def finalize_invoice(
+    context: Context, invoice: str, api_key: Optional[str] = None
+):
     """
     Finalize an invoice.
 
     Parameters:
         invoice (str): The ID of the invoice.
+        api_key (str, optional): The secret key to call Stripe with.
 
     Returns:
         stripe.Invoice: The finalized invoice.
@@ -254,6 +328,8 @@ def finalize_invoice(context: Context, invoice: str):
         account = context.get("account")
         if account is not None:
             invoice_data["stripe_account"] = account
+    if api_key is not None:
+        invoice_data["api_key"] = api_key
 
     invoice_object = stripe.Invoice.finalize_invoice(**invoice_data)
 
@@ -267,10 +343,14 @@ def finalize_invoice(context: Context, invoice: str):
 
 def retrieve_balance(
     context: Context,
+    api_key: Optional[str] = None,
 ):
     """
     Retrieve the balance.
 
+    Parameters:
+        api_key (str, optional): The secret key to call Stripe with.
+
     Returns:
         stripe.Balance: The balance.
     """
@@ -279,12 +359,17 @@ def retrieve_balance(
         account = context.get("account")
         if account is not None:
             balance_data["stripe_account"] = account
+    if api_key is not None:
+        balance_data["api_key"] = api_key
 
     return stripe.Balance.retrieve(**balance_data)
 
 
 def create_refund(
-    context: Context, payment_intent: str, amount: Optional[int] = None
+    context: Context,
+    payment_intent: str,
+    amount: Optional[int] = None,
+    api_key: Optional[str] = None,
 ):
     """
     Create a refund.
@@ -292,6 +377,7 @@ def create_refund(
     Parameters:
         payment_intent (str): The ID of the payment intent.
         amount (int, optional): The amount to refund in cents.
+        api_key (str, optional): The secret key to call Stripe with.
 
     Returns:
         stripe.Refund: The created refund.
@@ -305,5 +391,7 @@ def create_refund(
             account = context.get("account")
             if account is not None:
                 refund_data["stripe_account"] = account
+    if api_key is not None:
+        refund_data["api_key"] = api_key
 
     return stripe.Refund.create(**refund_data)
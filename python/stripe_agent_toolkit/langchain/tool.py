@@ -4,12 +4,30 @@ This tool allows agents to interact with the Stripe API.
 
 from __future__ import annotations
 
-from typing import Any, Optional, Type
+from typing import Any, Hashable, Optional, Type
 from pydantic import BaseModel
 
 from langchain.tools import BaseTool
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
+from langchain_core.runnables import RunnableConfig
 
 from ..api import StripeAPI
+from ..memo import ConversationMemo, current_scope
+
+
+def _scope(
+    config: Optional[RunnableConfig], run_manager: Optional[Any]
+) -> Optional[Hashable]:
+    """The thread ID of the conversation, else the ID of the agent run."""
+    thread_id = ((config or {}).get("configurable") or {}).get("thread_id")
+    if thread_id is not None:
+        return thread_id
+    if run_manager is not None and run_manager.parent_run_id is not None:
+        return run_manager.parent_run_id
+    return current_scope.get()
 
 
 class StripeTool(BaseTool):
@@ -20,11 +38,51 @@ class StripeTool(BaseTool):
     name: str = ""
     description: str = ""
     args_schema: Optional[Type[BaseModel]] = None
+    memo: Optional[ConversationMemo] = None
+
+    @property
+    def tool_call_schema(self) -> Type[BaseModel]:
+        """The schema of the arguments, as the model is shown it.
+
+        LangChain otherwise copies ``args_schema`` into a new model, which
+        would undo the minified JSON schema of compact tools.
+        """
+        if self.args_schema is None:
+            return super().tool_call_schema
+        return self.args_schema
 
     def _run(
         self,
         *args: Any,
+        config: RunnableConfig,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
         **kwargs: Any,
     ) -> str:
         """Use the Stripe API to run an operation."""
-        return self.stripe_api.run(self.method, *args, **kwargs)
+        if self.memo is None:
+            return self.stripe_api.run(self.method, *args, **kwargs)
+        return self.memo.run(
+            _scope(config, run_manager),
+            self.method,
+            args,
+            kwargs,
+            lambda: self.stripe_api.run(self.method, *args, **kwargs),
+        )
+
+    async def _arun(
+        self,
+        *args: Any,
+        config: RunnableConfig,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+        **kwargs: Any,
+    ) -> str:
+        """Use the Stripe API to run an operation asynchronously."""
+        if self.memo is None:
+            return await self.stripe_api.arun(self.method, *args, **kwargs)
+        return await self.memo.arun(
+            _scope(config, run_manager),
+            self.method,
+            args,
+            kwargs,
+            lambda: self.stripe_api.arun(self.method, *args, **kwargs),
+        )
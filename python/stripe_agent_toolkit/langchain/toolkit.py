@@ -4,26 +4,70 @@ from typing import List, Optional
 from pydantic import PrivateAttr
 
 from ..api import StripeAPI
-from ..tools import tools
-from ..configuration import Configuration, Context, is_tool_allowed
-from .tool import StripeTool
+from ..budget import OutputBudget
+from ..middleware import MiddlewarePipeline
+from ..configuration import Configuration, Context, get_allowed_tools
 
 
 class StripeAgentToolkit:
     _tools: List = PrivateAttr(default=[])
 
     def __init__(
-        self, secret_key: str, configuration: Optional[Configuration] = None
+        self,
+        secret_key: str,
+        configuration: Optional[Configuration] = None,
+        pipeline: Optional[MiddlewarePipeline] = None,
+        memoize: bool = False,
+        output_budget: Optional[OutputBudget] = None,
+        compact: bool = False,
+        prefetch: bool = False,
+        prefetch_deadline: float = 5.0,
     ):
         super().__init__()
 
+        # Imported here rather than with the module, so importing the
+        # toolkit stays fast and the framework and tool list load on use.
+        from ..compact import get_compact_tools
+        from ..memo import ConversationMemo
+        from ..tools import tools
+        from .tool import StripeTool
+
         context = configuration.get("context") if configuration else None
 
-        stripe_api = StripeAPI(secret_key=secret_key, context=context)
+        filtered_tools = get_allowed_tools(
+            get_compact_tools() if compact else tools, configuration
+        )
 
-        filtered_tools = [
-            tool for tool in tools if is_tool_allowed(tool, configuration)
-        ]
+        if output_budget is not None:
+            pipeline = (pipeline or MiddlewarePipeline()).extended(
+                output_budget
+            )
+
+        self.prefetcher = None
+        if prefetch:
+            from ..prefetch import Prefetcher
+
+            # Innermost, so prefetched calls still run through the rest.
+            self.prefetcher = Prefetcher(deadline=prefetch_deadline)
+            pipeline = (pipeline or MiddlewarePipeline()).extended(
+                self.prefetcher
+            )
+
+        stripe_api = StripeAPI(
+            secret_key=secret_key,
+            context=context,
+            pipeline=pipeline,
+            allowed_methods=[tool["method"] for tool in filtered_tools],
+        )
+
+        if self.prefetcher is not None:
+            # Warms the catalog and balance reads the configuration allows.
+            self.prefetcher.start(
+                stripe_api.run, [tool["method"] for tool in filtered_tools]
+            )
+
+        # One memo shared by the tools, so a write clears cached reads.
+        self.memo = ConversationMemo() if memoize else None
 
         self._tools = [
             StripeTool(
@@ -32,6 +76,7 @@ class StripeAgentToolkit:
                 method=tool["method"],
                 stripe_api=stripe_api,
                 args_schema=tool.get("args_schema", None),
+                memo=self.memo,
             )
             for tool in filtered_tools
         ]
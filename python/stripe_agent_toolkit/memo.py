@@ -0,0 +1,149 @@
+"""Conversation-scoped memoization of Stripe tool results."""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    Optional,
+    Tuple,
+)
+
+from pydantic import BaseModel, PrivateAttr
+
+from .breaker import CircuitOpenResponse
+from .tools import tools
+
+# The scope of tool calls made outside a framework run, if any.
+current_scope: ContextVar[Optional[Hashable]] = ContextVar(
+    "stripe_agent_toolkit_scope", default=None
+)
+
+
+def _is_read_only(tool: Dict) -> bool:
+    actions = tool.get("actions") or {}
+    return bool(actions) and all(
+        set(permissions) == {"read"} for permissions in actions.values()
+    )
+
+
+READ_ONLY_METHODS = frozenset(
+    tool["method"] for tool in tools if _is_read_only(tool)
+)
+
+
+def _key(method: str, args: Tuple, kwargs: Dict[str, Any]) -> str:
+    return json.dumps(
+        [method, args, kwargs], sort_keys=True, default=str
+    )
+
+
+class ConversationMemo(BaseModel):
+    """Results of read-only tools, cached per conversation.
+
+    A conversation is identified by a scope, such as a thread or run ID.
+    Repeating a read call in the same scope returns the cached string
+    without calling Stripe, and any write in the scope clears it. Calls
+    made without a scope are never cached. Only the ``max_scopes`` most
+    recently used scopes are kept. Circuit breaker errors are never cached.
+    """
+
+    max_scopes: int = 128
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _scopes: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+
+    def _lookup(self, scope: Hashable, key: str) -> Optional[str]:
+        with self._lock:
+            entries = self._scopes.get(scope)
+            if entries is None or key not in entries:
+                return None
+            self._scopes.move_to_end(scope)
+            return entries[key]
+
+    def _store(self, scope: Hashable, key: str, result: str):
+        with self._lock:
+            self._scopes.setdefault(scope, {})[key] = result
+            self._scopes.move_to_end(scope)
+            while len(self._scopes) > self.max_scopes:
+                self._scopes.popitem(last=False)
+
+    def run(
+        self,
+        scope: Optional[Hashable],
+        method: str,
+        args: Tuple,
+        kwargs: Dict[str, Any],
+        call: Callable[[], str],
+    ) -> str:
+        """Return the memoized result of a call, or make it."""
+        if scope is None:
+            return call()
+        if method not in READ_ONLY_METHODS:
+            # Cleared again afterwards, in case a read raced the write.
+            self.clear(scope)
+            try:
+                return call()
+            finally:
+                self.clear(scope)
+
+        key = _key(method, args, kwargs)
+        result = self._lookup(scope, key)
+        if result is None:
+            result = call()
+            if not isinstance(result, CircuitOpenResponse):
+                self._store(scope, key, result)
+        return result
+
+    async def arun(
+        self,
+        scope: Optional[Hashable],
+        method: str,
+        args: Tuple,
+        kwargs: Dict[str, Any],
+        call: Callable[[], Awaitable[str]],
+    ) -> str:
+        """Async variant of ``run``."""
+        if scope is None:
+            return await call()
+        if method not in READ_ONLY_METHODS:
+            self.clear(scope)
+            try:
+                return await call()
+            finally:
+                self.clear(scope)
+
+        key = _key(method, args, kwargs)
+        result = self._lookup(scope, key)
+        if result is None:
+            result = await call()
+            if not isinstance(result, CircuitOpenResponse):
+                self._store(scope, key, result)
+        return result
+
+    def clear(self, scope: Optional[Hashable] = None):
+        """Forget the results of one scope, or of every scope."""
+        with self._lock:
+            if scope is None:
+                self._scopes.clear()
+            else:
+                self._scopes.pop(scope, None)
+
+    @contextmanager
+    def conversation(self, scope: Hashable) -> Iterator[None]:
+        """Memoize the tool calls made inside the block under ``scope``."""
+        token = current_scope.set(scope)
+        try:
+            yield
+        finally:
+            current_scope.reset(token)
+            self.clear(scope)
@@ -0,0 +1,208 @@
+"""Tool execution runtime shared by the Stripe and Appointy APIs.
+
+Every tool call runs through an ordered chain of middleware before it
+reaches the API function. Middleware sees the method name, the arguments
+(as validated by the tool's ``args_schema``), the context and the timing of
+the call, and can short-circuit, retry, time out or record it. The same
+chain serves sync and async calls.
+
+Usage::
+
+    metrics = MetricsMiddleware()
+    refunds = MetricsMiddleware()
+    pipeline = MiddlewarePipeline(
+        [metrics], per_method={"create_refund": [refunds]}
+    )
+    toolkit = StripeAgentToolkit(secret_key, configuration, pipeline=pipeline)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from functools import partial
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+
+class ToolCall:
+    """A single tool call as seen by middleware."""
+
+    __slots__ = ("method", "args", "kwargs", "context", "started", "elapsed")
+
+    def __init__(
+        self,
+        method: str,
+        args: Tuple,
+        kwargs: Dict[str, Any],
+        context: Mapping[str, Any],
+    ):
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.context = context
+        self.started = time.perf_counter()
+        self.elapsed: Optional[float] = None
+
+
+Handler = Callable[[ToolCall], Any]
+AsyncHandler = Callable[[ToolCall], Awaitable[Any]]
+
+
+class Middleware:
+    """Base middleware, passing every call through unchanged.
+
+    Subclasses override ``handle`` for sync calls and ``ahandle`` for async
+    calls, calling ``call_next(call)`` to continue down the chain.
+    """
+
+    def handle(self, call: ToolCall, call_next: Handler) -> Any:
+        return call_next(call)
+
+    async def ahandle(self, call: ToolCall, call_next: AsyncHandler) -> Any:
+        return await call_next(call)
+
+
+class MiddlewarePipeline:
+    """An ordered middleware chain, with extra middleware per method.
+
+    ``middleware`` wraps every call, outermost first. Middleware listed in
+    ``per_method`` for a method runs inside it, for that method only.
+    """
+
+    def __init__(
+        self,
+        middleware: Optional[Sequence[Middleware]] = None,
+        per_method: Optional[Mapping[str, Sequence[Middleware]]] = None,
+    ):
+        self.middleware: List[Middleware] = list(middleware or [])
+        self.per_method: Dict[str, List[Middleware]] = {
+            method: list(chain) for method, chain in (per_method or {}).items()
+        }
+
+    def extended(self, *middleware: Middleware) -> MiddlewarePipeline:
+        """A copy of this pipeline with ``middleware`` added innermost."""
+        return MiddlewarePipeline(
+            self.middleware + list(middleware), self.per_method
+        )
+
+    def chain(self, method: str) -> List[Middleware]:
+        """The middleware a call to ``method`` runs through, in order."""
+        return self.middleware + self.per_method.get(method, [])
+
+    def run(
+        self,
+        method: str,
+        args: Tuple,
+        kwargs: Dict[str, Any],
+        context: Mapping[str, Any],
+        handler: Handler,
+    ) -> Any:
+        """Run a sync call through the chain, ending with ``handler``."""
+        call = ToolCall(method, args, kwargs, context)
+        call_next = handler
+        for middleware in reversed(self.chain(method)):
+            call_next = partial(middleware.handle, call_next=call_next)
+        try:
+            return call_next(call)
+        finally:
+            call.elapsed = time.perf_counter() - call.started
+
+    async def arun(
+        self,
+        method: str,
+        args: Tuple,
+        kwargs: Dict[str, Any],
+        context: Mapping[str, Any],
+        handler: AsyncHandler,
+    ) -> Any:
+        """Run an async call through the chain, ending with ``handler``."""
+        call = ToolCall(method, args, kwargs, context)
+        call_next = handler
+        for middleware in reversed(self.chain(method)):
+            call_next = partial(middleware.ahandle, call_next=call_next)
+        try:
+            return await call_next(call)
+        finally:
+            call.elapsed = time.perf_counter() - call.started
+
+
+class MethodMetrics:
+    """Call counts and timings of one method."""
+
+    __slots__ = ("calls", "errors", "total_time", "max_time")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_time": self.total_time,
+            "mean_time": self.mean_time,
+            "max_time": self.max_time,
+        }
+
+
+class MetricsMiddleware(Middleware):
+    """Records calls, errors and wall time per method."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, MethodMetrics] = {}
+
+    def _record(self, call: ToolCall, failed: bool):
+        elapsed = time.perf_counter() - call.started
+        with self._lock:
+            metrics = self._metrics.setdefault(call.method, MethodMetrics())
+            metrics.calls += 1
+            metrics.errors += failed
+            metrics.total_time += elapsed
+            metrics.max_time = max(metrics.max_time, elapsed)
+
+    def handle(self, call: ToolCall, call_next: Handler) -> Any:
+        try:
+            result = call_next(call)
+        except Exception:
+            self._record(call, True)
+            raise
+        self._record(call, False)
+        return result
+
+    async def ahandle(self, call: ToolCall, call_next: AsyncHandler) -> Any:
+        try:
+            result = await call_next(call)
+        except Exception:
+            self._record(call, True)
+            raise
+        self._record(call, False)
+        return result
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """The metrics recorded so far, per method."""
+        with self._lock:
+            return {
+                method: metrics.as_dict()
+                for method, metrics in self._metrics.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
@@ -0,0 +1,175 @@
+"""Background prefetching of read tools."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from pydantic import BaseModel
+
+from .memo import READ_ONLY_METHODS
+from .middleware import AsyncHandler, Handler, Middleware, ToolCall
+
+# The read tools worth warming: the catalog and the balance.
+PREFETCH_METHODS = ("list_products", "list_prices", "retrieve_balance")
+
+
+def _writes(method: str, args: Tuple, kwargs: Dict[str, Any]) -> bool:
+    """Whether a call may change Stripe data.
+
+    A batch writes only when one of its operations does. Operations that
+    can't be read are taken to write.
+    """
+    if method != "batch":
+        return method not in READ_ONLY_METHODS
+    operations = kwargs.get("operations", args[0] if args else None)
+    if not isinstance(operations, (list, tuple)):
+        return True
+    for operation in operations:
+        if isinstance(operation, BaseModel):
+            operation = operation.model_dump()
+        if not isinstance(operation, dict):
+            return True
+        operation_args = operation.get("args") or {}
+        if not isinstance(operation_args, dict) or _writes(
+            operation.get("method"), (), operation_args
+        ):
+            return True
+    return False
+
+
+class Prefetcher(Middleware):
+    """Warms read tools on background threads and serves their results.
+
+    ``start`` fetches each allowed method of ``PREFETCH_METHODS`` without
+    arguments. A tool call making the same call is answered from the
+    prefetch: it waits on one still in flight until ``deadline`` seconds
+    after the prefetch started, rather than calling Stripe again. Results
+    are served for ``max_age`` seconds, and any write discards them.
+    """
+
+    def __init__(self, deadline: float = 5.0, max_age: float = 60.0):
+        self.deadline = deadline
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Method: (future, start time, completion time).
+        self._entries: Dict[str, Tuple[Future, float, Optional[float]]] = {}
+
+    def start(
+        self, run: Callable[..., str], methods: Iterable[str]
+    ) -> Dict[str, Future]:
+        """
+        Start prefetching the allowed read tools.
+
+        Parameters:
+            run (callable): Runs a tool call, as ``StripeAPI.run``.
+            methods (iterable[str]): The methods the toolkit allows.
+
+        Returns:
+            dict: The future result of each prefetched method.
+        """
+        allowed = set(methods)
+        futures = {}
+        for method in PREFETCH_METHODS:
+            if method not in allowed:
+                continue
+            future: Future = Future()
+            # Running futures can't be cancelled by a caller timing out.
+            future.set_running_or_notify_cancel()
+            with self._lock:
+                self._entries[method] = (future, time.monotonic(), None)
+            future.add_done_callback(
+                lambda done, method=method: self._completed(method, done)
+            )
+            threading.Thread(
+                target=self._fetch,
+                args=(run, method, future),
+                name=f"stripe-prefetch-{method}",
+                daemon=True,
+            ).start()
+            futures[method] = future
+        return futures
+
+    def _fetch(self, run: Callable[..., str], method: str, future: Future):
+        self._local.future = future
+        try:
+            run(method)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        finally:
+            self._local.future = None
+            if not future.done():
+                # Short-circuited by outer middleware before reaching us.
+                future.set_exception(RuntimeError("Prefetch did not run"))
+
+    def _completed(self, method: str, future: Future):
+        with self._lock:
+            entry = self._entries.get(method)
+            if entry is not None and entry[0] is future:
+                self._entries[method] = (future, entry[1], time.monotonic())
+
+    def invalidate(self):
+        """Discard every prefetched result."""
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, call: ToolCall) -> Tuple[Optional[Future], float]:
+        """The prefetch serving ``call`` and how long to wait for it."""
+        if call.args or any(v is not None for v in call.kwargs.values()):
+            return None, 0.0
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(call.method)
+            if entry is None:
+                return None, 0.0
+            future, started, completed = entry
+            if completed is not None and now - completed > self.max_age:
+                del self._entries[call.method]
+                return None, 0.0
+        return future, max(0.0, started + self.deadline - now)
+
+    def _prefetching(self, call: ToolCall, call_next: Handler) -> Any:
+        future = self._local.future
+        try:
+            result = call_next(call)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            raise
+        if not future.done():
+            future.set_result(result)
+        return result
+
+    def handle(self, call: ToolCall, call_next: Handler) -> Any:
+        if getattr(self._local, "future", None) is not None:
+            return self._prefetching(call, call_next)
+        if _writes(call.method, call.args, call.kwargs):
+            self.invalidate()
+
+        future, wait = self._lookup(call)
+        if future is not None:
+            try:
+                return future.result(timeout=wait)
+            except Exception:
+                # Timed out or failed: the call fetches for itself.
+                pass
+        return call_next(call)
+
+    async def ahandle(self, call: ToolCall, call_next: AsyncHandler) -> Any:
+        if _writes(call.method, call.args, call.kwargs):
+            self.invalidate()
+
+        future, wait = self._lookup(call)
+        if future is not None:
+            try:
+                return await asyncio.wait_for(
+                    asyncio.shield(asyncio.wrap_future(future)), wait
+                )
+            except Exception:
+                pass
+        return await call_next(call)
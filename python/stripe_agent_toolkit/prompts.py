@@ -9,7 +9,10 @@ It takes two arguments:
 LIST_CUSTOMERS_PROMPT = """
 This tool will fetch a list of Customers from Stripe.
 
-It takes no input.
+It takes three optional arguments:
+- email (str, optional): The email address of the customer.
+- limit (int, optional): The number of customers to return.
+- starting_after (str, optional): The ID of the customer to list after.
 """
 
 CREATE_PRODUCT_PROMPT = """
@@ -23,8 +26,9 @@ It takes two arguments:
 LIST_PRODUCTS_PROMPT = """
 This tool will fetch a list of Products from Stripe.
 
-It takes one optional argument:
+It takes two optional arguments:
 - limit (int, optional): The number of products to return.
+- starting_after (str, optional): The ID of the product to list after.
 """
 
 CREATE_PRICE_PROMPT = """
@@ -40,9 +44,10 @@ It takes three arguments:
 LIST_PRICES_PROMPT = """
 This tool will fetch a list of Prices from Stripe.
 
-It takes two arguments:
+It takes three arguments:
 - product (str, optional): The ID of the product to list prices for.
 - limit (int, optional): The number of prices to return.
+- starting_after (str, optional): The ID of the price to list after.
 """
 
 CREATE_PAYMENT_LINK_PROMPT = """
@@ -87,3 +92,52 @@ It takes three arguments:
 - amount (int, optional): The amount to refund in cents.
 - reason (str, optional): The reason for the refund.
 """
+
+BATCH_PROMPT = """
+This tool will run several Stripe operations in one call. Use it instead of
+calling the same or independent tools many times in a row.
+
+It takes two arguments:
+- operations (list): The operations to run, at most 50. Each has:
+  - method (str): The name of the tool to run, such as create_price.
+  - args (dict): The arguments of that tool. A value of the form
+    "$<id>.<field>", such as "$product.id", is replaced by that field of the
+    result of the operation with that ID.
+  - id (str, optional): An ID to reference this operation by.
+  - depends_on (list, optional): The IDs of operations that must run first.
+- sequential (bool, optional): Run the operations one by one in order.
+
+Independent operations run concurrently. The results come back in the
+order given, each with either a result or an error.
+"""
+
+# Compact descriptions, used instead of the prompts above in compact mode.
+# Optional arguments are marked with "?" and amounts are in cents.
+COMPACT_PROMPTS = {
+    "create_customer": "Create a customer. Args: name, email?",
+    "list_customers": "List customers. Args: email?, limit?, starting_after?",
+    "create_product": "Create a product. Args: name, description?",
+    "list_products": "List products. Args: limit?, starting_after?",
+    "create_price": (
+        "Create a price. Args: product (ID; create one first if needed),"
+        " unit_amount (cents), currency"
+    ),
+    "list_prices": "List prices. Args: product?, limit?, starting_after?",
+    "create_payment_link": "Create a payment link. Args: price (ID), quantity",
+    "create_invoice": "Create an invoice. Args: customer (ID)",
+    "create_invoice_item": (
+        "Create an invoice item."
+        " Args: customer (ID), price (ID), invoice (ID)"
+    ),
+    "finalize_invoice": "Finalize an invoice. Args: invoice (ID)",
+    "retrieve_balance": "Retrieve the balance. No args.",
+    "create_refund": (
+        "Refund a payment intent. Args: payment_intent (ID), amount?"
+        " (cents), reason?"
+    ),
+    "batch": (
+        "Run up to 50 operations in one call, independent ones concurrently."
+        " Args: operations [{method, args, id?, depends_on?}], sequential?."
+        ' An arg "$<id>.<field>" takes that field of operation <id>\'s result.'
+    ),
+}
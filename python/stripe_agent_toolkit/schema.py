@@ -1,8 +1,41 @@
-from typing import Optional
-from pydantic import BaseModel, Field
-
-
-class CreateCustomer(BaseModel):
+import inspect
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ToolSchema(BaseModel):
+    """Base of the tool schemas.
+
+    Building a model's validator is deferred to its first use, so importing
+    the tools only builds the schemas of the tools an agent actually calls.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any):
+        super().__pydantic_init_subclass__(**kwargs)
+        # Pydantic gives a deferred model its signature only once built,
+        # while LangChain reads the tool arguments from it.
+        cls.__signature__ = inspect.Signature(
+            [
+                inspect.Parameter(
+                    name,
+                    inspect.Parameter.KEYWORD_ONLY,
+                    annotation=field.annotation,
+                    default=(
+                        inspect.Parameter.empty
+                        if field.is_required()
+                        else field.get_default(call_default_factory=True)
+                    ),
+                )
+                for name, field in cls.model_fields.items()
+            ],
+            return_annotation=None,
+        )
+
+
+class CreateCustomer(ToolSchema):
     """Schema for the ``create_customer`` operation."""
 
     name: str = Field(
@@ -16,7 +49,7 @@ class CreateCustomer(BaseModel):
     )
 
 
-class ListCustomers(BaseModel):
+class ListCustomers(ToolSchema):
     """Schema for the ``list_customers`` operation."""
 
     limit: Optional[int] = Field(
@@ -35,8 +68,16 @@ class ListCustomers(BaseModel):
         ),
     )
 
+    starting_after: Optional[str] = Field(
+        None,
+        description=(
+            "A cursor for pagination: the ID of the object to list after,"
+            " as returned by a truncated result."
+        ),
+    )
+
 
-class CreateProduct(BaseModel):
+class CreateProduct(ToolSchema):
     """Schema for the ``create_product`` operation."""
 
     name: str = Field(
@@ -49,7 +90,7 @@ class CreateProduct(BaseModel):
     )
 
 
-class ListProducts(BaseModel):
+class ListProducts(ToolSchema):
     """Schema for the ``list_products`` operation."""
 
     limit: Optional[int] = Field(
@@ -60,8 +101,16 @@ class ListProducts(BaseModel):
         ),
     )
 
+    starting_after: Optional[str] = Field(
+        None,
+        description=(
+            "A cursor for pagination: the ID of the object to list after,"
+            " as returned by a truncated result."
+        ),
+    )
+
 
-class CreatePrice(BaseModel):
+class CreatePrice(ToolSchema):
     """Schema for the ``create_price`` operation."""
 
     product: str = Field(
@@ -77,7 +126,7 @@ class CreatePrice(BaseModel):
     )
 
 
-class ListPrices(BaseModel):
+class ListPrices(ToolSchema):
     """Schema for the ``list_prices`` operation."""
 
     product: Optional[str] = Field(
@@ -92,8 +141,16 @@ class ListPrices(BaseModel):
         ),
     )
 
+    starting_after: Optional[str] = Field(
+        None,
+        description=(
+            "A cursor for pagination: the ID of the object to list after,"
+            " as returned by a truncated result."
+        ),
+    )
+
 
-class CreatePaymentLink(BaseModel):
+class CreatePaymentLink(ToolSchema):
     """Schema for the ``create_payment_link`` operation."""
 
     price: str = Field(
@@ -106,7 +163,7 @@ class CreatePaymentLink(BaseModel):
     )
 
 
-class CreateInvoice(BaseModel):
+class CreateInvoice(ToolSchema):
     """Schema for the ``create_invoice`` operation."""
 
     customer: str = Field(
@@ -119,7 +176,7 @@ class CreateInvoice(BaseModel):
     )
 
 
-class CreateInvoiceItem(BaseModel):
+class CreateInvoiceItem(ToolSchema):
     """Schema for the ``create_invoice_item`` operation."""
 
     customer: str = Field(
@@ -136,7 +193,7 @@ class CreateInvoiceItem(BaseModel):
     )
 
 
-class FinalizeInvoice(BaseModel):
+class FinalizeInvoice(ToolSchema):
     """Schema for the ``finalize_invoice`` operation."""
 
     invoice: str = Field(
@@ -145,13 +202,13 @@ class FinalizeInvoice(BaseModel):
     )
 
 
-class RetrieveBalance(BaseModel):
+class RetrieveBalance(ToolSchema):
     """Schema for the ``retrieve_balance`` operation."""
 
     pass
 
 
-class CreateRefund(BaseModel):
+class CreateRefund(ToolSchema):
     """Schema for the ``create_refund`` operation."""
 
     payment_intent: str = Field(
@@ -162,3 +219,44 @@ class CreateRefund(BaseModel):
         ...,
         description="The amount to refund in cents.",
     )
+
+
+class BatchOperation(ToolSchema):
+    """One operation of a ``batch``."""
+
+    method: str = Field(
+        ...,
+        description="The name of the tool to run, such as create_price.",
+    )
+    args: Dict[str, Any] = Field(
+        {},
+        description=(
+            "The arguments of the tool. A value of the form"
+            " \"$<id>.<field>\" is replaced by that field of the result"
+            " of the operation with that ID."
+        ),
+    )
+    id: Optional[str] = Field(
+        None,
+        description=(
+            "An ID to reference this operation by. Defaults to its"
+            " position in the list."
+        ),
+    )
+    depends_on: Optional[List[str]] = Field(
+        None,
+        description="The IDs of operations that must complete first.",
+    )
+
+
+class Batch(ToolSchema):
+    """Schema for the ``batch`` operation."""
+
+    operations: List[BatchOperation] = Field(
+        ...,
+        description="The operations to run, at most 50.",
+    )
+    sequential: Optional[bool] = Field(
+        False,
+        description="Run the operations one by one in the order given.",
+    )
@@ -0,0 +1,166 @@
+"""Select the tools relevant to a task to keep prompts small.
+
+Usage::
+
+    selector = ToolSelector(toolkit.get_tools(), k=3)
+    tools = selector.select("Refund the last payment of jane@example.com")
+    # Later, when the agent needs a tool that was left out:
+    tools = selector.include("list_customers")
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+# Weights of each part of a tool in its index document. Names and argument
+# names say more about what a tool does than its prose description.
+NAME_WEIGHT = 3
+FIELD_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from in is it of on or that the this to"
+    " tool will with it takes argument arguments optional str int".split()
+)
+
+# Words users say for what the tools call something else.
+SYNONYMS = {
+    "find": "list",
+    "search": "list",
+    "show": "list",
+    "get": "retrieve",
+    "add": "create",
+    "new": "create",
+    "make": "create",
+    "bill": "invoice",
+    "charge": "payment",
+}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stop words dropped and plurals folded."""
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in STOP_WORDS:
+            continue
+        if len(token) > 3 and token.endswith("ies"):
+            token = token[:-3] + "y"
+        elif len(token) > 3 and token[-1] == "s" and token[-2] != "s":
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _attribute(tool: Any, key: str) -> Any:
+    if isinstance(tool, dict):
+        return tool.get(key)
+    return getattr(tool, key, None)
+
+
+def _document(tool: Any) -> List[str]:
+    method = _attribute(tool, "method") or ""
+    name = _attribute(tool, "name") or ""
+    tokens = tokenize(f"{method} {name}".replace("_", " ")) * NAME_WEIGHT
+
+    schema = _attribute(tool, "args_schema")
+    for field, info in getattr(schema, "model_fields", {}).items():
+        tokens += tokenize(field.replace("_", " ")) * FIELD_WEIGHT
+        tokens += tokenize(info.description or "")
+
+    tokens += tokenize(_attribute(tool, "description") or "") * (
+        DESCRIPTION_WEIGHT
+    )
+    return tokens
+
+
+class ToolIndex:
+    """BM25 index over tool names, descriptions and schema fields."""
+
+    def __init__(self, tools: Iterable[Any], k1: float = 1.2, b: float = 0.75):
+        self.tools = list(tools)
+        self.k1 = k1
+        self.b = b
+        self._terms: List[Counter] = [
+            Counter(_document(tool)) for tool in self.tools
+        ]
+        self._lengths = [sum(terms.values()) for terms in self._terms]
+        self._average = (
+            sum(self._lengths) / len(self._lengths) if self._lengths else 0.0
+        )
+        frequencies: Counter = Counter()
+        for terms in self._terms:
+            frequencies.update(terms.keys())
+        count = len(self.tools)
+        self._idf: Dict[str, float] = {
+            term: math.log(1 + (count - n + 0.5) / (n + 0.5))
+            for term, n in frequencies.items()
+        }
+
+    def scores(self, query: str) -> List[float]:
+        """The BM25 score of every tool for ``query``."""
+        terms = [
+            term
+            for token in tokenize(query)
+            for term in (token, SYNONYMS.get(token))
+            if term in self._idf
+        ]
+        scores = []
+        for document, length in zip(self._terms, self._lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / self._average)
+            for term in terms:
+                frequency = document.get(term, 0)
+                if frequency:
+                    score += self._idf[term] * (
+                        frequency * (self.k1 + 1) / (frequency + norm)
+                    )
+            scores.append(score)
+        return scores
+
+
+class ToolSelector:
+    """Exposes the ``k`` tools most relevant to a task, and more on demand.
+
+    Tools are ranked against the task with a lexical index built once for
+    the toolkit's tools. When nothing in the task matches, every tool is
+    exposed rather than none.
+    """
+
+    def __init__(self, tools: Iterable[Any], k: int = 4):
+        self.index = ToolIndex(tools)
+        self.k = k
+        self._selected: List[Any] = []
+        self._included: List[Any] = []
+
+    @property
+    def tools(self) -> List[Any]:
+        """The tools currently exposed."""
+        return self._selected + [
+            tool for tool in self._included if tool not in self._selected
+        ]
+
+    def rank(self, task: str) -> List[Any]:
+        """Every tool matching ``task``, best first."""
+        scores = self.index.scores(task)
+        order = sorted(range(len(scores)), key=lambda i: (-scores[i], i))
+        return [self.index.tools[i] for i in order if scores[i] > 0]
+
+    def select(self, task: str, k: Optional[int] = None) -> List[Any]:
+        """Expose the top ``k`` tools for a new task."""
+        ranked = self.rank(task)
+        self._selected = (
+            ranked[: k or self.k] if ranked else list(self.index.tools)
+        )
+        self._included = []
+        return self.tools
+
+    def include(self, *methods: str) -> List[Any]:
+        """Add tools back by method name, on demand."""
+        exposed = self.tools
+        for tool in self.index.tools:
+            if _attribute(tool, "method") in methods and tool not in exposed:
+                self._included.append(tool)
+        return self.tools
@@ -13,6 +13,7 @@ from .prompts import (
     FINALIZE_INVOICE_PROMPT,
     RETRIEVE_BALANCE_PROMPT,
     CREATE_REFUND_PROMPT,
+    BATCH_PROMPT,
 )
 
 from .schema import (
@@ -28,6 +29,7 @@ from .schema import (
     FinalizeInvoice,
     RetrieveBalance,
     CreateRefund,
+    Batch,
 )
 
 tools: List[Dict] = [
@@ -163,4 +165,12 @@ tools: List[Dict] = [
             }
         },
     },
+    {
+        "method": "batch",
+        "name": "Batch",
+        "description": BATCH_PROMPT,
+        "args_schema": Batch,
+        # Each operation is checked against the configured actions instead.
+        "actions": {},
+    },
 ]
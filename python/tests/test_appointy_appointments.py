@@ -0,0 +1,108 @@
+import json
+import unittest
+from unittest import mock
+
+from appointy_agent_toolkit.api import AppointyAPI
+from appointy_agent_toolkit.functions import (
+    iter_appointments,
+    list_appointments,
+)
+from appointy_agent_toolkit.testing import appointment, page
+
+CONTEXT = {"api_base_url": "https://appointy.test", "api_key": "key"}
+
+
+class TestListAppointments(unittest.TestCase):
+    def test_iter_appointments_follows_cursor(self):
+        with mock.patch("requests.get") as mock_get:
+            mock_get.side_effect = [
+                page(appointment("apt_1"), next_cursor="c1"),
+                page(appointment("apt_2")),
+            ]
+
+            result = list(
+                iter_appointments(
+                    CONTEXT,
+                    from_date="2024-01-01",
+                    customer_email="jane@example.com",
+                    page_size=1,
+                )
+            )
+
+            self.assertEqual([a.id for a in result], ["apt_1", "apt_2"])
+            self.assertEqual(
+                mock_get.call_args.kwargs["params"],
+                {
+                    "limit": 1,
+                    "from_date": "2024-01-01",
+                    "customer_email": "jane@example.com",
+                    "cursor": "c1",
+                },
+            )
+
+    def test_iter_appointments_is_lazy(self):
+        with mock.patch("requests.get") as mock_get:
+            mock_get.side_effect = [
+                page(appointment("apt_1"), next_cursor="c1"),
+                page(appointment("apt_2")),
+            ]
+
+            appointments = iter_appointments(CONTEXT)
+            self.assertEqual(next(appointments).id, "apt_1")
+            self.assertEqual(mock_get.call_count, 1)
+
+    def test_list_appointments_default_window_and_limit(self):
+        with mock.patch("requests.get") as mock_get:
+            mock_get.side_effect = [
+                page(appointment("apt_1"), appointment("apt_2"), next_cursor="c1"),
+            ]
+
+            result = list_appointments(CONTEXT, limit=2)
+
+            self.assertEqual([a.id for a in result], ["apt_1", "apt_2"])
+            mock_get.assert_called_once()
+            params = mock_get.call_args.kwargs["params"]
+            self.assertIn("from_date", params)
+            self.assertIn("to_date", params)
+            self.assertEqual(params["limit"], 2)
+
+    def test_list_appointments_bare_list_response(self):
+        with mock.patch("requests.get") as mock_get:
+            mock_get.return_value.content = json.dumps(
+                [appointment("apt_1")]
+            ).encode("utf-8")
+
+            result = list_appointments(CONTEXT, from_date="2024-01-01")
+
+            self.assertEqual([a.id for a in result], ["apt_1"])
+
+
+class TestAppointyAPI(unittest.TestCase):
+    def test_run_serializes_appointments(self):
+        api = AppointyAPI(api_key="key", context=dict(CONTEXT))
+
+        with mock.patch("requests.get") as mock_get:
+            mock_get.side_effect = [page(appointment("apt_1"))]
+
+            result = api.run("list_appointments", from_date="2024-01-01")
+
+        self.assertEqual(
+            json.loads(result),
+            [{**appointment("apt_1"), "employee_id": None, "updated_at": None}],
+        )
+
+    def test_run_serializes_appointment(self):
+        api = AppointyAPI(api_key="key", context=dict(CONTEXT))
+
+        with mock.patch("requests.put") as mock_put:
+            mock_put.return_value.json.return_value = appointment("apt_1")
+
+            result = api.run(
+                "update_appointment", appointment_id="apt_1", title="Haircut"
+            )
+
+        self.assertEqual(json.loads(result)["id"], "apt_1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,275 @@
+import json
+import unittest
+from datetime import date, datetime, timezone
+from unittest import mock
+
+import httpx
+
+from appointy_agent_toolkit.api import AppointyAPI
+from appointy_agent_toolkit.async_client import AsyncAppointyClient
+from appointy_agent_toolkit.cache import (
+    availability_cache,
+    availability_key,
+)
+from appointy_agent_toolkit.conflicts import appointment_index
+from appointy_agent_toolkit.store import AppointmentStore
+from appointy_agent_toolkit.testing import slots_response
+
+CONTEXT = {
+    "api_base_url": "https://appointy.test",
+    "api_key": "key",
+    "business_id": "group/company/location",
+}
+
+
+class TestAsyncAppointyClient(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        availability_cache.clear()
+        appointment_index.clear()
+        self.requests = []
+
+    def make_client(self, handler):
+        def record(request):
+            self.requests.append(request)
+            return handler(request)
+
+        return AsyncAppointyClient(
+            CONTEXT,
+            http_client=httpx.AsyncClient(
+                base_url=CONTEXT["api_base_url"],
+                transport=httpx.MockTransport(record),
+            ),
+        )
+
+    async def test_create_appointment(self):
+        def handler(request):
+            body = json.loads(request.content)
+            return httpx.Response(200, json={"id": "apt_1", **body})
+
+        async with self.make_client(handler) as client:
+            appointment = await client.create_appointment(
+                title="Haircut",
+                start_time="2099-01-01T09:00:00Z",
+                end_time="2099-01-01T09:30:00Z",
+                customer_name="Jane",
+                customer_email="jane@example.com",
+                employee_id="emp_1",
+            )
+
+        self.assertEqual(appointment.id, "apt_1")
+        self.assertEqual(self.requests[0].url.path, "/appointments")
+        self.assertIsNotNone(appointment_index.get("apt_1"))
+
+    async def test_update_invalidates_the_days_it_leaves(self):
+        key = availability_key(CONTEXT["business_id"], {})
+        other = availability_key("other/business", {})
+        for day in (date(2099, 1, 2), date(2099, 1, 5)):
+            availability_cache.store("slots", key, {day: []})
+            availability_cache.store("slots", other, {day: []})
+        appointment_index.add(
+            CONTEXT["business_id"],
+            "emp_1",
+            "apt_1",
+            datetime(2099, 1, 2, 9, tzinfo=timezone.utc),
+            datetime(2099, 1, 2, 10, tzinfo=timezone.utc),
+        )
+
+        def handler(request):
+            return httpx.Response(
+                200,
+                json={
+                    "id": "apt_1",
+                    "title": "Haircut",
+                    "start_time": "2099-01-05T09:00:00Z",
+                    "end_time": "2099-01-05T10:00:00Z",
+                    "customer_name": "Jane",
+                    "customer_email": "jane@example.com",
+                    "employee_id": "emp_1",
+                },
+            )
+
+        async with self.make_client(handler) as client:
+            await client.update_appointment(
+                "apt_1",
+                start_time="2099-01-05T09:00:00Z",
+                end_time="2099-01-05T10:00:00Z",
+            )
+
+        days = [date(2099, 1, 2), date(2099, 1, 5)]
+        _, missing = availability_cache.lookup("slots", key, days)
+        self.assertEqual(missing, days)
+        # Other businesses keep their cached days.
+        _, missing = availability_cache.lookup("slots", other, days)
+        self.assertEqual(missing, [])
+
+    async def test_find_earliest_slots(self):
+        def handler(request):
+            variables = json.loads(request.content)["variables"]["filter"]
+            service = variables["services"][0]
+            hour = {"svc_1": "11", "svc_2": "09"}[service]
+            return httpx.Response(
+                200,
+                json=slots_response(
+                    (f"2099-01-01T{hour}:00:00Z", f"2099-01-01T{hour}:30:00Z")
+                ),
+            )
+
+        async with self.make_client(handler) as client:
+            slots = await client.find_earliest_slots(
+                ["svc_1", "svc_2"], [], "2099-01-01", "2099-01-03", limit=2
+            )
+
+        self.assertEqual(
+            [slot["service_id"] for slot in slots], ["svc_2", "svc_1"]
+        )
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_get_available_slots_requires_business(self):
+        client = AsyncAppointyClient({"api_base_url": "https://appointy.test"})
+        with self.assertRaises(ValueError):
+            await client.get_available_slots({}, "2099-01-01", "2099-01-02")
+        await client.aclose()
+
+
+class TestAppointyAPIAsync(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        availability_cache.clear()
+        self.requests = []
+
+    def make_api(self, handler, **kwargs):
+        def record(request):
+            self.requests.append(request)
+            return handler(request)
+
+        self.async_client = AsyncAppointyClient(
+            CONTEXT,
+            http_client=httpx.AsyncClient(
+                base_url=CONTEXT["api_base_url"],
+                transport=httpx.MockTransport(record),
+            ),
+        )
+        return AppointyAPI(
+            api_key="key",
+            context=dict(CONTEXT),
+            async_client=self.async_client,
+            **kwargs,
+        )
+
+    async def asyncTearDown(self):
+        await self.async_client.aclose()
+
+    async def test_availability_runs_on_the_async_client(self):
+        api = self.make_api(
+            lambda request: httpx.Response(
+                200,
+                json=slots_response(
+                    ("2099-01-01T09:00:00Z", "2099-01-01T09:30:00Z")
+                ),
+            )
+        )
+
+        slots = await api.arun(
+            "get_available_slots",
+            filters={},
+            from_date="2099-01-01",
+            to_date="2099-01-01",
+        )
+
+        self.assertEqual(
+            json.loads(slots),
+            ["2099-01-01T09:00:00Z - 2099-01-01T09:30:00Z"],
+        )
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_conflict_is_answered_as_json(self):
+        appointment_index.clear()
+        self.addCleanup(appointment_index.clear)
+        appointment_index.add(
+            CONTEXT["business_id"],
+            "emp_1",
+            "apt_1",
+            datetime(2099, 1, 1, 9, tzinfo=timezone.utc),
+            datetime(2099, 1, 1, 10, tzinfo=timezone.utc),
+        )
+        api = self.make_api(lambda request: httpx.Response(500))
+
+        result = await api.arun(
+            "create_appointment",
+            title="Haircut",
+            start_time="2099-01-01T09:30:00Z",
+            end_time="2099-01-01T10:00:00Z",
+            customer_name="Jane",
+            customer_email="jane@example.com",
+            employee_id="emp_1",
+        )
+
+        self.assertEqual(
+            json.loads(result)["conflict"]["appointments"], ["apt_1"]
+        )
+        self.assertEqual(self.requests, [])
+
+    async def test_methods_without_async_version_run_in_a_thread(self):
+        api = self.make_api(lambda request: httpx.Response(500))
+
+        with mock.patch(
+            "appointy_agent_toolkit.api.list_services",
+            return_value=[{"id": "svc_1"}],
+        ), mock.patch(
+            "appointy_agent_toolkit.api.find_next_available_slots",
+            return_value=["2099-01-01T09:00:00Z - 2099-01-01T09:30:00Z"],
+        ):
+            services = await api.arun("list_services")
+            slots = await api.arun(
+                "find_next_available_slots", filters={}, count=1
+            )
+
+        self.assertEqual(json.loads(services), [{"id": "svc_1"}])
+        self.assertEqual(len(json.loads(slots)), 1)
+        self.assertEqual(self.requests, [])
+
+    async def test_reuses_one_client_per_event_loop(self):
+        def record(request):
+            self.requests.append(request)
+            return httpx.Response(200, json=slots_response())
+
+        self.async_client = AsyncAppointyClient(
+            CONTEXT,
+            http_client=httpx.AsyncClient(
+                base_url=CONTEXT["api_base_url"],
+                transport=httpx.MockTransport(record),
+            ),
+        )
+        api = AppointyAPI(api_key="key", context=dict(CONTEXT))
+
+        with mock.patch(
+            "appointy_agent_toolkit.api.AsyncAppointyClient",
+            return_value=self.async_client,
+        ) as factory:
+            for day in ("2099-01-01", "2099-01-02"):
+                await api.arun(
+                    "get_available_slots",
+                    filters={},
+                    from_date=day,
+                    to_date=day,
+                )
+
+        factory.assert_called_once()
+        self.assertEqual(len(self.requests), 2)
+        await api.aclose()
+        self.assertTrue(self.async_client._http.is_closed)
+
+    async def test_list_appointments_uses_the_store(self):
+        store = AppointmentStore()
+        api = self.make_api(lambda request: httpx.Response(500), store=store)
+
+        result = await api.arun(
+            "list_appointments", from_date="2099-01-01", to_date="2099-01-02"
+        )
+
+        self.assertEqual(json.loads(result), [])
+        self.assertEqual(self.requests, [])
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,258 @@
+import unittest
+from datetime import date
+from unittest import mock
+
+from appointy_agent_toolkit.cache import AvailabilityCache, availability_cache
+from appointy_agent_toolkit.functions import (
+    create_appointment,
+    find_next_available_slots,
+    get_available_dates,
+    get_available_dates_and_slots,
+    get_available_slots,
+    stream_available_slots,
+)
+from appointy_agent_toolkit.testing import (
+    dates_response,
+    make_client,
+    slots_response,
+)
+
+
+class TestAvailabilityCache(unittest.TestCase):
+    def test_lookup_expires_entries(self):
+        now = [0.0]
+        cache = AvailabilityCache(ttl=10, clock=lambda: now[0])
+        cache.store("slots", "key", {date(2024, 1, 1): ["a"]})
+
+        hits, missing = cache.lookup("slots", "key", [date(2024, 1, 1)])
+        self.assertEqual(hits, {date(2024, 1, 1): ["a"]})
+        self.assertEqual(missing, [])
+
+        now[0] = 11
+        hits, missing = cache.lookup("slots", "key", [date(2024, 1, 1)])
+        self.assertEqual(hits, {})
+        self.assertEqual(missing, [date(2024, 1, 1)])
+
+
+class TestAvailabilityFunctions(unittest.TestCase):
+    def setUp(self):
+        availability_cache.clear()
+
+    def test_get_available_slots_fetches_missing_days_only(self):
+        client = make_client()
+        client._make_request.return_value = slots_response(
+            ("2024-01-01T09:00:00Z", "2024-01-01T09:30:00Z"),
+            ("2024-01-02T10:00:00Z", "2024-01-02T10:30:00Z"),
+        )
+        filters = {"services": ["svc_1"]}
+
+        result = get_available_slots(
+            client, filters, "2024-01-01", "2024-01-02"
+        )
+        self.assertEqual(
+            result,
+            [
+                "2024-01-01T09:00:00Z - 2024-01-01T09:30:00Z",
+                "2024-01-02T10:00:00Z - 2024-01-02T10:30:00Z",
+            ],
+        )
+
+        client._make_request.return_value = slots_response(
+            ("2024-01-03T11:00:00Z", "2024-01-03T11:30:00Z"),
+        )
+        result = get_available_slots(
+            client, filters, "2024-01-02T00:00:00Z", "2024-01-03"
+        )
+        self.assertEqual(
+            result,
+            [
+                "2024-01-02T10:00:00Z - 2024-01-02T10:30:00Z",
+                "2024-01-03T11:00:00Z - 2024-01-03T11:30:00Z",
+            ],
+        )
+
+        self.assertEqual(client._make_request.call_count, 2)
+        time_slot = client._make_request.call_args.kwargs["json_data"][
+            "variables"
+        ]["filter"]["timeSlot"]
+        self.assertEqual(
+            time_slot,
+            {
+                "startTime": "2024-01-03T00:00:00Z",
+                "endTime": "2024-01-04T00:00:00Z",
+            },
+        )
+
+    def test_get_available_slots_filters_partial_day(self):
+        client = make_client()
+        client._make_request.return_value = slots_response(
+            ("2024-01-01T09:00:00Z", "2024-01-01T09:30:00Z"),
+            ("2024-01-01T15:00:00Z", "2024-01-01T15:30:00Z"),
+        )
+
+        result = get_available_slots(
+            client, {}, "2024-01-01T12:00:00Z", "2024-01-01T18:00:00Z"
+        )
+
+        self.assertEqual(
+            result, ["2024-01-01T15:00:00Z - 2024-01-01T15:30:00Z"]
+        )
+
+    def test_stream_available_slots_splits_windows(self):
+        def fake_request(method, path, json_data):
+            time_slot = json_data["variables"]["filter"]["timeSlot"]
+            # Every window also returns the slot straddling its start.
+            return slots_response(
+                ("2024-01-07T23:45:00Z", "2024-01-08T00:15:00Z"),
+                (
+                    time_slot["startTime"].replace("T00:", "T09:"),
+                    time_slot["startTime"].replace("T00:", "T10:"),
+                ),
+            )
+
+        client = make_client()
+        client._make_request.side_effect = fake_request
+
+        result = list(
+            stream_available_slots(
+                client,
+                {},
+                "2024-01-01",
+                "2024-01-14",
+                window_days=7,
+                max_workers=2,
+            )
+        )
+
+        self.assertEqual(
+            result,
+            [
+                "2024-01-01T09:00:00Z - 2024-01-01T10:00:00Z",
+                "2024-01-07T23:45:00Z - 2024-01-08T00:15:00Z",
+                "2024-01-08T09:00:00Z - 2024-01-08T10:00:00Z",
+            ],
+        )
+        self.assertEqual(client._make_request.call_count, 2)
+
+    def test_get_available_dates_uses_cache(self):
+        client = make_client()
+        client._make_request.return_value = dates_response(
+            "2024-01-01", "2024-01-03"
+        )
+
+        first = get_available_dates(client, {}, "2024-01-01", "2024-01-03")
+        second = get_available_dates(client, {}, "2024-01-02", "2024-01-03")
+
+        self.assertEqual(first, ["2024-01-01", "2024-01-03"])
+        self.assertEqual(second, ["2024-01-03"])
+        self.assertEqual(client._make_request.call_count, 1)
+
+    def test_get_available_dates_and_slots_batches_queries(self):
+        client = make_client()
+        client._make_request.return_value = [
+            dates_response("2024-01-02"),
+            slots_response(("2024-01-02T09:00:00Z", "2024-01-02T09:30:00Z")),
+        ]
+
+        result = get_available_dates_and_slots(
+            client, {}, "2024-01-01", "2024-01-07", slots_date="2024-01-02"
+        )
+
+        self.assertEqual(
+            result,
+            {
+                "dates": ["2024-01-02"],
+                "slots": ["2024-01-02T09:00:00Z - 2024-01-02T09:30:00Z"],
+            },
+        )
+        client._make_request.assert_called_once()
+        payloads = client._make_request.call_args.kwargs["json_data"]
+        self.assertEqual(len(payloads), 2)
+
+        # Both parts are now cached, so a repeat needs no round trip.
+        get_available_slots(client, {}, "2024-01-02", "2024-01-02")
+        client._make_request.assert_called_once()
+
+    def test_get_available_dates_and_slots_without_batching(self):
+        client = make_client()
+        client._make_request.side_effect = [
+            {"errors": [{"message": "Batching is not supported"}]},
+            dates_response("2024-01-02"),
+            slots_response(),
+        ]
+
+        result = get_available_dates_and_slots(
+            client, {}, "2024-01-01", "2024-01-07"
+        )
+
+        self.assertEqual(result, {"dates": ["2024-01-02"], "slots": []})
+        self.assertEqual(client._make_request.call_count, 3)
+
+    def test_find_next_available_slots_fetches_available_days(self):
+        client = make_client()
+        client._make_request.side_effect = [
+            dates_response("2024-01-02", "2024-01-04"),
+            [
+                slots_response(
+                    ("2024-01-02T09:00:00Z", "2024-01-02T09:15:00Z"),
+                    ("2024-01-02T10:00:00Z", "2024-01-02T11:00:00Z"),
+                ),
+                slots_response(
+                    ("2024-01-04T09:00:00Z", "2024-01-04T10:00:00Z"),
+                ),
+            ],
+        ]
+
+        result = find_next_available_slots(
+            client,
+            {},
+            duration_minutes=30,
+            count=2,
+            from_date="2024-01-01T00:00:00Z",
+        )
+
+        self.assertEqual(
+            result,
+            [
+                "2024-01-02T10:00:00Z - 2024-01-02T11:00:00Z",
+                "2024-01-04T09:00:00Z - 2024-01-04T10:00:00Z",
+            ],
+        )
+        # One dates query, then one batched request for both available days.
+        self.assertEqual(client._make_request.call_count, 2)
+
+    def test_create_appointment_invalidates_day(self):
+        client = make_client()
+        client._make_request.return_value = slots_response(
+            ("2024-01-01T09:00:00Z", "2024-01-01T09:30:00Z"),
+        )
+        get_available_slots(client, {}, "2024-01-01", "2024-01-01")
+
+        context = {"api_base_url": "https://appointy.test", "api_key": "key"}
+        with mock.patch("requests.post") as mock_post:
+            mock_post.return_value.json.return_value = {
+                "id": "apt_1",
+                "title": "Haircut",
+                "start_time": "2024-01-01T09:00:00Z",
+                "end_time": "2024-01-01T09:30:00Z",
+                "customer_name": "Jane",
+                "customer_email": "jane@example.com",
+            }
+            create_appointment(
+                context,
+                title="Haircut",
+                start_time="2024-01-01T09:00:00Z",
+                end_time="2024-01-01T09:30:00Z",
+                customer_name="Jane",
+                customer_email="jane@example.com",
+            )
+
+        client._make_request.return_value = slots_response()
+        result = get_available_slots(client, {}, "2024-01-01", "2024-01-01")
+
+        self.assertEqual(result, [])
+        self.assertEqual(client._make_request.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
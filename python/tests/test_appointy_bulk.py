@@ -0,0 +1,189 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import requests
+
+from appointy_agent_toolkit.bulk import import_appointments, read_rows
+from appointy_agent_toolkit.conflicts import appointment_index
+
+CONTEXT = {
+    "api_base_url": "https://appointy.test",
+    "api_key": "key",
+    "business_id": "group/company/location",
+}
+
+CSV = """title,start_time,end_time,customer_name,customer_email,employee_id
+Haircut,2099-01-01T09:00:00Z,2099-01-01T09:30:00Z,Jane,jane@example.com,emp_1
+Haircut,2099-01-01T09:15:00Z,2099-01-01T09:45:00Z,John,john@example.com,emp_1
+Haircut,not a time,2099-01-01T10:30:00Z,Ann,ann@example.com,emp_1
+Shave,2099-01-01T09:00:00Z,2099-01-01T09:30:00Z,Bob,bob@example.com,emp_2
+"""
+
+
+ROWS = [
+    {
+        "title": name,
+        "start_time": f"2099-01-01T{hour}:00:00Z",
+        "end_time": f"2099-01-01T{hour}:30:00Z",
+        "customer_name": name,
+        "customer_email": f"{name.lower()}@example.com",
+    }
+    for name, hour in [("A", "09"), ("B", "10"), ("C", "11")]
+]
+
+
+def http_error(status_code):
+    return requests.HTTPError(response=mock.Mock(status_code=status_code))
+
+
+def created(url, headers, json):
+    response = mock.Mock()
+    response.json.return_value = {"id": "apt_" + json["customer_name"], **json}
+    return response
+
+
+class TestBulkImport(unittest.TestCase):
+    def setUp(self):
+        appointment_index.clear()
+
+    def test_import_validates_and_checks_conflicts(self):
+        with mock.patch("requests.post") as mock_post:
+            mock_post.side_effect = created
+
+            summary = import_appointments(
+                CONTEXT, read_rows(io.StringIO(CSV), "csv"), concurrency=2
+            )
+
+        self.assertEqual(summary.created, 2)
+        self.assertEqual(summary.conflicts, 1)
+        self.assertEqual(summary.invalid, 1)
+        self.assertEqual([row for row, _ in summary.errors], [2, 3])
+        self.assertEqual(mock_post.call_count, 2)
+
+    def test_read_rows_reads_malformed_lines_as_invalid(self):
+        ndjson = json.dumps(ROWS[0]) + "\n\n{not json\n[1]\n"
+
+        with mock.patch("requests.post") as mock_post:
+            mock_post.side_effect = created
+            summary = import_appointments(
+                CONTEXT, read_rows(io.StringIO(ndjson), "ndjson")
+            )
+
+        self.assertEqual(summary.created, 1)
+        self.assertEqual(summary.invalid, 2)
+        messages = [message for _, message in summary.errors]
+        self.assertTrue(messages[0].startswith("line 3: Invalid JSON"))
+        self.assertEqual(messages[1], "line 4: Not a JSON object")
+
+    def test_import_retries_and_resumes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, "checkpoint.json")
+
+            with mock.patch("requests.post") as mock_post:
+                mock_post.side_effect = [http_error(429), mock.DEFAULT]
+                mock_post.return_value.json.return_value = {
+                    "id": "apt_a",
+                    **ROWS[0],
+                }
+                summary = import_appointments(
+                    CONTEXT, ROWS[:1], backoff=0, checkpoint=checkpoint
+                )
+
+            self.assertEqual(summary.created, 1)
+            self.assertEqual(mock_post.call_count, 2)
+
+            with mock.patch("requests.post") as mock_post:
+                mock_post.side_effect = created
+                summary = import_appointments(
+                    CONTEXT, ROWS[:2], checkpoint=checkpoint
+                )
+
+            self.assertEqual(summary.skipped, 1)
+            self.assertEqual(summary.created, 1)
+            mock_post.assert_called_once()
+            with open(checkpoint) as f:
+                self.assertEqual(
+                    json.load(f),
+                    {"completed": 2, "done": [], "failed": [], "unknown": []},
+                )
+
+    def test_unknown_outcomes_are_not_retried(self):
+        with mock.patch("requests.post") as mock_post:
+            mock_post.side_effect = [
+                http_error(503),
+                requests.ReadTimeout("read timed out"),
+            ]
+            summary = import_appointments(
+                CONTEXT, ROWS[:2], concurrency=1, backoff=0
+            )
+
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(summary.unknown, 2)
+        self.assertEqual(summary.created, 0)
+
+    def test_resume_retries_failed_rows_only(self):
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, "checkpoint.json")
+
+            with mock.patch("requests.post") as mock_post:
+                mock_post.side_effect = [
+                    http_error(400),
+                    requests.ReadTimeout("read timed out"),
+                    mock.DEFAULT,
+                ]
+                mock_post.return_value.json.return_value = {
+                    "id": "apt_c",
+                    **ROWS[2],
+                }
+                summary = import_appointments(
+                    CONTEXT, ROWS, concurrency=1, checkpoint=checkpoint
+                )
+
+            self.assertEqual(summary.failed, 1)
+            self.assertEqual(summary.unknown, 1)
+            self.assertEqual(summary.created, 1)
+            with open(checkpoint) as f:
+                self.assertEqual(
+                    json.load(f),
+                    {"completed": 3, "done": [], "failed": [1], "unknown": [2]},
+                )
+
+            appointment_index.clear()
+            with mock.patch("requests.post") as mock_post:
+                mock_post.side_effect = created
+                summary = import_appointments(
+                    CONTEXT, ROWS, checkpoint=checkpoint
+                )
+
+            self.assertEqual(summary.created, 1)
+            self.assertEqual(summary.skipped, 2)
+            self.assertEqual(
+                mock_post.call_args.kwargs["json"]["customer_name"], "A"
+            )
+            with open(checkpoint) as f:
+                self.assertEqual(json.load(f)["failed"], [])
+
+    def test_checkpoint_is_saved_when_interrupted(self):
+        def rows():
+            yield ROWS[0]
+            raise KeyboardInterrupt
+
+        with tempfile.TemporaryDirectory() as directory:
+            checkpoint = os.path.join(directory, "checkpoint.json")
+
+            with mock.patch("requests.post") as mock_post:
+                mock_post.side_effect = created
+                with self.assertRaises(KeyboardInterrupt):
+                    import_appointments(
+                        CONTEXT, rows(), concurrency=1, checkpoint=checkpoint
+                    )
+
+            with open(checkpoint) as f:
+                self.assertEqual(json.load(f)["completed"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
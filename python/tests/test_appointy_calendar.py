@@ -0,0 +1,171 @@
+import unittest
+from datetime import date, datetime, timezone
+
+from appointy_agent_toolkit.cache import availability_cache
+from appointy_agent_toolkit.calendar import (
+    AvailabilityCalendar,
+    get_common_available_slots,
+)
+from appointy_agent_toolkit.testing import make_client, slots_response
+
+
+class TestAvailabilityCalendar(unittest.TestCase):
+    def test_slots_round_trip(self):
+        slots = [
+            "2024-01-01T09:00:00Z - 2024-01-01T10:00:00Z",
+            "2024-01-01T23:30:00Z - 2024-01-02T00:30:00Z",
+        ]
+
+        calendar = AvailabilityCalendar.from_slots(slots)
+
+        self.assertEqual(calendar.to_slots(), slots)
+        self.assertEqual(calendar.to_dates(), ["2024-01-01", "2024-01-02"])
+        self.assertEqual(calendar.minutes_available(date(2024, 1, 1)), 90)
+        self.assertEqual(calendar.minutes_available(), 120)
+
+    def test_partial_buckets_are_unavailable(self):
+        calendar = AvailabilityCalendar.from_slots(
+            ["2024-01-01T09:10:00Z - 2024-01-01T10:20:00Z"], resolution=15
+        )
+
+        self.assertEqual(
+            calendar.to_slots(),
+            ["2024-01-01T09:15:00Z - 2024-01-01T10:15:00Z"],
+        )
+
+    def test_intersection_and_union(self):
+        first = AvailabilityCalendar.from_slots(
+            ["2024-01-01T09:00:00Z - 2024-01-01T11:00:00Z"]
+        )
+        second = AvailabilityCalendar.from_slots(
+            [
+                "2024-01-01T10:00:00Z - 2024-01-01T12:00:00Z",
+                "2024-01-02T09:00:00Z - 2024-01-02T10:00:00Z",
+            ]
+        )
+
+        self.assertEqual(
+            AvailabilityCalendar.intersection(first, second).to_slots(),
+            ["2024-01-01T10:00:00Z - 2024-01-01T11:00:00Z"],
+        )
+        self.assertEqual(
+            AvailabilityCalendar.union(first, second).to_slots(),
+            [
+                "2024-01-01T09:00:00Z - 2024-01-01T12:00:00Z",
+                "2024-01-02T09:00:00Z - 2024-01-02T10:00:00Z",
+            ],
+        )
+
+    def test_dates_intersect_with_slots(self):
+        dates = AvailabilityCalendar.from_dates(["2024-01-02"])
+        slots = AvailabilityCalendar.from_slots(
+            [
+                "2024-01-01T09:00:00Z - 2024-01-01T10:00:00Z",
+                "2024-01-02T09:00:00Z - 2024-01-02T10:00:00Z",
+            ]
+        )
+
+        self.assertEqual(
+            (dates & slots).to_slots(),
+            ["2024-01-02T09:00:00Z - 2024-01-02T10:00:00Z"],
+        )
+
+    def test_to_slots_keeps_slot_boundaries(self):
+        slots = [
+            "2024-01-01T09:00:00Z - 2024-01-01T09:30:00Z",
+            "2024-01-01T09:30:00Z - 2024-01-01T10:00:00Z",
+            "2024-01-01T10:00:00Z - 2024-01-01T10:30:00Z",
+        ]
+        calendar = AvailabilityCalendar.from_slots(
+            ["2024-01-01T08:00:00Z - 2024-01-01T10:15:00Z"]
+        )
+
+        self.assertEqual(calendar.to_slots(slots), slots[:2])
+        self.assertEqual(
+            AvailabilityCalendar.from_slots(slots).to_slots(slots), slots
+        )
+
+    def test_covers_across_midnight(self):
+        calendar = AvailabilityCalendar.from_slots(
+            ["2024-01-01T23:00:00Z - 2024-01-02T01:00:00Z"], resolution=15
+        )
+
+        self.assertTrue(
+            calendar.covers(
+                datetime(2024, 1, 1, 23, 30, tzinfo=timezone.utc),
+                datetime(2024, 1, 2, 0, 30, tzinfo=timezone.utc),
+            )
+        )
+        self.assertFalse(
+            calendar.covers(
+                datetime(2024, 1, 2, 0, 30, tzinfo=timezone.utc),
+                datetime(2024, 1, 2, 1, 5, tzinfo=timezone.utc),
+            )
+        )
+
+    def test_mismatched_resolution(self):
+        with self.assertRaises(ValueError):
+            AvailabilityCalendar(resolution=1) & AvailabilityCalendar(
+                resolution=5
+            )
+
+
+SLOTS = {
+    "emp_1": [
+        ("2024-01-01T09:00:00Z", "2024-01-01T09:30:00Z"),
+        ("2024-01-01T09:30:00Z", "2024-01-01T10:00:00Z"),
+        ("2024-01-01T10:00:00Z", "2024-01-01T10:30:00Z"),
+    ],
+    "emp_2": [("2024-01-01T08:30:00Z", "2024-01-01T10:00:00Z")],
+}
+
+
+def fake_request(method, path, json_data):
+    variables = json_data["variables"]["filter"]
+    start = variables["timeSlot"]["startTime"]
+    end = variables["timeSlot"]["endTime"]
+    return slots_response(
+        *[
+            slot
+            for slot in SLOTS[variables["employees"][0]]
+            if start <= slot[0] < end
+        ]
+    )
+
+
+class TestCommonAvailableSlots(unittest.TestCase):
+    def setUp(self):
+        availability_cache.clear()
+
+    def test_keeps_slots_of_the_first_filters(self):
+        client = make_client()
+        client._make_request.side_effect = fake_request
+
+        result = get_common_available_slots(
+            client,
+            [
+                {"services": ["svc_1"], "employees": ["emp_1"]},
+                {"services": ["svc_1"], "employees": ["emp_2"]},
+            ],
+            "2024-01-01",
+            "2024-01-01",
+        )
+
+        # Both halves of emp_2's free hour stay separate slots.
+        self.assertEqual(
+            result,
+            [
+                "2024-01-01T09:00:00Z - 2024-01-01T09:30:00Z",
+                "2024-01-01T09:30:00Z - 2024-01-01T10:00:00Z",
+            ],
+        )
+
+    def test_requires_filters(self):
+        with self.assertRaises(ValueError):
+            get_common_available_slots(
+                make_client(), [], "2024-01-01", "2024-01-01"
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
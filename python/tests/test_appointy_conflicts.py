@@ -0,0 +1,222 @@
+import json
+import unittest
+from datetime import date, datetime, timezone
+from unittest import mock
+
+from appointy_agent_toolkit.api import AppointyAPI
+from appointy_agent_toolkit.cache import availability_cache, availability_key
+from appointy_agent_toolkit.conflicts import (
+    AppointmentConflictError,
+    StaffSchedule,
+    appointment_index,
+)
+from appointy_agent_toolkit.functions import (
+    create_appointment,
+    list_appointments,
+    update_appointment,
+)
+
+CONTEXT = {
+    "api_base_url": "https://appointy.test",
+    "api_key": "key",
+    "business_id": "group/company/location",
+}
+
+
+def at(hour, minute=0):
+    return datetime(2099, 1, 1, hour, minute, tzinfo=timezone.utc)
+
+
+def appointment(id, start, end, employee_id="emp_1"):
+    return {
+        "id": id,
+        "title": "Haircut",
+        "start_time": start,
+        "end_time": end,
+        "customer_name": "Jane",
+        "customer_email": "jane@example.com",
+        "employee_id": employee_id,
+    }
+
+
+class TestStaffSchedule(unittest.TestCase):
+    def test_overlapping(self):
+        schedule = StaffSchedule()
+        schedule.add("long", at(8), at(12))
+        schedule.add("short", at(9), at(9, 30))
+        schedule.add("late", at(13), at(14))
+
+        self.assertEqual(schedule.overlapping(at(12), at(13)), [])
+        self.assertEqual(
+            schedule.overlapping(at(9, 15), at(10)), ["long", "short"]
+        )
+        self.assertEqual(schedule.overlapping(at(13, 30), at(15)), ["late"])
+        self.assertEqual(
+            schedule.overlapping(at(13), at(14), exclude_id="late"), []
+        )
+
+        schedule.remove("long")
+        self.assertEqual(schedule.overlapping(at(10), at(11)), [])
+
+    def test_alternatives(self):
+        schedule = StaffSchedule()
+        schedule.add("a", at(9), at(10))
+        schedule.add("b", at(10), at(11))
+        schedule.add("c", at(12), at(13))
+
+        self.assertEqual(
+            schedule.alternatives(at(10), at(11), count=2),
+            [(at(8), at(9)), (at(11), at(12))],
+        )
+
+
+class TestAppointmentConflicts(unittest.TestCase):
+    def setUp(self):
+        appointment_index.clear()
+        availability_cache.clear()
+
+    def load(self, *rows):
+        with mock.patch("requests.get") as mock_get:
+            mock_get.return_value.content = json.dumps(rows).encode("utf-8")
+            list_appointments(CONTEXT, from_date="2099-01-01")
+
+    def test_create_conflict_skips_request(self):
+        self.load(
+            appointment("apt_1", "2099-01-01T09:00:00Z", "2099-01-01T10:00:00Z")
+        )
+
+        with mock.patch("requests.post") as mock_post:
+            with self.assertRaises(AppointmentConflictError) as error:
+                create_appointment(
+                    CONTEXT,
+                    title="Haircut",
+                    start_time="2099-01-01T09:30:00Z",
+                    end_time="2099-01-01T10:00:00Z",
+                    customer_name="Jane",
+                    customer_email="jane@example.com",
+                    employee_id="emp_1",
+                )
+
+            mock_post.assert_not_called()
+            self.assertEqual(error.exception.conflicts, ["apt_1"])
+            self.assertIn(
+                "2099-01-01T10:00:00Z - 2099-01-01T10:30:00Z",
+                str(error.exception),
+            )
+
+    def test_other_staff_is_not_a_conflict(self):
+        self.load(
+            appointment("apt_1", "2099-01-01T09:00:00Z", "2099-01-01T10:00:00Z")
+        )
+
+        with mock.patch("requests.post") as mock_post:
+            mock_post.return_value.json.return_value = appointment(
+                "apt_2",
+                "2099-01-01T09:00:00Z",
+                "2099-01-01T10:00:00Z",
+                employee_id="emp_2",
+            )
+            create_appointment(
+                CONTEXT,
+                title="Haircut",
+                start_time="2099-01-01T09:00:00Z",
+                end_time="2099-01-01T10:00:00Z",
+                customer_name="Jane",
+                customer_email="jane@example.com",
+                employee_id="emp_2",
+            )
+
+        self.assertIsNotNone(appointment_index.get("apt_2"))
+
+    def test_update_checks_moved_time(self):
+        self.load(
+            appointment("apt_1", "2099-01-01T09:00:00Z", "2099-01-01T10:00:00Z"),
+            appointment("apt_2", "2099-01-01T11:00:00Z", "2099-01-01T12:00:00Z"),
+        )
+
+        with mock.patch("requests.put") as mock_put:
+            with self.assertRaises(AppointmentConflictError):
+                update_appointment(
+                    CONTEXT,
+                    appointment_id="apt_2",
+                    start_time="2099-01-01T09:30:00Z",
+                    end_time="2099-01-01T10:30:00Z",
+                )
+            mock_put.assert_not_called()
+
+            mock_put.return_value.json.return_value = appointment(
+                "apt_2", "2099-01-01T11:30:00Z", "2099-01-01T12:30:00Z"
+            )
+            update_appointment(
+                CONTEXT,
+                appointment_id="apt_2",
+                start_time="2099-01-01T11:30:00Z",
+                end_time="2099-01-01T12:30:00Z",
+            )
+
+        self.assertEqual(
+            appointment_index.get("apt_2")[1:], (at(11, 30), at(12, 30))
+        )
+
+    def test_update_invalidates_old_and_new_days_of_business(self):
+        self.load(
+            appointment("apt_1", "2099-01-01T09:00:00Z", "2099-01-01T10:00:00Z")
+        )
+        days = [date(2099, 1, day) for day in (1, 2, 3)]
+        ours = availability_key(CONTEXT["business_id"], {})
+        other = availability_key("other/company/location", {})
+        for key in (ours, other):
+            availability_cache.store("slots", key, {day: [] for day in days})
+
+        with mock.patch("requests.put") as mock_put:
+            mock_put.return_value.json.return_value = appointment(
+                "apt_1", "2099-01-03T09:00:00Z", "2099-01-03T10:00:00Z"
+            )
+            update_appointment(
+                CONTEXT,
+                appointment_id="apt_1",
+                start_time="2099-01-03T09:00:00Z",
+                end_time="2099-01-03T10:00:00Z",
+            )
+
+        _, missing = availability_cache.lookup("slots", ours, days)
+        self.assertEqual(missing, [days[0], days[2]])
+        _, missing = availability_cache.lookup("slots", other, days)
+        self.assertEqual(missing, [])
+
+    def test_tool_answers_conflict_with_alternatives(self):
+        self.load(
+            appointment("apt_1", "2099-01-01T09:00:00Z", "2099-01-01T10:00:00Z")
+        )
+        api = AppointyAPI(api_key="key", context=dict(CONTEXT))
+        booking = {
+            "title": "Haircut",
+            "start_time": "2099-01-01T09:30:00Z",
+            "end_time": "2099-01-01T10:00:00Z",
+            "customer_name": "Jane",
+            "customer_email": "jane@example.com",
+            "employee_id": "emp_1",
+        }
+
+        with mock.patch("requests.post") as mock_post:
+            result = json.loads(api.run("create_appointment", **booking))
+            mock_post.assert_not_called()
+
+        self.assertEqual(result["conflict"]["appointments"], ["apt_1"])
+        self.assertEqual(
+            result["alternatives"],
+            [
+                {
+                    "start_time": "2099-01-01T08:30:00Z",
+                    "end_time": "2099-01-01T09:00:00Z",
+                },
+                {
+                    "start_time": "2099-01-01T10:00:00Z",
+                    "end_time": "2099-01-01T10:30:00Z",
+                },
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import unittest
+
+import requests
+
+from appointy_agent_toolkit.api import AppointyAPI
+from appointy_agent_toolkit.cache import availability_cache
+from appointy_agent_toolkit.client import AppointyClient
+from appointy_agent_toolkit.conflicts import appointment_index
+from appointy_agent_toolkit.functions import (
+    create_appointment,
+    find_next_available_slots,
+    get_available_dates_and_slots,
+    get_available_slots,
+    get_staff_info,
+    list_appointments,
+)
+from appointy_agent_toolkit.store import AppointmentStore, sync_appointments
+from appointy_agent_toolkit.testing.fake_server import FakeAppointy
+
+
+class TestAgainstFakeServer(unittest.TestCase):
+    def setUp(self):
+        availability_cache.clear()
+        appointment_index.clear()
+        self.server = FakeAppointy(appointments_per_day=4)
+        self.server.start()
+        self.context = self.server.context
+        self.client = AppointyClient(self.context)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_services_and_staff(self):
+        api = AppointyAPI(api_key="key", context=self.context)
+
+        self.assertIn("Haircut", api.run("get_service_info", query="hair"))
+        self.assertEqual(
+            sorted(get_staff_info(self.client, "svc_colour", "3600s")),
+            ["Edsger Dijkstra", "Grace Hopper"],
+        )
+
+    def test_availability_is_batched_and_cached(self):
+        result = get_available_dates_and_slots(
+            self.client, {}, "2024-01-01", "2024-01-07", "2024-01-02"
+        )
+
+        self.assertEqual(len(result["dates"]), 5)
+        self.assertTrue(result["slots"])
+        # One miss on the unknown hashes, then the full documents.
+        self.assertEqual(self.server.requests["POST /graphql"], 2)
+
+        get_available_slots(self.client, {}, "2024-01-02", "2024-01-02")
+        self.assertEqual(self.server.requests["POST /graphql"], 2)
+
+    def test_booking_removes_slot(self):
+        filters = {"employees": ["emp_1"]}
+        first = find_next_available_slots(
+            self.client, filters, count=1, from_date="2024-01-06"
+        )[0]
+        start_time, end_time = first.split(" - ")
+
+        create_appointment(
+            self.context,
+            title="Haircut",
+            start_time=start_time,
+            end_time=end_time,
+            customer_name="Jane",
+            customer_email="jane@example.com",
+            employee_id="emp_1",
+        )
+
+        after = find_next_available_slots(
+            self.client, filters, count=1, from_date="2024-01-06"
+        )
+        self.assertNotEqual(after[0], first)
+
+    def test_list_and_sync_appointments(self):
+        listed = list_appointments(
+            self.context, from_date="2024-01-01", to_date="2024-01-31", limit=500
+        )
+        store = AppointmentStore()
+        synced = sync_appointments(self.context, store, page_size=25)
+
+        # 23 weekdays in January 2024, 4 fixture bookings each.
+        self.assertEqual(len(listed), 23 * 4)
+        self.assertEqual(synced, len(self.server._appointments))
+
+        # Only the overlap behind the watermark is read again.
+        self.assertLess(sync_appointments(self.context, store), 5)
+
+        create_appointment(
+            self.context,
+            title="Haircut",
+            start_time="2024-01-06T09:00:00Z",
+            end_time="2024-01-06T09:30:00Z",
+            customer_name="Jane",
+            customer_email="jane@example.com",
+        )
+        sync_appointments(self.context, store)
+        self.assertEqual(
+            store.count(self.context["business_id"]),
+            len(self.server._appointments),
+        )
+
+    def test_injected_errors_surface(self):
+        self.server.fail_next(1, status=503)
+
+        with self.assertRaises(requests.HTTPError) as raised:
+            self.client.list_services()
+
+        self.assertEqual(raised.exception.response.status_code, 503)
+        self.assertTrue(self.client.list_services())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from unittest import mock
+
+from appointy_agent_toolkit.cache import availability_cache
+from appointy_agent_toolkit.fanout import find_earliest_slots
+from appointy_agent_toolkit.testing import make_client, slots_response
+
+
+SLOTS = {
+    ("svc_1", "emp_1"): [("2024-01-01T11:00:00Z", "2024-01-01T11:30:00Z")],
+    ("svc_1", "emp_2"): [("2024-01-01T09:00:00Z", "2024-01-01T09:30:00Z")],
+    ("svc_2", "emp_1"): [("2024-01-01T10:00:00Z", "2024-01-01T10:30:00Z")],
+    ("svc_2", "emp_2"): [("2024-01-09T08:00:00Z", "2024-01-09T08:30:00Z")],
+}
+
+
+def fake_request(method, path, json_data):
+    variables = json_data["variables"]["filter"]
+    combination = (variables["services"][0], variables["employees"][0])
+    start = variables["timeSlot"]["startTime"]
+    end = variables["timeSlot"]["endTime"]
+    return slots_response(
+        *[
+            slot
+            for slot in SLOTS[combination]
+            if start <= slot[0] < end
+        ]
+    )
+
+
+class TestFanOut(unittest.TestCase):
+    def setUp(self):
+        availability_cache.clear()
+
+    def test_find_earliest_slots_merges_combinations(self):
+        client = make_client()
+        client._make_request.side_effect = fake_request
+
+        result = find_earliest_slots(
+            client,
+            services=["svc_1", "svc_2"],
+            employees=["emp_1", "emp_2"],
+            from_date="2024-01-01",
+            to_date="2024-01-31",
+            limit=3,
+        )
+
+        self.assertEqual(
+            [(slot["service_id"], slot["employee_id"]) for slot in result],
+            [("svc_1", "emp_2"), ("svc_2", "emp_1"), ("svc_1", "emp_1")],
+        )
+        # The first week already holds three slots, so later weeks are
+        # never queried.
+        self.assertEqual(client._make_request.call_count, 4)
+        for call in client._make_request.call_args_list:
+            self.assertEqual(
+                call.kwargs["json_data"]["variables"]["filter"]["timeSlot"][
+                    "endTime"
+                ],
+                "2024-01-08T00:00:00Z",
+            )
+
+    def test_find_earliest_slots_requires_business(self):
+        client = mock.Mock()
+        client.config.business_id = None
+
+        with self.assertRaises(ValueError):
+            find_earliest_slots(client, ["svc_1"], [], "2024-01-01", "2024-01-02")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,233 @@
+import hashlib
+import unittest
+from unittest import mock
+
+import requests
+
+from appointy_agent_toolkit.cache import employee_node_cache
+from appointy_agent_toolkit.functions import _query_employee_nodes
+from appointy_agent_toolkit.graphql import (
+    BATCHING,
+    endpoint_support,
+    persisted_payload,
+    post_graphql,
+    post_graphql_batch,
+)
+from appointy_agent_toolkit.queries import (
+    AVAILABLE_DATES_QUERY,
+    AVAILABLE_SLOTS_QUERY,
+    normalize_query,
+)
+
+MISS = {"errors": [{"message": "PersistedQueryNotFound"}]}
+UNSUPPORTED = {"errors": [{"message": "PersistedQueryNotSupported"}]}
+
+
+class TestPersistedQueries(unittest.TestCase):
+    def setUp(self):
+        endpoint_support.clear()
+        self.addCleanup(endpoint_support.clear)
+
+    def test_documents_are_normalized_and_hashed(self):
+        document = AVAILABLE_DATES_QUERY.document
+
+        self.assertEqual(document, normalize_query(document))
+        self.assertNotIn("\n", document)
+        self.assertEqual(
+            AVAILABLE_DATES_QUERY.sha256,
+            hashlib.sha256(document.encode("utf-8")).hexdigest(),
+        )
+
+    def test_payload_sends_hash_only(self):
+        payload = persisted_payload(
+            AVAILABLE_DATES_QUERY, {"a": 1}, operation_id="Op"
+        )
+
+        self.assertNotIn("query", payload)
+        self.assertEqual(payload["id"], "Op")
+        self.assertEqual(
+            payload["extensions"]["persistedQuery"]["sha256Hash"],
+            AVAILABLE_DATES_QUERY.sha256,
+        )
+
+    def test_miss_falls_back_to_full_text(self):
+        client = mock.Mock()
+        client._make_request.side_effect = [MISS, {"data": {}}]
+
+        result = post_graphql(
+            client, persisted_payload(AVAILABLE_DATES_QUERY, {})
+        )
+
+        self.assertEqual(result, {"data": {}})
+        retry = client._make_request.call_args.kwargs["json_data"]
+        self.assertEqual(retry["query"], AVAILABLE_DATES_QUERY.document)
+
+    def test_batch_resends_only_misses(self):
+        client = mock.Mock()
+        client._make_request.side_effect = [
+            [{"data": {"dates": True}}, MISS],
+            {"data": {"slots": True}},
+        ]
+
+        result = post_graphql_batch(
+            client,
+            [
+                persisted_payload(AVAILABLE_DATES_QUERY, {}),
+                persisted_payload(AVAILABLE_SLOTS_QUERY, {}),
+            ],
+        )
+
+        self.assertEqual(
+            result, [{"data": {"dates": True}}, {"data": {"slots": True}}]
+        )
+        retry = client._make_request.call_args.kwargs["json_data"]
+        self.assertEqual(retry["query"], AVAILABLE_SLOTS_QUERY.document)
+
+    def test_remembers_endpoint_without_persisted_queries(self):
+        client = mock.Mock(_base_url="https://appointy.test")
+        client._make_request.side_effect = [
+            UNSUPPORTED,
+            {"data": {"first": True}},
+            {"data": {"second": True}},
+        ]
+        payload = persisted_payload(AVAILABLE_DATES_QUERY, {})
+
+        post_graphql(client, payload)
+        result = post_graphql(client, payload)
+
+        self.assertEqual(result, {"data": {"second": True}})
+        self.assertEqual(client._make_request.call_count, 3)
+        sent = client._make_request.call_args.kwargs["json_data"]
+        self.assertEqual(sent["query"], AVAILABLE_DATES_QUERY.document)
+
+        # A miss only means the hash is not registered yet.
+        other = mock.Mock(_base_url="https://other.test")
+        other._make_request.side_effect = [MISS, {"data": {}}, {"data": {}}]
+        post_graphql(other, payload)
+        post_graphql(other, payload)
+        sent = other._make_request.call_args.kwargs["json_data"]
+        self.assertNotIn("query", sent)
+
+    def test_remembers_endpoint_rejecting_batches(self):
+        client = mock.Mock(_base_url="https://appointy.test")
+        client._make_request.side_effect = [
+            {"errors": [{"message": "Batching is not supported"}]},
+            {"data": {"dates": 1}},
+            {"data": {"slots": 1}},
+            {"data": {"dates": 2}},
+            {"data": {"slots": 2}},
+        ]
+        payloads = [
+            persisted_payload(AVAILABLE_DATES_QUERY, {}),
+            persisted_payload(AVAILABLE_SLOTS_QUERY, {}),
+        ]
+
+        post_graphql_batch(client, payloads)
+        result = post_graphql_batch(client, payloads)
+
+        self.assertEqual(
+            result, [{"data": {"dates": 2}}, {"data": {"slots": 2}}]
+        )
+        sent = [
+            call.kwargs["json_data"]
+            for call in client._make_request.call_args_list
+        ]
+        self.assertEqual(
+            [isinstance(payload, list) for payload in sent],
+            [True, False, False, False, False],
+        )
+
+    def test_falls_back_when_batches_are_rejected(self):
+        rejected = requests.Response()
+        rejected.status_code = 400
+        client = mock.Mock(_base_url="https://appointy.test")
+        client._make_request.side_effect = [
+            requests.HTTPError(response=rejected),
+            {"data": {"dates": 1}},
+            {"data": {"slots": 1}},
+        ]
+        payloads = [
+            persisted_payload(AVAILABLE_DATES_QUERY, {}),
+            persisted_payload(AVAILABLE_SLOTS_QUERY, {}),
+        ]
+
+        result = post_graphql_batch(client, payloads)
+
+        self.assertEqual(
+            result, [{"data": {"dates": 1}}, {"data": {"slots": 1}}]
+        )
+        self.assertFalse(
+            endpoint_support.supports("https://appointy.test", BATCHING)
+        )
+
+    def test_server_errors_are_not_taken_for_rejected_batches(self):
+        failed = requests.Response()
+        failed.status_code = 503
+        client = mock.Mock(_base_url="https://appointy.test")
+        client._make_request.side_effect = requests.HTTPError(
+            response=failed
+        )
+
+        with self.assertRaises(requests.HTTPError):
+            post_graphql_batch(
+                client,
+                [
+                    persisted_payload(AVAILABLE_DATES_QUERY, {}),
+                    persisted_payload(AVAILABLE_SLOTS_QUERY, {}),
+                ],
+            )
+        self.assertTrue(
+            endpoint_support.supports("https://appointy.test", BATCHING)
+        )
+
+
+def nodes_response(method, path, json_data):
+    return {
+        "data": {
+            "nodes": [
+                {"__typename": "Employee", "id": id, "staffProfiles": []}
+                for id in json_data["variables"]["ids"]
+                if id != "emp_missing"
+            ]
+            + [None]
+        }
+    }
+
+
+class TestEmployeeNodes(unittest.TestCase):
+    def setUp(self):
+        employee_node_cache.clear()
+
+    def test_resolves_in_chunks_and_caches_ids(self):
+        client = mock.Mock()
+        client._make_request.side_effect = nodes_response
+        ids = [f"emp_{i}" for i in range(5)]
+
+        result = _query_employee_nodes(client, ids, "group", chunk_size=2)
+
+        self.assertEqual([node["id"] for node in result["nodes"]], ids)
+        chunks = [
+            call.kwargs["json_data"]["variables"]["ids"]
+            for call in client._make_request.call_args_list
+        ]
+        self.assertEqual(
+            sorted(chunks), [["emp_0", "emp_1"], ["emp_2", "emp_3"], ["emp_4"]]
+        )
+
+        client._make_request.reset_mock()
+        result = _query_employee_nodes(
+            client, ids + ["emp_5", "emp_missing"], "group", chunk_size=2
+        )
+
+        self.assertEqual(len(result["nodes"]), 6)
+        client._make_request.assert_called_once()
+        self.assertEqual(
+            client._make_request.call_args.kwargs["json_data"]["variables"][
+                "ids"
+            ],
+            ["emp_5", "emp_missing"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+from datetime import date, datetime, timezone
+
+from unittest import mock
+
+import numpy as np
+
+from appointy_agent_toolkit.cache import availability_cache
+from appointy_agent_toolkit.functions import create_appointment
+from appointy_agent_toolkit.matrix import (
+    StaffAvailabilityMatrix,
+    get_staff_availability_matrix,
+)
+from appointy_agent_toolkit.testing import (
+    appointment,
+    make_client,
+    slots_response,
+)
+
+
+class TestStaffAvailabilityMatrix(unittest.TestCase):
+    def setUp(self):
+        availability_cache.clear()
+
+    def test_builds_rows_in_one_batched_request(self):
+        client = make_client()
+        client._make_request.return_value = [
+            slots_response(
+                ("2024-01-02T09:00:00Z", "2024-01-02T10:00:00Z"),
+                ("2024-01-02T09:30:00Z", "2024-01-02T10:30:00Z"),
+            ),
+            slots_response(
+                ("2024-01-03T09:10:00Z", "2024-01-03T09:50:00Z"),
+            ),
+        ]
+
+        matrix = get_staff_availability_matrix(
+            client, ["emp_1", "emp_2"], "2024-01-02", "2024-01-03"
+        )
+
+        client._make_request.assert_called_once()
+        self.assertEqual(matrix.days, [date(2024, 1, 2), date(2024, 1, 3)])
+        self.assertEqual(matrix.values.shape, (2, 2 * 96))
+        np.testing.assert_array_equal(matrix.free_minutes(), [90, 30])
+        np.testing.assert_array_equal(
+            matrix.free_minutes_per_day(), [[90, 0], [0, 30]]
+        )
+        self.assertEqual(
+            matrix.staff_available(
+                datetime(2024, 1, 2, 10, 15, tzinfo=timezone.utc)
+            ),
+            ["emp_1"],
+        )
+
+        # The week is cached, so another range within it needs no request.
+        get_staff_availability_matrix(
+            client, ["emp_1", "emp_2"], "2024-01-04", "2024-01-05"
+        )
+        client._make_request.assert_called_once()
+
+        # Rows follow the caller's order, also when served from the cache.
+        swapped = get_staff_availability_matrix(
+            client, ["emp_2", "emp_1"], "2024-01-02", "2024-01-03"
+        )
+        client._make_request.assert_called_once()
+        np.testing.assert_array_equal(swapped.free_minutes(), [30, 90])
+
+    def test_booking_invalidates_week(self):
+        client = make_client()
+        client._make_request.return_value = slots_response()
+        get_staff_availability_matrix(
+            client, ["emp_1"], "2024-01-01", "2024-01-01"
+        )
+
+        with mock.patch("requests.post") as mock_post:
+            mock_post.return_value.json.return_value = {
+                **appointment("apt_1"),
+                "start_time": "2024-01-05T09:00:00Z",
+                "end_time": "2024-01-05T09:30:00Z",
+            }
+            create_appointment(
+                {
+                    "api_base_url": "https://appointy.test",
+                    "api_key": "key",
+                    "business_id": client.config.business_id,
+                },
+                title="Haircut",
+                start_time="2024-01-05T09:00:00Z",
+                end_time="2024-01-05T09:30:00Z",
+                customer_name="Jane",
+                customer_email="jane@example.com",
+            )
+        get_staff_availability_matrix(
+            client, ["emp_1"], "2024-01-01", "2024-01-01"
+        )
+
+        self.assertEqual(client._make_request.call_count, 2)
+
+    def test_aggregations(self):
+        values = np.zeros((2, 2 * 24), dtype=bool)
+        values[0, 9:13] = True
+        values[1, 11:17] = True
+        values[1, 24 + 9:24 + 17] = True
+        matrix = StaffAvailabilityMatrix(
+            ["emp_1", "emp_2"], date(2024, 1, 1), values, resolution=60
+        )
+
+        np.testing.assert_array_equal(
+            matrix.common_free_minutes_per_day(), [120, 0]
+        )
+        np.testing.assert_allclose(
+            matrix.utilization_per_day(working_minutes=480),
+            [1 - (4 / 8 + 6 / 8) / 2, 1 - (0 + 1) / 2],
+        )
+
+    def test_rejects_partial_days(self):
+        with self.assertRaises(ValueError):
+            StaffAvailabilityMatrix(["emp_1"], date(2024, 1, 1), np.zeros((1, 10)))
+
+
+if __name__ == "__main__":
+    unittest.main()
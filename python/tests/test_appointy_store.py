@@ -0,0 +1,111 @@
+import json
+import unittest
+from unittest import mock
+
+from appointy_agent_toolkit.api import AppointyAPI
+from appointy_agent_toolkit.conflicts import appointment_index
+from appointy_agent_toolkit.functions import Appointment
+from appointy_agent_toolkit.store import AppointmentStore, sync_appointments
+from appointy_agent_toolkit.testing import appointment, page
+
+CONTEXT = {
+    "api_base_url": "https://appointy.test",
+    "api_key": "key",
+    "business_id": "group/company/location",
+}
+
+
+def changed(id, start_time, updated_at, **fields):
+    return {
+        **appointment(id),
+        "start_time": start_time,
+        "updated_at": updated_at,
+        **fields,
+    }
+
+
+class TestSyncAppointments(unittest.TestCase):
+    def setUp(self):
+        appointment_index.clear()
+        self.store = AppointmentStore()
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_first_sync_pulls_everything_then_only_changes(self):
+        with mock.patch("requests.get") as mock_get:
+            mock_get.side_effect = [
+                page(
+                    changed("apt_1", "2024-01-01T09:00:00Z", "2024-01-01T00:00:00Z"),
+                    next_cursor="c1",
+                ),
+                page(
+                    changed("apt_2", "2024-01-02T09:00:00Z", "2024-01-01T00:05:00Z"),
+                ),
+            ]
+            self.assertEqual(sync_appointments(CONTEXT, self.store), 2)
+            self.assertNotIn("updated_since", mock_get.call_args.kwargs["params"])
+
+            mock_get.side_effect = [
+                page(
+                    changed(
+                        "apt_1",
+                        "2024-01-03T09:00:00Z",
+                        "2024-01-02T00:00:00Z",
+                        status="cancelled",
+                    ),
+                ),
+            ]
+            self.assertEqual(sync_appointments(CONTEXT, self.store), 1)
+            params = mock_get.call_args.kwargs["params"]
+
+        self.assertEqual(params["updated_since"], "2024-01-01T00:04:00Z")
+        self.assertEqual(self.store.count(CONTEXT["business_id"]), 2)
+        self.assertEqual(
+            self.store.watermark(CONTEXT["business_id"]),
+            "2024-01-01T23:59:00Z",
+        )
+
+    def test_list_appointments_filters_locally(self):
+        self.store.upsert(
+            "biz",
+            [
+                Appointment(**changed("apt_1", "2024-01-01T09:00:00+01:00", None)),
+                Appointment(**changed("apt_2", "2024-01-02T09:00:00Z", None)),
+                Appointment(
+                    **changed(
+                        "apt_3", "2024-01-03T09:00:00Z", None, status="cancelled"
+                    )
+                ),
+            ],
+            batch_size=2,
+        )
+
+        listed = self.store.list_appointments(
+            "biz", from_date="2024-01-01T08:00:00Z", to_date="2024-01-02"
+        )
+        self.assertEqual([a.id for a in listed], ["apt_1", "apt_2"])
+
+        cancelled = self.store.list_appointments(
+            "biz", from_date="2024-01-01", status="cancelled"
+        )
+        self.assertEqual([a.id for a in cancelled], ["apt_3"])
+        self.assertEqual(self.store.list_appointments("other", "2024-01-01"), [])
+
+    def test_api_answers_list_from_store(self):
+        with mock.patch("requests.get") as mock_get:
+            mock_get.side_effect = [
+                page(changed("apt_1", "2024-01-01T09:00:00Z", None)),
+            ]
+            sync_appointments(CONTEXT, self.store)
+
+        api = AppointyAPI(api_key="key", context=dict(CONTEXT), store=self.store)
+        with mock.patch("requests.get") as mock_get:
+            result = api.run("list_appointments", from_date="2024-01-01")
+            mock_get.assert_not_called()
+
+        self.assertEqual([a["id"] for a in json.loads(result)], ["apt_1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
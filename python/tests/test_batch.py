@@ -0,0 +1,138 @@
+import json
+import threading
+import unittest
+from unittest import mock
+
+from stripe_agent_toolkit.api import StripeAPI
+from stripe_agent_toolkit.schema import Batch
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.api = StripeAPI(
+            secret_key="sk_test_123",
+            context={},
+            allowed_methods=["create_product", "create_price", "batch"],
+        )
+
+    def test_runs_independent_operations_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def create_price(context, product, unit_amount, currency, api_key):
+            barrier.wait()
+            return {"id": f"price_{unit_amount}"}
+
+        with mock.patch(
+            "stripe_agent_toolkit.api.create_price", side_effect=create_price
+        ):
+            result = self.api.run(
+                "batch",
+                operations=[
+                    {
+                        "method": "create_price",
+                        "args": {
+                            "product": "prod_1",
+                            "unit_amount": amount,
+                            "currency": "usd",
+                        },
+                    }
+                    for amount in (100, 200, 300)
+                ],
+            )
+
+        self.assertEqual(
+            json.loads(result),
+            [
+                {"id": "0", "result": {"id": "price_100"}},
+                {"id": "1", "result": {"id": "price_200"}},
+                {"id": "2", "result": {"id": "price_300"}},
+            ],
+        )
+        self.assertNotIn(" ", result)
+
+    def test_references_order_dependent_operations(self):
+        with mock.patch(
+            "stripe_agent_toolkit.api.create_product"
+        ) as create_product, mock.patch(
+            "stripe_agent_toolkit.api.create_price"
+        ) as create_price:
+            create_product.return_value = {"id": "prod_1"}
+            create_price.return_value = {"id": "price_1"}
+
+            result = self.api.run(
+                "batch",
+                operations=Batch(
+                    operations=[
+                        {
+                            "id": "price",
+                            "method": "create_price",
+                            "args": {
+                                "product": "$product.id",
+                                "unit_amount": 100,
+                                "currency": "usd",
+                            },
+                        },
+                        {
+                            "id": "product",
+                            "method": "create_product",
+                            "args": {"name": "Shirt"},
+                        },
+                    ]
+                ).operations,
+            )
+
+        create_price.assert_called_once_with(
+            {},
+            product="prod_1",
+            unit_amount=100,
+            currency="usd",
+            api_key="sk_test_123",
+        )
+        self.assertEqual(
+            [entry["id"] for entry in json.loads(result)],
+            ["price", "product"],
+        )
+
+    def test_reports_errors_per_operation(self):
+        with mock.patch(
+            "stripe_agent_toolkit.api.create_product",
+            side_effect=Exception("card declined"),
+        ):
+            result = json.loads(
+                self.api.run(
+                    "batch",
+                    operations=[
+                        {"id": "p", "method": "create_product",
+                         "args": {"name": "Shirt"}},
+                        {"method": "create_price",
+                         "args": {"product": "$p.id"}},
+                        {"method": "create_refund",
+                         "args": {"payment_intent": "pi_1"}},
+                        {"method": "create_price",
+                         "args": {"product": "prod_1"}},
+                    ],
+                )
+            )
+
+        self.assertEqual(result[0]["error"], "card declined")
+        self.assertEqual(result[1]["error"], "Skipped, dependency failed: p")
+        self.assertEqual(
+            result[2]["error"], "Method not allowed: create_refund"
+        )
+        self.assertTrue(result[3]["error"].startswith("Invalid arguments"))
+
+    def test_rejects_circular_dependencies(self):
+        with self.assertRaises(ValueError):
+            self.api.run(
+                "batch",
+                operations=[
+                    {"id": "a", "method": "retrieve_balance",
+                     "depends_on": ["b"]},
+                    {"id": "b", "method": "retrieve_balance",
+                     "depends_on": ["a"]},
+                ],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,330 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+import requests
+import stripe
+
+from appointy_agent_toolkit.api import AppointyAPI
+from stripe_agent_toolkit.api import StripeAPI
+from stripe_agent_toolkit.breaker import (
+    CircuitBreaker,
+    CircuitOpenResponse,
+    is_upstream_failure,
+)
+from stripe_agent_toolkit.memo import ConversationMemo
+from stripe_agent_toolkit.middleware import MiddlewarePipeline, ToolCall
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+class TestIsUpstreamFailure(unittest.TestCase):
+    def test_classifies_errors(self):
+        self.assertTrue(
+            is_upstream_failure(stripe.error.APIConnectionError(""))
+        )
+        self.assertTrue(
+            is_upstream_failure(stripe.error.APIError("", http_status=502))
+        )
+        self.assertTrue(
+            is_upstream_failure(
+                stripe.error.RateLimitError("", http_status=429)
+            )
+        )
+        self.assertTrue(is_upstream_failure(requests.Timeout()))
+        self.assertTrue(is_upstream_failure(http_error(503)))
+
+        self.assertFalse(
+            is_upstream_failure(
+                stripe.error.InvalidRequestError("", "price", http_status=400)
+            )
+        )
+        self.assertFalse(is_upstream_failure(http_error(404)))
+        self.assertFalse(is_upstream_failure(ValueError("Invalid method")))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(
+            "stripe", failure_threshold=2, recovery_timeout=30
+        )
+        self.api = StripeAPI(
+            secret_key="sk_test_123",
+            context={"account": "acct_1"},
+            pipeline=MiddlewarePipeline([self.breaker]),
+        )
+        self.now = 1000.0
+        patcher = mock.patch(
+            "stripe_agent_toolkit.breaker.time.monotonic",
+            side_effect=lambda: self.now,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fail(self, method="retrieve_balance", error=None):
+        with mock.patch(
+            f"stripe_agent_toolkit.api.{method}",
+            side_effect=error or stripe.error.APIConnectionError("down"),
+        ):
+            with self.assertRaises(Exception):
+                self.api.run(method)
+
+    def test_opens_after_consecutive_failures(self):
+        self.fail()
+        self.fail()
+
+        with mock.patch(
+            "stripe_agent_toolkit.api.retrieve_balance"
+        ) as retrieve_balance:
+            result = self.api.run("retrieve_balance")
+
+        retrieve_balance.assert_not_called()
+        self.assertIsInstance(result, CircuitOpenResponse)
+        error = json.loads(result)["error"]
+        self.assertEqual(error["type"], "circuit_open")
+        self.assertEqual(error["upstream"], "stripe")
+        self.assertEqual(error["method"], "retrieve_balance")
+        self.assertEqual(error["account"], "acct_1")
+        self.assertEqual(error["retry_after"], 30)
+        self.assertEqual(
+            self.breaker.snapshot()["stripe:retrieve_balance:acct_1"],
+            {
+                "state": "open",
+                "failures": 2,
+                "rejected": 1,
+                "retry_after": 30.0,
+                "last_error": "APIConnectionError: down",
+            },
+        )
+
+    def test_success_and_request_errors_keep_the_circuit_closed(self):
+        self.fail()
+        with mock.patch(
+            "stripe_agent_toolkit.api.retrieve_balance", return_value={}
+        ):
+            self.api.run("retrieve_balance")
+        self.fail()
+        self.fail(
+            error=stripe.error.InvalidRequestError("", "x", http_status=400)
+        )
+
+        state = self.breaker.snapshot()["stripe:retrieve_balance:acct_1"]
+        self.assertEqual(state["state"], "closed")
+
+    def test_circuits_are_per_method_and_account(self):
+        self.fail()
+        self.fail()
+        other_account = StripeAPI(
+            secret_key="sk_test_123",
+            context={"account": "acct_2"},
+            pipeline=MiddlewarePipeline([self.breaker]),
+        )
+
+        with mock.patch(
+            "stripe_agent_toolkit.api.retrieve_balance", return_value={}
+        ), mock.patch(
+            "stripe_agent_toolkit.api.list_products", return_value=[]
+        ):
+            self.assertEqual(other_account.run("retrieve_balance"), "{}")
+            self.assertEqual(self.api.run("list_products"), "[]")
+
+    def test_half_open_probe(self):
+        self.fail()
+        self.fail()
+        self.now += 30
+
+        # A failed probe opens the circuit again.
+        self.fail()
+        self.assertEqual(
+            self.breaker.snapshot()["stripe:retrieve_balance:acct_1"][
+                "state"
+            ],
+            "open",
+        )
+
+        self.now += 30
+        with mock.patch(
+            "stripe_agent_toolkit.api.retrieve_balance", return_value={}
+        ) as retrieve_balance:
+            self.assertEqual(self.api.run("retrieve_balance"), "{}")
+            self.assertEqual(self.api.run("retrieve_balance"), "{}")
+
+        self.assertEqual(retrieve_balance.call_count, 2)
+        self.assertEqual(
+            self.breaker.snapshot()["stripe:retrieve_balance:acct_1"][
+                "state"
+            ],
+            "closed",
+        )
+
+    def state(self):
+        return self.breaker.snapshot()["stripe:retrieve_balance:acct_1"][
+            "state"
+        ]
+
+    def test_calls_admitted_before_a_trip_do_not_change_it(self):
+        call = ToolCall("retrieve_balance", (), {}, {"account": "acct_1"})
+
+        async def scenario():
+            started = asyncio.Event()
+            finish = asyncio.Event()
+
+            async def slow(call):
+                started.set()
+                await finish.wait()
+                if slow.error:
+                    raise slow.error
+                return "{}"
+
+            async def down(call):
+                raise stripe.error.APIConnectionError("down")
+
+            async def run(handler):
+                try:
+                    return await self.breaker.ahandle(call, handler)
+                except stripe.error.StripeError:
+                    pass
+
+            # A late success from before the trip leaves it open.
+            slow.error = None
+            late = asyncio.create_task(run(slow))
+            await started.wait()
+            await run(down)
+            await run(down)
+            finish.set()
+            await late
+            self.assertEqual(self.state(), "open")
+
+            # A late failure from before the trip neither reopens the
+            # circuit nor takes the place of a probe.
+            started.clear()
+            finish.clear()
+            slow.error = stripe.error.APIConnectionError("late")
+            self.now += 30
+            probe = asyncio.create_task(run(slow))
+            await started.wait()
+            self.assertIsInstance(
+                await self.breaker.ahandle(call, down), CircuitOpenResponse
+            )
+            finish.set()
+            await probe
+            self.assertEqual(self.state(), "open")
+
+        asyncio.run(scenario())
+
+    def test_stale_probe_does_not_release_a_new_probe(self):
+        call = ToolCall("retrieve_balance", (), {}, {"account": "acct_1"})
+
+        async def scenario():
+            started = asyncio.Event()
+            finish = asyncio.Event()
+
+            async def slow(call):
+                started.set()
+                await finish.wait()
+                return "{}"
+
+            async def down(call):
+                raise stripe.error.APIConnectionError("down")
+
+            async def ok(call):
+                return "{}"
+
+            for _ in range(2):
+                with self.assertRaises(stripe.error.StripeError):
+                    await self.breaker.ahandle(call, down)
+            self.now += 30
+            self.breaker.half_open_max_calls = 2
+            stale = asyncio.create_task(self.breaker.ahandle(call, slow))
+            await started.wait()
+            # The second probe fails and opens the circuit again, so the
+            # first one is stale once it finishes.
+            with self.assertRaises(stripe.error.StripeError):
+                await self.breaker.ahandle(call, down)
+            finish.set()
+            await stale
+            self.assertEqual(self.state(), "open")
+
+            self.now += 30
+            self.breaker.half_open_max_calls = 1
+            started.clear()
+            finish.clear()
+            probe = asyncio.create_task(self.breaker.ahandle(call, slow))
+            await started.wait()
+            self.assertIsInstance(
+                await self.breaker.ahandle(call, ok), CircuitOpenResponse
+            )
+            finish.set()
+            await probe
+            self.assertEqual(self.state(), "closed")
+
+        asyncio.run(scenario())
+
+    def test_async_calls_fail_fast(self):
+        self.fail()
+        self.fail()
+
+        result = asyncio.run(self.api.arun("retrieve_balance"))
+
+        self.assertEqual(json.loads(result)["error"]["type"], "circuit_open")
+
+    def test_batch_reports_open_circuits_as_errors(self):
+        self.fail()
+        self.fail()
+
+        result = json.loads(
+            self.api.run(
+                "batch", operations=[{"method": "retrieve_balance"}]
+            )
+        )
+
+        self.assertIn("stripe is failing", result[0]["error"])
+
+    def test_memo_does_not_cache_open_circuit_errors(self):
+        memo = ConversationMemo()
+        self.fail()
+        self.fail()
+
+        def call():
+            return self.api.run("retrieve_balance")
+
+        memo.run("thread", "retrieve_balance", (), {}, call)
+        self.now += 30
+        with mock.patch(
+            "stripe_agent_toolkit.api.retrieve_balance", return_value={}
+        ):
+            result = memo.run("thread", "retrieve_balance", (), {}, call)
+
+        self.assertEqual(result, "{}")
+
+    def test_appointy_calls(self):
+        breaker = CircuitBreaker("appointy", failure_threshold=1)
+        api = AppointyAPI(
+            api_key="key",
+            context={
+                "api_base_url": "https://appointy.test",
+                "business_id": "g/c/l",
+            },
+            pipeline=MiddlewarePipeline([breaker]),
+        )
+
+        with mock.patch(
+            "appointy_agent_toolkit.api.list_services",
+            side_effect=http_error(503),
+        ) as list_services:
+            with self.assertRaises(requests.HTTPError):
+                api.run("list_services")
+            result = api.run("list_services")
+
+        self.assertEqual(list_services.call_count, 1)
+        self.assertEqual(json.loads(result)["error"]["upstream"], "appointy")
+        self.assertIn("appointy:list_services:g/c/l", breaker.snapshot())
+
+
+if __name__ == "__main__":
+    unittest.main()
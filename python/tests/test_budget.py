@@ -0,0 +1,78 @@
+import json
+import unittest
+from unittest import mock
+
+import stripe
+
+from stripe_agent_toolkit.api import StripeAPI
+from stripe_agent_toolkit.budget import OutputBudget
+from stripe_agent_toolkit.middleware import MiddlewarePipeline
+
+
+def products(count):
+    return [
+        {"id": f"prod_{i}", "name": f"Product {i}", "description": "x" * 50}
+        for i in range(count)
+    ]
+
+
+class TestOutputBudget(unittest.TestCase):
+    def test_small_results_pass_through(self):
+        budget = OutputBudget(max_bytes=10_000)
+        result = json.dumps(products(3))
+
+        self.assertIs(budget.fit(result), result)
+
+    def test_truncates_to_budget_with_cursor(self):
+        budget = OutputBudget(max_tokens=200)
+        result = json.loads(budget.fit(json.dumps(products(100))))
+
+        self.assertLessEqual(len(json.dumps(result)), 800)
+        self.assertEqual(result["returned"], len(result["data"]))
+        self.assertEqual(result["returned"] + result["omitted"], 100)
+        self.assertEqual(
+            result["starting_after"], result["data"][-1]["id"]
+        )
+
+    def test_always_returns_one_item(self):
+        budget = OutputBudget(max_bytes=10)
+        result = json.loads(budget.fit(json.dumps(products(2))))
+
+        self.assertEqual(result["returned"], 1)
+        self.assertEqual(result["starting_after"], "prod_0")
+
+    def test_requires_a_budget(self):
+        with self.assertRaises(ValueError):
+            OutputBudget()
+
+    def test_follow_up_call_passes_cursor(self):
+        api = StripeAPI(
+            secret_key="sk_test_123",
+            context={},
+            pipeline=MiddlewarePipeline().extended(
+                OutputBudget(max_bytes=300)
+            ),
+        )
+
+        with mock.patch("stripe.Product.list") as mock_function:
+            mock_function.return_value = stripe.ListObject.construct_from(
+                {"object": "list", "data": products(10), "has_more": False},
+                "sk_test_123",
+            )
+            first = json.loads(api.run("list_products", limit=10))
+            api.run(
+                "list_products",
+                limit=10,
+                starting_after=first["starting_after"],
+            )
+
+        mock_function.assert_called_with(
+            limit=10,
+            starting_after=first["starting_after"],
+            api_key="sk_test_123",
+        )
+        self.assertLess(first["returned"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import importlib.util
+import inspect
+import json
+import unittest
+from typing import Optional
+
+from pydantic import Field, ValidationError
+
+from stripe_agent_toolkit.compact import get_compact_tools, minify_schema
+from stripe_agent_toolkit.prompts import COMPACT_PROMPTS
+from stripe_agent_toolkit.schema import Batch, ListCustomers, ToolSchema
+from stripe_agent_toolkit.tools import tools
+
+
+class TestCompact(unittest.TestCase):
+    def test_every_tool_has_a_compact_description(self):
+        self.assertEqual(
+            set(COMPACT_PROMPTS), {tool["method"] for tool in tools}
+        )
+        for full, compact in zip(tools, get_compact_tools()):
+            self.assertEqual(compact["method"], full["method"])
+            self.assertEqual(compact["actions"], full["actions"])
+            self.assertLess(
+                len(compact["description"]), len(full["description"])
+            )
+
+    def test_compact_descriptions_name_required_args(self):
+        for tool in tools:
+            args = COMPACT_PROMPTS[tool["method"]].partition("Args:")[2]
+            for name, field in tool["args_schema"].model_fields.items():
+                if field.is_required():
+                    self.assertRegex(args, rf"\b{name}\b", tool["method"])
+
+    def test_minified_schema(self):
+        schema = minify_schema(ListCustomers).model_json_schema()
+
+        self.assertEqual(
+            schema,
+            {
+                "properties": {
+                    "limit": {"type": "integer"},
+                    "email": {"type": "string"},
+                    "starting_after": {"type": "string"},
+                },
+                "type": "object",
+            },
+        )
+
+    def test_minified_schema_validates_like_the_original(self):
+        minified = minify_schema(Batch)
+
+        args = minified(
+            operations=[{"method": "retrieve_balance", "args": {}}]
+        ).model_dump()
+
+        self.assertEqual(
+            args,
+            Batch(
+                operations=[{"method": "retrieve_balance", "args": {}}]
+            ).model_dump(),
+        )
+        with self.assertRaises(ValidationError):
+            minified(operations=[{"args": {}}])
+        self.assertNotIn(
+            "description", json.dumps(minified.model_json_schema())
+        )
+
+    def test_minify_schema_is_cached(self):
+        self.assertIs(minify_schema(Batch), minify_schema(Batch))
+
+    def test_deferred_schema_has_signature_before_build(self):
+        class Schema(ToolSchema):
+            name: str = Field(..., description="The name.")
+            limit: Optional[int] = None
+
+        for schema in (Schema, minify_schema(Schema)):
+            self.assertFalse(schema.__pydantic_complete__)
+            parameters = inspect.signature(schema).parameters
+            self.assertEqual(list(parameters), ["name", "limit"])
+            self.assertIs(parameters["name"].default, inspect.Parameter.empty)
+            self.assertIsNone(parameters["limit"].default)
+
+
+@unittest.skipUnless(
+    importlib.util.find_spec("langchain"), "langchain is not installed"
+)
+class TestLangChainConversion(unittest.TestCase):
+    def parameters(self, compact):
+        from langchain_core.utils.function_calling import (
+            convert_to_openai_tool,
+        )
+
+        from stripe_agent_toolkit.langchain.toolkit import StripeAgentToolkit
+
+        configuration = {"actions": {}}
+        for tool in tools:
+            for resource, permissions in tool["actions"].items():
+                configuration["actions"].setdefault(resource, {}).update(
+                    permissions
+                )
+        toolkit = StripeAgentToolkit(
+            "sk_test_123", configuration, compact=compact
+        )
+        return {
+            tool.method: (
+                tool.args_schema,
+                convert_to_openai_tool(tool)["function"]["parameters"],
+            )
+            for tool in toolkit.get_tools()
+        }
+
+    def test_full_schemas_keep_their_arguments(self):
+        for method, (schema, parameters) in self.parameters(False).items():
+            self.assertEqual(
+                list(parameters["properties"]),
+                list(schema.model_fields),
+                method,
+            )
+
+    def test_minified_schemas_survive_conversion(self):
+        converted = self.parameters(True)
+
+        self.assertEqual(
+            converted["list_customers"][1],
+            minify_schema(ListCustomers).model_json_schema(),
+        )
+        for method, (schema, parameters) in converted.items():
+            self.assertEqual(
+                list(parameters["properties"]),
+                list(schema.model_fields),
+                method,
+            )
+            text = json.dumps(parameters)
+            self.assertNotIn('"title"', text, method)
+            self.assertNotIn('{"type": "null"}', text, method)
+
+
+if __name__ == "__main__":
+    unittest.main()
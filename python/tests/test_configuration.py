@@ -1,5 +1,9 @@
 import unittest
-from stripe_agent_toolkit.configuration import is_tool_allowed
+from stripe_agent_toolkit.configuration import (
+    get_allowed_tools,
+    is_tool_allowed,
+)
+from stripe_agent_toolkit.tools import tools
 
 
 class TestConfigurations(unittest.TestCase):
@@ -53,6 +57,18 @@ class TestConfigurations(unittest.TestCase):
 
         self.assertFalse(is_tool_allowed(tool, configuration))
 
+    def test_batch_needs_another_allowed_tool(self):
+        nothing = get_allowed_tools(tools, {"actions": {}})
+        balance = get_allowed_tools(
+            tools, {"actions": {"balance": {"read": True}}}
+        )
+
+        self.assertEqual(nothing, [])
+        self.assertEqual(
+            [tool["method"] for tool in balance],
+            ["retrieve_balance", "batch"],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
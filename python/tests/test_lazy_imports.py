@@ -0,0 +1,77 @@
+import json
+import subprocess
+import sys
+import unittest
+
+LOADED = """
+import json, sys
+{statement}
+print(json.dumps(sorted(sys.modules)))
+"""
+
+HEAVY = [
+    "stripe",
+    "langchain",
+    "crewai",
+    "crewai_tools",
+    "stripe_agent_toolkit.functions",
+    "stripe_agent_toolkit.schema",
+    "stripe_agent_toolkit.tools",
+]
+
+
+def loaded(statement):
+    """The modules loaded by running ``statement`` in a new interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-c", LOADED.format(statement=statement)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(result.stdout))
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_importing_toolkits_loads_no_heavy_module(self):
+        modules = loaded(
+            "import stripe_agent_toolkit.api\n"
+            "import stripe_agent_toolkit.langchain.toolkit\n"
+            "import stripe_agent_toolkit.crewai.toolkit"
+        )
+
+        self.assertEqual([m for m in HEAVY if m in modules], [])
+
+    def test_constructing_the_api_does_not_import_stripe(self):
+        modules = loaded(
+            "from stripe_agent_toolkit.api import StripeAPI\n"
+            "StripeAPI(secret_key='sk_test_123', context=None)"
+        )
+
+        self.assertNotIn("stripe", modules)
+
+    def test_first_call_imports_stripe(self):
+        # Stripe is stubbed at the HTTP layer, so nothing imports it before
+        # the call does.
+        modules = loaded(
+            "from unittest import mock\n"
+            "from stripe_agent_toolkit.api import StripeAPI\n"
+            "api = StripeAPI(secret_key='sk_test_123', context=None)\n"
+            "assert 'stripe' not in sys.modules\n"
+            "response = mock.Mock(\n"
+            "    status_code=200, content=b'{}', headers={}\n"
+            ")\n"
+            "with mock.patch(\n"
+            "    'requests.Session.request', return_value=response\n"
+            ") as request:\n"
+            "    api.run('retrieve_balance')\n"
+            "headers = request.call_args.kwargs['headers']\n"
+            "assert headers['Authorization'] == 'Bearer sk_test_123'\n"
+            "import stripe\n"
+            "assert stripe.api_key is None"
+        )
+
+        self.assertIn("stripe", modules)
+        self.assertIn("stripe_agent_toolkit.functions", modules)
+
+if __name__ == "__main__":
+    unittest.main()
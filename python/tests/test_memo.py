@@ -0,0 +1,133 @@
+import asyncio
+import importlib.util
+import unittest
+from unittest import mock
+
+from stripe_agent_toolkit.api import StripeAPI
+from stripe_agent_toolkit.memo import (
+    READ_ONLY_METHODS,
+    ConversationMemo,
+    current_scope,
+)
+
+
+class TestConversationMemo(unittest.TestCase):
+    def test_read_only_methods(self):
+        self.assertEqual(
+            READ_ONLY_METHODS,
+            {"list_customers", "list_products", "list_prices", "retrieve_balance"},
+        )
+
+    def test_memoizes_reads_per_scope(self):
+        memo = ConversationMemo()
+        call = mock.Mock(side_effect=["a", "b", "c"])
+
+        first = memo.run("t1", "list_prices", (), {"product": "p"}, call)
+        second = memo.run("t1", "list_prices", (), {"product": "p"}, call)
+        other = memo.run("t2", "list_prices", (), {"product": "p"}, call)
+        unscoped = memo.run(None, "list_prices", (), {"product": "p"}, call)
+
+        self.assertEqual((first, second, other, unscoped), ("a", "a", "b", "c"))
+        self.assertEqual(call.call_count, 3)
+
+    def test_write_clears_scope(self):
+        memo = ConversationMemo()
+        read = mock.Mock(side_effect=["before", "after"])
+
+        memo.run("t1", "retrieve_balance", (), {}, read)
+        memo.run("t1", "create_refund", (), {}, lambda: "refund")
+        result = memo.run("t1", "retrieve_balance", (), {}, read)
+
+        self.assertEqual(result, "after")
+
+    def test_keeps_most_recent_scopes(self):
+        memo = ConversationMemo(max_scopes=1)
+        call = mock.Mock(return_value="x")
+
+        memo.run("t1", "retrieve_balance", (), {}, call)
+        memo.run("t2", "retrieve_balance", (), {}, call)
+        memo.run("t1", "retrieve_balance", (), {}, call)
+
+        self.assertEqual(call.call_count, 3)
+
+    def test_conversation_sets_scope_and_async_calls(self):
+        memo = ConversationMemo()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            return "x"
+
+        async def conversation():
+            with memo.conversation("c1"):
+                for _ in range(2):
+                    await memo.arun(
+                        current_scope.get(), "list_customers", (), {}, call
+                    )
+
+        asyncio.run(conversation())
+
+        self.assertEqual(len(calls), 1)
+        self.assertIsNone(current_scope.get())
+
+
+@unittest.skipUnless(
+    importlib.util.find_spec("langchain"), "langchain is not installed"
+)
+class TestLangChainStripeTool(unittest.TestCase):
+    def setUp(self):
+        from stripe_agent_toolkit.langchain.tool import StripeTool
+
+        self.memo = ConversationMemo()
+        self.tool = StripeTool(
+            name="retrieve_balance",
+            description="Retrieve the balance.",
+            method="retrieve_balance",
+            stripe_api=StripeAPI(secret_key="sk_test_123", context=None),
+            memo=self.memo,
+        )
+        results = iter(str(n) for n in range(10))
+        patcher = mock.patch.object(
+            StripeAPI, "run", side_effect=lambda *a, **kw: next(results)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_tool(self, thread_id=None, parent_run_id=None):
+        configurable = {"thread_id": thread_id} if thread_id else {}
+        return self.tool._run(
+            config={"configurable": configurable},
+            run_manager=mock.Mock(parent_run_id=parent_run_id),
+        )
+
+    def test_scope_is_thread_then_parent_run_then_conversation(self):
+        with self.memo.conversation("c1"):
+            # The thread ID wins over the run ID.
+            self.assertEqual(self.run_tool("t1", "r1"), "0")
+            self.assertEqual(self.run_tool("t1", "r2"), "0")
+            # Without a thread, the run ID wins over the conversation.
+            self.assertEqual(self.run_tool(parent_run_id="r1"), "1")
+            self.assertEqual(self.run_tool(parent_run_id="r1"), "1")
+            self.assertEqual(self.run_tool(), "2")
+            self.assertEqual(self.run_tool(), "2")
+
+        # No scope at all: never cached.
+        self.assertEqual(self.run_tool(), "3")
+        self.assertEqual(self.run_tool(), "4")
+
+    def test_toolkit_memoizes_only_when_asked(self):
+        from stripe_agent_toolkit.langchain.toolkit import StripeAgentToolkit
+
+        configuration = {"actions": {"balance": {"read": True}}}
+        toolkit = StripeAgentToolkit("sk_test_123", configuration)
+        memoized = StripeAgentToolkit(
+            "sk_test_123", configuration, memoize=True
+        )
+
+        self.assertIsNone(toolkit.memo)
+        self.assertIsNone(toolkit.get_tools()[0].memo)
+        self.assertIs(memoized.get_tools()[0].memo, memoized.memo)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from stripe_agent_toolkit.api import StripeAPI
+from stripe_agent_toolkit.middleware import (
+    MetricsMiddleware,
+    Middleware,
+    MiddlewarePipeline,
+)
+
+
+class Recorder(Middleware):
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+
+    def handle(self, call, call_next):
+        self.log.append((self.name, call.method, call.kwargs))
+        return call_next(call)
+
+    async def ahandle(self, call, call_next):
+        self.log.append((self.name, call.method, call.kwargs))
+        return await call_next(call)
+
+
+class ShortCircuit(Middleware):
+    def handle(self, call, call_next):
+        return "cached"
+
+
+class TestMiddlewarePipeline(unittest.TestCase):
+    def test_runs_chain_in_order_with_per_method_middleware(self):
+        log = []
+        pipeline = MiddlewarePipeline(
+            [Recorder("outer", log)],
+            per_method={"create_refund": [Recorder("refund", log)]},
+        )
+
+        result = pipeline.run(
+            "create_refund", (), {"payment_intent": "pi_1"}, {},
+            lambda call: call.kwargs["payment_intent"],
+        )
+        pipeline.run("list_prices", (), {}, {}, lambda call: None)
+
+        self.assertEqual(result, "pi_1")
+        self.assertEqual(
+            log,
+            [
+                ("outer", "create_refund", {"payment_intent": "pi_1"}),
+                ("refund", "create_refund", {"payment_intent": "pi_1"}),
+                ("outer", "list_prices", {}),
+            ],
+        )
+
+    def test_middleware_can_short_circuit(self):
+        handler = mock.Mock()
+        pipeline = MiddlewarePipeline([ShortCircuit()])
+
+        self.assertEqual(pipeline.run("m", (), {}, {}, handler), "cached")
+        handler.assert_not_called()
+
+    def test_async_calls_use_the_same_chain(self):
+        log = []
+        pipeline = MiddlewarePipeline([Recorder("outer", log)])
+
+        async def handler(call):
+            return call.method
+
+        result = asyncio.run(pipeline.arun("m", (), {"a": 1}, {}, handler))
+
+        self.assertEqual(result, "m")
+        self.assertEqual(log, [("outer", "m", {"a": 1})])
+
+    def test_metrics_record_calls_and_errors(self):
+        metrics = MetricsMiddleware()
+        pipeline = MiddlewarePipeline([metrics])
+
+        def fail(call):
+            raise ValueError("boom")
+
+        pipeline.run("m", (), {}, {}, lambda call: None)
+        with self.assertRaises(ValueError):
+            pipeline.run("m", (), {}, {}, fail)
+
+        snapshot = metrics.snapshot()["m"]
+        self.assertEqual(snapshot["calls"], 2)
+        self.assertEqual(snapshot["errors"], 1)
+        self.assertGreaterEqual(snapshot["max_time"], 0.0)
+
+
+class TestStripeAPIPipeline(unittest.TestCase):
+    def test_run_and_arun_go_through_pipeline(self):
+        log = []
+        api = StripeAPI(
+            secret_key="sk_test_123",
+            context={"account": "acct_1"},
+            pipeline=MiddlewarePipeline([Recorder("outer", log)]),
+        )
+
+        with mock.patch(
+            "stripe_agent_toolkit.api.retrieve_balance"
+        ) as mock_function:
+            mock_function.return_value = {"available": []}
+
+            result = api.run("retrieve_balance")
+            async_result = asyncio.run(api.arun("retrieve_balance"))
+
+        self.assertEqual(json.loads(result), {"available": []})
+        self.assertEqual(async_result, result)
+        self.assertEqual(len(log), 2)
+        mock_function.assert_called_with(
+            {"account": "acct_1"}, api_key="sk_test_123"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+import asyncio
+import json
+import threading
+import unittest
+from unittest import mock
+
+from stripe_agent_toolkit.api import StripeAPI
+from stripe_agent_toolkit.middleware import (
+    MetricsMiddleware,
+    Middleware,
+    MiddlewarePipeline,
+)
+from stripe_agent_toolkit.prefetch import Prefetcher
+
+
+class SlowFirstCall:
+    """Blocks the first call until released, then answers immediately."""
+
+    def __init__(self, result):
+        self.result = result
+        self.release = threading.Event()
+        self.calls = 0
+
+    def __call__(self, context, **kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            self.release.wait(5)
+        return self.result
+
+
+class RetryOnce(Middleware):
+    def __init__(self):
+        self.retried = []
+
+    def handle(self, call, call_next):
+        try:
+            return call_next(call)
+        except Exception:
+            result = call_next(call)
+            self.retried.append(result)
+            return result
+
+
+class TestPrefetcher(unittest.TestCase):
+    def setUp(self):
+        self.metrics = MetricsMiddleware()
+        self.prefetcher = Prefetcher(deadline=2.0)
+        self.api = StripeAPI(
+            secret_key="sk_test_123",
+            context=None,
+            pipeline=MiddlewarePipeline([self.metrics]).extended(
+                self.prefetcher
+            ),
+        )
+
+    def test_prefetches_allowed_read_tools(self):
+        with mock.patch(
+            "stripe_agent_toolkit.api.list_products", return_value=[]
+        ) as list_products, mock.patch(
+            "stripe_agent_toolkit.api.retrieve_balance", return_value={}
+        ) as retrieve_balance:
+            futures = self.prefetcher.start(
+                self.api.run, ["list_products", "create_product"]
+            )
+            futures["list_products"].result(timeout=5)
+
+        self.assertEqual(list(futures), ["list_products"])
+        self.assertEqual(list_products.call_count, 1)
+        retrieve_balance.assert_not_called()
+        # Prefetches go through the rest of the pipeline.
+        self.assertEqual(self.metrics.snapshot()["list_products"]["calls"], 1)
+
+    def test_call_waits_on_in_flight_prefetch(self):
+        list_products = SlowFirstCall([{"id": "prod_1"}])
+        with mock.patch(
+            "stripe_agent_toolkit.api.list_products", list_products
+        ):
+            self.prefetcher.start(self.api.run, ["list_products"])
+            threading.Timer(0.05, list_products.release.set).start()
+
+            result = self.api.run("list_products")
+            again = self.api.run("list_products")
+
+        self.assertEqual(json.loads(result), [{"id": "prod_1"}])
+        self.assertEqual(again, result)
+        self.assertEqual(list_products.calls, 1)
+
+    def test_call_stops_waiting_at_the_deadline(self):
+        self.prefetcher.deadline = 0.05
+        list_products = SlowFirstCall([{"id": "prod_1"}])
+        with mock.patch(
+            "stripe_agent_toolkit.api.list_products", list_products
+        ):
+            self.prefetcher.start(self.api.run, ["list_products"])
+
+            result = self.api.run("list_products")
+            list_products.release.set()
+
+        self.assertEqual(json.loads(result), [{"id": "prod_1"}])
+        self.assertEqual(list_products.calls, 2)
+
+    def test_write_or_arguments_bypass_the_prefetch(self):
+        with mock.patch(
+            "stripe_agent_toolkit.api.list_products", return_value=[]
+        ) as list_products, mock.patch(
+            "stripe_agent_toolkit.api.create_product",
+            return_value={"id": "prod_1"},
+        ):
+            self.prefetcher.start(self.api.run, ["list_products"])[
+                "list_products"
+            ].result(timeout=5)
+
+            self.api.run("list_products", limit=5)
+            self.api.run("list_products")
+            self.api.run("create_product", name="Shirt")
+            self.api.run("list_products")
+
+        self.assertEqual(list_products.call_count, 3)
+
+    def test_failed_prefetch_is_retried_by_the_call(self):
+        with mock.patch(
+            "stripe_agent_toolkit.api.retrieve_balance",
+            side_effect=[Exception("unavailable"), {"available": []}],
+        ) as retrieve_balance:
+            future = self.prefetcher.start(
+                self.api.run, ["retrieve_balance"]
+            )["retrieve_balance"]
+            with self.assertRaises(Exception):
+                future.result(timeout=5)
+
+            result = self.api.run("retrieve_balance")
+
+        self.assertEqual(json.loads(result), {"available": []})
+        self.assertEqual(retrieve_balance.call_count, 2)
+
+    def test_only_batches_with_writes_invalidate(self):
+        def batch(*methods):
+            return [{"method": method, "args": {}} for method in methods]
+
+        with mock.patch(
+            "stripe_agent_toolkit.api.list_products", return_value=[]
+        ) as list_products, mock.patch(
+            "stripe_agent_toolkit.api.retrieve_balance", return_value={}
+        ), mock.patch(
+            "stripe_agent_toolkit.api.create_product",
+            return_value={"id": "prod_1"},
+        ):
+            self.prefetcher.start(self.api.run, ["list_products"])[
+                "list_products"
+            ].result(timeout=5)
+
+            self.api.run("batch", operations=batch("retrieve_balance"))
+            self.api.run("list_products")
+            self.assertEqual(list_products.call_count, 1)
+
+            self.api.run(
+                "batch",
+                operations=batch("retrieve_balance", "create_product"),
+            )
+            self.api.run("list_products")
+            self.assertEqual(list_products.call_count, 2)
+
+    def test_prefetch_retried_by_outer_middleware(self):
+        retry = RetryOnce()
+        api = StripeAPI(
+            secret_key="sk_test_123",
+            context=None,
+            pipeline=MiddlewarePipeline([retry, self.prefetcher]),
+        )
+        with mock.patch(
+            "stripe_agent_toolkit.api.retrieve_balance",
+            side_effect=[Exception("unavailable"), {"available": []}],
+        ):
+            future = self.prefetcher.start(api.run, ["retrieve_balance"])[
+                "retrieve_balance"
+            ]
+            with self.assertRaises(Exception):
+                future.result(timeout=5)
+            for thread in threading.enumerate():
+                if thread.name == "stripe-prefetch-retrieve_balance":
+                    thread.join(5)
+
+        # The retry completes on the already settled future.
+        self.assertEqual(retry.retried, ['{"available": []}'])
+
+    def test_async_call_waits_on_in_flight_prefetch(self):
+        list_prices = SlowFirstCall([{"id": "price_1"}])
+        with mock.patch("stripe_agent_toolkit.api.list_prices", list_prices):
+            self.prefetcher.start(self.api.run, ["list_prices"])
+            threading.Timer(0.05, list_prices.release.set).start()
+
+            result = asyncio.run(self.api.arun("list_prices"))
+
+        self.assertEqual(json.loads(result), [{"id": "price_1"}])
+        self.assertEqual(list_prices.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
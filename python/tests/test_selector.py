@@ -0,0 +1,83 @@
+import unittest
+
+from stripe_agent_toolkit.selector import ToolIndex, ToolSelector, tokenize
+from stripe_agent_toolkit.tools import tools
+
+
+def methods(selected):
+    return [tool["method"] for tool in selected]
+
+
+class TestToolSelector(unittest.TestCase):
+    def test_tokenize(self):
+        self.assertEqual(
+            tokenize("List the Customers and their invoices"),
+            ["list", "customer", "their", "invoice"],
+        )
+
+    def test_select_top_k(self):
+        selector = ToolSelector(tools, k=2)
+
+        selected = methods(selector.select("Refund the payment pi_123"))
+
+        self.assertEqual(len(selected), 2)
+        self.assertEqual(selected[0], "create_refund")
+
+    def test_select_uses_schema_fields(self):
+        selector = ToolSelector(tools, k=1)
+
+        selected = methods(selector.select("How much is my balance?"))
+
+        self.assertEqual(selected, ["retrieve_balance"])
+
+    def test_synonyms(self):
+        selector = ToolSelector(tools, k=1)
+
+        selected = methods(selector.select("find customers named Jane"))
+
+        self.assertEqual(selected, ["list_customers"])
+
+    def test_no_match_exposes_every_tool(self):
+        selector = ToolSelector(tools, k=2)
+
+        self.assertEqual(len(selector.select("hello there")), len(tools))
+
+    def test_include_on_demand(self):
+        selector = ToolSelector(tools, k=1)
+        selector.select("What is my balance?")
+
+        selected = methods(
+            selector.include("list_customers", "retrieve_balance")
+        )
+
+        self.assertEqual(selected, ["retrieve_balance", "list_customers"])
+
+        # A new task starts from its own selection.
+        self.assertEqual(
+            methods(selector.select("What is my balance?")),
+            ["retrieve_balance"],
+        )
+
+    def test_index_accepts_tool_objects(self):
+        class Tool:
+            def __init__(self, method, description):
+                self.method = method
+                self.name = method.replace("_", " ").title()
+                self.description = description
+                self.args_schema = None
+
+        index = ToolIndex(
+            [
+                Tool("create_refund", "Refund a payment intent."),
+                Tool("list_products", "List products in the catalog."),
+            ]
+        )
+
+        scores = index.scores("show the products")
+
+        self.assertEqual(scores[0], 0)
+        self.assertGreater(scores[1], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()